@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark the webdriver and raw CDP backends (--backend) against the stand-in.
+
+  .venv/bin/python bench/bench_backends.py --runs 5
+  .venv/bin/python bench/bench_backends.py --calls 500 --no-headless
+
+Per backend: command latency (p50 over --calls of each primitive the helpers
+are built from) on a loaded invitation page, then the browser flow from the
+group page to the open sign-up modal (open_invitation → row snapshot → Sign Up
+click → Identify email field present), --runs times on one driver.
+"""
+import argparse
+import statistics
+import time
+
+from selenium.webdriver.common.by import By
+
+from fixtures import scaled_titles
+from standin import StandIn, sa, start
+
+ROW_XPATH = "(//div[contains(@class,'assignment-widget')])[1]"
+BTN_XPATH = ROW_XPATH + "//button"
+
+
+def command_latency(driver, calls: int):
+    """p50 milliseconds per primitive."""
+    row = driver.find_element(By.XPATH, ROW_XPATH)
+    cases = {
+        "execute_script": lambda: driver.execute_script("return 1;"),
+        "find_element": lambda: driver.find_element(By.XPATH, BTN_XPATH),
+        "element .text": lambda: row.text,
+        "is_displayed": lambda: row.is_displayed(),
+        "race_any (3 xpaths)": lambda: sa.race_any(driver, ["//nope", "//nada", BTN_XPATH], timeout=5),
+    }
+    out = {}
+    for name, fn in cases.items():
+        times = []
+        for _ in range(calls):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+        out[name] = statistics.median(times) * 1000
+    return out
+
+
+def flow_once(driver, snap, prefs):
+    t0 = time.perf_counter()
+    expected = sa.open_invitation(driver, snap)
+    actions = sa.collect_event_actions(driver, expected=expected)
+    n, item = sa.resolve_preferences(actions, prefs)
+    if item is None:
+        raise RuntimeError("no preference available on the stand-in")
+    sa.click_signup(driver, snap, item, f"pref_{n:02d}")
+    sa.race_any(driver, sa.IDENTIFY_EMAIL_XPATHS, timeout=sa.WAIT)
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--calls", type=int, default=200)
+    ap.add_argument("--prefs", default="36,38,35")
+    ap.add_argument("--no-headless", action="store_true")
+    args = ap.parse_args()
+
+    prefs = [int(p) for p in args.prefs.split(",")]
+    site = StandIn(scaled_titles(sa.WEEK_A_EVENT_MAP))
+    server, base = start(site)
+    sa.set_site(base)
+    latency, flows, starts = {}, {}, {}
+    try:
+        for backend in ("webdriver", "cdp"):
+            t0 = time.perf_counter()
+            driver = sa.build_driver(headless=not args.no_headless, backend=backend)
+            starts[backend] = time.perf_counter() - t0
+            snap = sa.Snapper(base_dir=sa.shots_base_dir("bench_backends"), mode="deferred")
+            try:
+                flows[backend] = [flow_once(driver, snap, prefs) for _ in range(args.runs)]
+                latency[backend] = command_latency(driver, args.calls)
+                if backend == "cdp":
+                    print(f"[cdp] {driver.commands} DevTools round trips in total")
+            finally:
+                snap.close()
+                driver.quit()
+    finally:
+        server.shutdown()
+
+    print(f"\n{'command p50 ms':<22} {'webdriver':>10} {'cdp':>10}")
+    for name in latency["webdriver"]:
+        print(f"{name:<22} {latency['webdriver'][name]:>10.2f} {latency['cdp'][name]:>10.2f}")
+    print(f"\n{'flow':<22} {'webdriver':>10} {'cdp':>10}")
+    print(f"{'driver start s':<22} {starts['webdriver']:>10.2f} {starts['cdp']:>10.2f}")
+    for label, fn in (("group → modal p50 s", statistics.median), ("group → modal max s", max)):
+        print(f"{label:<22} {fn(flows['webdriver']):>10.3f} {fn(flows['cdp']):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
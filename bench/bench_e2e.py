@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency benchmark: run stglac_autosign.main headless against the
+local stand-in and measure release → Sign Up click and release → Save and Done.
+
+  .venv/bin/python bench/bench_e2e.py --runs 5
+  .venv/bin/python bench/bench_e2e.py --runs 5 --fill 36:0.3 -- --snap-mode deferred
+  .venv/bin/python bench/bench_e2e.py --runs 3 --targets 3 --stagger 2
+
+Each run starts a fresh stand-in whose Parent Duties entry opens --lead
+seconds later, launches the script with --release-at for that instant and
+answers its prompts on stdin (Auto mode). Times come from the page's own
+beacons (Date.now() at the click / after the save response), so they
+include everything the parent would wait for. Arguments after "--" are
+passed through to the script.
+
+--targets N runs --targets instead: N groups with their own ids on one
+stand-in, opening --stagger seconds apart, all watched from one browser;
+each target's release → Save and Done is reported.
+"""
+import argparse
+import csv
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from fixtures import ROOT, scaled_titles
+from standin import StandIn, parse_fill, sa, start
+
+
+def pct(vals, q):
+    """Nearest-rank percentile (q in 0..100)."""
+    vals = sorted(vals)
+    return vals[max(0, math.ceil(q / 100 * len(vals)) - 1)] if vals else float("nan")
+
+
+def run_targets(args):
+    """--targets N: one script run per --runs over N stand-in groups opening --stagger s apart."""
+    saves, outcomes = [], []
+    for run in range(1, args.runs + 1):
+        first = math.ceil(time.time() + args.lead)
+        releases = [first + math.ceil(i * args.stagger) for i in range(args.targets)]
+        sites = [StandIn(scaled_titles(sa.week_map(args.week)), release_at=at, fill=parse_fill(args.fill),
+                         group_id=f"9{i:011d}", entry_id=f"8{i:012d}")
+                 for i, at in enumerate(releases, start=1)]
+        server, base = start(sites)
+        fd, path = tempfile.mkstemp(suffix=".csv", prefix="bench_targets_")
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["name", "email", "phone", "bib", "week", "prefs", "group", "entry", "open"])
+            for i, (site, at) in enumerate(zip(sites, releases), start=1):
+                w.writerow([f"Bench Parent {i}", f"bench{i}@example.com", "0400000000", str(100 + i), args.week,
+                            args.prefs.replace(",", ";"), site.group_id, site.entry_id,
+                            datetime.fromtimestamp(at).strftime("%H:%M:%S")])
+        cmd = [sys.executable, os.path.join(ROOT, "stglac_autosign.py"), "--headless", "--site-base", base,
+               "--shots-subdir", "bench_e2e", "--targets", path, *args.extra]
+        env = {**os.environ, "STGLAC_BOOTSTRAPPED": "1"}
+        try:
+            proc = subprocess.run(cmd, text=True, capture_output=True, env=env,
+                                  timeout=args.lead + args.stagger * args.targets + sa.MAX_POLL_MINUTES * 60)
+        finally:
+            server.shutdown()
+            os.remove(path)
+        cells = []
+        for site, at in zip(sites, releases):
+            ev = {e["event"]: e for e in site.events}
+            s = ev.get("save", {}).get("t")
+            ok = s is not None and ev["save"].get("status") == 200
+            if ok:
+                saves.append(s / 1000 - at)
+            outcomes.append("saved" if site.signups else "missed")
+            cells.append(f"{s / 1000 - at:.3f}s" if ok else "-")
+        print(f"run {run}: release → save per target: {'  '.join(cells)}")
+        if proc.returncode != 0 or not all(site.signups for site in sites):
+            print("  " + "\n  ".join(proc.stdout.strip().splitlines()[-8:]))
+    print(f"\n{'metric':<22} {'n':>3} {'p50 s':>8} {'p95 s':>8}")
+    print(f"{'release → Save and Done':<22} {len(saves):>3} {pct(saves, 50):>8.3f} {pct(saves, 95):>8.3f}")
+    print(f"saved {outcomes.count('saved')}/{len(outcomes)} targets")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--lead", type=float, default=20, help="Seconds between launch and release.")
+    ap.add_argument("--prefs", default="36,38,35")
+    ap.add_argument("--fill", default="", help="Spots that fill after release, e.g. 36:0.3,38:2")
+    ap.add_argument("--week", choices=("A", "B"), default="A")
+    ap.add_argument("--targets", type=int, default=0, metavar="N", help="Bench --targets with N groups instead.")
+    ap.add_argument("--stagger", type=float, default=2, help="--targets: seconds between the groups' releases.")
+    ap.add_argument("extra", nargs="*", help="Extra stglac_autosign.py flags (after --).")
+    args = ap.parse_args()
+    if args.targets:
+        run_targets(args)
+        return
+
+    answers = f"{args.week}\n2\nBench Parent\nbench@example.com\n0400000000\n123\n{args.prefs}\n"
+    click, save, outcomes = [], [], []
+    for run in range(1, args.runs + 1):
+        # Whole second, because --release-at takes HH:MM:SS
+        release = math.ceil(time.time() + args.lead)
+        site = StandIn(scaled_titles(sa.week_map(args.week)), release_at=release, fill=parse_fill(args.fill))
+        server, base = start(site)
+        cmd = [sys.executable, os.path.join(ROOT, "stglac_autosign.py"), "--headless",
+               "--site-base", base, "--shots-subdir", "bench_e2e",
+               "--release-at", datetime.fromtimestamp(release).strftime("%H:%M:%S"), *args.extra]
+        env = {**os.environ, "STGLAC_BOOTSTRAPPED": "1"}
+        try:
+            proc = subprocess.run(cmd, input=answers, text=True, capture_output=True, env=env,
+                                  timeout=args.lead + sa.MAX_POLL_MINUTES * 60)
+        finally:
+            server.shutdown()
+        ev = {e["event"]: e for e in site.events}
+        c = ev.get("signup_click", {}).get("t")
+        s = ev.get("save", {}).get("t")
+        if c is not None:
+            click.append(c / 1000 - release)
+        if s is not None and ev["save"].get("status") == 200:
+            save.append(s / 1000 - release)
+        outcome = "saved" if site.signups else ("clicked" if c else "no click")
+        outcomes.append(outcome)
+        print(f"run {run}: {outcome:<8} click {'-' if c is None else f'{c / 1000 - release:.3f}s'}"
+              f"  save {'-' if s is None else f'{s / 1000 - release:.3f}s'}")
+        if proc.returncode != 0 or outcome != "saved":
+            print("  " + "\n  ".join(proc.stdout.strip().splitlines()[-8:]))
+
+    print(f"\n{'metric':<22} {'n':>3} {'p50 s':>8} {'p95 s':>8}")
+    for name, vals in (("release → Sign Up", click), ("release → Save and Done", save)):
+        print(f"{name:<22} {len(vals):>3} {pct(vals, 50):>8.3f} {pct(vals, 95):>8.3f}")
+    print(f"saved {outcomes.count('saved')}/{len(outcomes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark the browserless HTTP engine against the local stand-in.
+
+  .venv/bin/python bench/bench_http_engine.py --runs 20
+
+Each run resets the stand-in, then times discovery (invitation page fetch
++ endpoint scan) and the claim (spot list → identify → sign-up POST).
+A final run with the API hidden checks that discovery fails cleanly
+(FastPathUnavailable) so the Selenium fallback would kick in.
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+from fixtures import scaled_titles
+from standin import StandIn, sa, start
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--prefs", default="36,38,35")
+    args = ap.parse_args()
+    prefs = [int(p) for p in args.prefs.split(",") if p.strip().isdigit()]
+    titles = scaled_titles(sa.WEEK_A_EVENT_MAP)
+
+    disc, claim = [], []
+    for _ in range(args.runs):
+        site = StandIn(titles, full=prefs[:1])
+        server, base = start(site)
+        sa.set_site(base)
+        try:
+            eng = sa.HttpEngine()
+            t0 = time.perf_counter()
+            eng.discover()
+            t1 = time.perf_counter()
+            spots = eng.spots()
+            with contextlib.redirect_stdout(io.StringIO()):
+                n, item = sa.resolve_preferences(spots, prefs)
+            eng.signup(item["id"], "Bench Parent", "bench@example.com", "0400000000", "1")
+            t2 = time.perf_counter()
+            assert site.signups and site.signups[0]["spotId"] == item["id"]
+            disc.append((t1 - t0) * 1000)
+            claim.append((t2 - t1) * 1000)
+        finally:
+            server.shutdown()
+
+    print(f"{'step':<10} {'runs':>5} {'p50 ms':>9} {'max ms':>9}")
+    for name, vals in (("discover", disc), ("claim", claim)):
+        print(f"{name:<10} {len(vals):>5} {statistics.median(vals):>9.1f} {max(vals):>9.1f}")
+
+    server, base = start(StandIn(titles, expose_api=False))
+    sa.set_site(base)
+    try:
+        sa.HttpEngine().discover()
+        print("fallback check: FAILED (discovery unexpectedly succeeded)")
+    except sa.FastPathUnavailable as e:
+        print(f"fallback check: ok ({e})")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark refresh-to-interactive time with and without --fast-load.
+
+  .venv/bin/python bench/bench_page_load.py --runs 5
+  .venv/bin/python bench/bench_page_load.py --delay 0.8 --images 40
+
+Serves an invitation list wrapped in slow images, web fonts and a fake
+googletagmanager script, then times driver.refresh() until the first
+assignment row's SIGN UP button is clickable, once with the default
+driver and once with build_driver(fast=True).
+"""
+import argparse
+import functools
+import statistics
+import time
+
+from fixtures import assignment_row, heavy_asset, heavy_page, import_autosign, scaled_titles, serve
+
+sa = import_autosign()
+ROW_BTN = "(//div[contains(@class,'assignment-widget')]//button)[1]"
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--delay", type=float, default=0.4, help="Seconds each heavy asset takes.")
+    ap.add_argument("--images", type=int, default=24)
+    ap.add_argument("--no-headless", action="store_true")
+    args = ap.parse_args()
+
+    rows = "".join(assignment_row(t) for t in scaled_titles(sa.WEEK_A_EVENT_MAP))
+    page = heavy_page(rows, images=args.images)
+    server, base = serve({"/inv": lambda: page}, assets=functools.partial(heavy_asset, delay=args.delay))
+    results = {}
+    try:
+        for name, fast in (("normal", False), ("fast-load", True)):
+            driver = sa.build_driver(headless=not args.no_headless, fast=fast)
+            try:
+                driver.get(base + "/inv")
+                times = []
+                for _ in range(args.runs):
+                    t0 = time.perf_counter()
+                    driver.refresh()
+                    sa.race_any(driver, [ROW_BTN], timeout=30, clickable=True)
+                    times.append(time.perf_counter() - t0)
+                results[name] = times
+            finally:
+                driver.quit()
+    finally:
+        server.shutdown()
+
+    print(f"{'driver':<10} {'runs':>5} {'p50 ms':>9} {'max ms':>9}")
+    for name, vals in results.items():
+        print(f"{name:<10} {len(vals):>5} {statistics.median(vals) * 1000:>9.1f} {max(vals) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark row collection: single-script snapshot vs per-row WebDriver scan.
+
+Run with the .venv python (selenium must be importable):
+  .venv/bin/python bench/bench_rows.py
+  .venv/bin/python bench/bench_rows.py --page saved_invitation.html --repeat 10
+  .venv/bin/python bench/bench_rows.py --rows 200 --no-headless
+
+Without --page a synthetic invitation page is built from WEEK_A_EVENT_MAP
+with every third row Full. Reports WebDriver command counts and wall time
+for collect_event_actions + preference resolution on each path.
+"""
+import argparse
+import os
+import statistics
+import time
+
+from fixtures import import_autosign, invitation_page, scaled_titles, write_page
+
+sa = import_autosign()
+
+
+def run_path(driver, collect, prefs, repeat):
+    times, calls, rows = [], [], 0
+    for _ in range(repeat):
+        before = driver.commands
+        t0 = time.perf_counter()
+        actions = collect(driver)
+        # Same decision the main flow makes, on whichever rows we got back
+        for n in prefs:
+            if 1 <= n <= len(actions) and sa.is_signup_action(actions[n - 1]):
+                break
+        times.append(time.perf_counter() - t0)
+        calls.append(driver.commands - before)
+        rows = len(actions)
+    return rows, times, calls
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--page", help="Saved invitation page (.html). Default: synthetic page.")
+    ap.add_argument("--rows", type=int, default=0, help="Synthetic row count (default: week A map size).")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--prefs", default="36,38,35")
+    ap.add_argument("--no-headless", action="store_true")
+    args = ap.parse_args()
+
+    if args.page:
+        url = "file://" + os.path.abspath(args.page)
+    else:
+        titles = scaled_titles(sa.WEEK_A_EVENT_MAP, args.rows or None)
+        url = write_page(invitation_page(titles, full=range(1, len(titles) + 1, 3)), "bench_rows.html")
+    prefs = [int(p) for p in args.prefs.split(",") if p.strip().isdigit()]
+
+    driver = sa.build_driver(headless=not args.no_headless)
+    try:
+        driver.get(url)
+        sa.count_commands(driver)  # build_driver already counts; a no-op then
+        print(f"page: {url}")
+        print(f"{'path':<12} {'rows':>5} {'cmds':>6} {'p50 ms':>9} {'max ms':>9}")
+        for name, fn in (("webdriver", sa.collect_event_actions_webdriver),
+                         ("snapshot", sa.collect_event_actions)):
+            rows, times, calls = run_path(driver, fn, prefs, args.repeat)
+            print(f"{name:<12} {rows:>5} {max(calls):>6} "
+                  f"{statistics.median(times) * 1000:>9.1f} {max(times) * 1000:>9.1f}")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
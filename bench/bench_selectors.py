@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Selector micro-benchmark: the script's XPaths vs CSS and in-page JS equivalents.
+
+  .venv/bin/python bench/bench_selectors.py
+  .venv/bin/python bench/bench_selectors.py --sizes 37,200,600 --budget-ms 100
+  .venv/bin/python bench/bench_selectors.py --group-page g.html --invitation-page inv.html
+
+Cases: every entry of VIEW_XPATHS and PD_LINK_XPATH on a group page, the
+assignment-widget row and row-button queries on an invitation page, and the
+label-relative field_xpath() for each FORM_FIELDS label on a page with the
+sign-up modal open. Synthetic pages are built at each --sizes (rows on the
+invitation/form pages, extra cards on the group page); saved pages add a
+"saved" column. Cells are microseconds per query measured inside the page
+(no WebDriver round trip); "wd ms" is the same query through the driver at
+the last column. A cell is marked * when the strategy finds a different
+element than the script's own selector (first row of the case) and - when it
+finds nothing. "pick" is the fastest strategy that matched everywhere.
+"""
+import argparse
+import os
+import statistics
+import time
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from fixtures import form_page, group_page, import_autosign, invitation_page, scaled_titles, write_page
+
+sa = import_autosign()
+
+# arguments: kind, expr, mode, reference kind, reference expr, budget ms.
+# Repeats the query in 5 batches of ~budget/5 ms and returns the median µs per
+# query, how many nodes it found and whether they are the reference's nodes.
+HARNESS_JS = r"""
+const [kind, expr, mode, refKind, refExpr, budget] = arguments;
+const compile = (k, e) => {
+  if (k === 'xpath') {
+    const type = mode === 'one' ? XPathResult.FIRST_ORDERED_NODE_TYPE : XPathResult.ORDERED_NODE_SNAPSHOT_TYPE;
+    return () => {
+      const r = document.evaluate(e, document, null, type, null);
+      if (mode === 'one') return r.singleNodeValue ? [r.singleNodeValue] : [];
+      const out = [];
+      for (let i = 0; i < r.snapshotLength; i++) out.push(r.snapshotItem(i));
+      return out;
+    };
+  }
+  if (k === 'css') {
+    return mode === 'one' ? () => { const el = document.querySelector(e); return el ? [el] : []; }
+                          : () => Array.from(document.querySelectorAll(e));
+  }
+  const fn = new Function(e);
+  return () => { const r = fn(); return r == null ? [] : Array.isArray(r) ? r : [r]; };
+};
+let run, ref;
+try { run = compile(kind, expr); ref = compile(refKind, refExpr)(); run(); }
+catch (e) { return {error: String(e.message || e).slice(0, 60)}; }
+const found = run();
+const same = found.length === ref.length && found.every((el, i) => el === ref[i]);
+const per = [];
+for (let b = 0; b < 5; b++) {
+  let n = 0;
+  const t0 = performance.now();
+  do { run(); n++; } while (performance.now() - t0 < budget / 5);
+  per.push((performance.now() - t0) * 1000 / n);
+}
+per.sort((a, b) => a - b);
+return {us: per[2], n: found.length, ok: same};
+"""
+
+ROW_CSS = "div[class*='assignment-widget']"
+ROW_BUTTON_XPATH = (".//*[self::button or self::a][normalize-space()='SIGN UP' or contains(.,'Sign Up') or "
+                    "normalize-space()='Full' or normalize-space()='FULL']")
+
+
+def view_js() -> str:
+    """In-page equivalent of VIEW_XPATHS[0]: Parent Duties link text → nearest card with a View button."""
+    return r"""
+for (const a of document.getElementsByTagName('a')) {
+  if (!/Parent Dut(y|ies)/.test(a.textContent)) continue;
+  for (let p = a.parentElement; p; p = p.parentElement) {
+    const b = Array.from(p.getElementsByTagName('button'))
+      .find(b => b.dataset.i18n === 'View' || b.textContent.includes('View'));
+    if (b) return b;
+  }
+}
+return null;"""
+
+
+def field_js(label: str) -> str:
+    """In-page equivalent of field_xpath(label): first input/textarea after the label, outside it."""
+    return f"""
+const lab = Array.from(document.getElementsByTagName('label')).find(l => l.textContent.includes({label!r}));
+if (!lab) return null;
+for (const el of document.querySelectorAll('input, textarea'))
+  if (!lab.contains(el) && lab.compareDocumentPosition(el) & Node.DOCUMENT_POSITION_FOLLOWING) return el;
+return null;"""
+
+
+def cases():
+    """[(case, page, mode, [(label, kind, expr)])]; the first strategy of each case is the reference."""
+    entry = sa.PARENT_DUTIES_ENTRY_ID
+    view = [(f"VIEW_XPATHS[{i}]", "xpath", xp) for i, xp in enumerate(sa.VIEW_XPATHS)]
+    view += [("css :has(entry link)", "css",
+              f"div:has(> a[href*='/login/entry/{entry}']) button[data-i18n='View']"),
+             ("css button[data-i18n=View]", "css", "button[data-i18n='View']"),
+             ("js link text → card", "js", view_js())]
+    out = [
+        ("view button", "group", "one", view),
+        ("parent duties link", "group", "one", [
+            ("PD_LINK_XPATH", "xpath", sa.PD_LINK_XPATH),
+            ("css a[href*=entry]", "css", f"a[href*='/login/entry/{entry}']"),
+            ("js links scan", "js", f"return Array.from(document.links).find(a => a.href.includes('/login/entry/{entry}')) || null;"),
+        ]),
+        ("rows", "invitation", "all", [
+            ("xpath contains(@class)", "xpath", "//div[contains(@class,'assignment-widget')]"),
+            ("css [class*=]", "css", ROW_CSS),
+            ("css .assignment-widget", "css", "div.assignment-widget"),
+            ("js getElementsByClassName", "js", "return Array.from(document.getElementsByClassName('assignment-widget'));"),
+        ]),
+        ("row buttons", "invitation", "all", [
+            ("xpath per row (webdriver)", "js",
+             f"return Array.from(document.querySelectorAll({ROW_CSS!r})).map(r => document.evaluate("
+             f"{ROW_BUTTON_XPATH!r}, r, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue)"
+             ".filter(Boolean);"),
+            ("xpath whole document", "xpath", "//div[contains(@class,'assignment-widget')]" + ROW_BUTTON_XPATH[1:]),
+            ("css row button", "css", f"{ROW_CSS} button"),
+            ("js rowButton (snapshot)", "js",
+             sa.ROW_STATE_JS + f"return Array.from(document.querySelectorAll({ROW_CSS!r})).map(rowButton).filter(Boolean);"),
+        ]),
+    ]
+    for labels in sa.FORM_FIELDS:
+        for label in labels:
+            out.append((f"field {label}", "form", "one", [
+                ("field_xpath", "xpath", sa.field_xpath(label)),
+                ("js label scan", "js", field_js(label)),
+            ]))
+    return out
+
+
+def pages_at(size: int):
+    titles = scaled_titles(sa.WEEK_A_EVENT_MAP, size)
+    return {
+        "group": write_page(group_page(sa.PARENT_DUTIES_ENTRY_ID, record_clicks=False, filler=size),
+                            f"selectors_group_{size}.html"),
+        "invitation": write_page(invitation_page(titles, full=range(1, size + 1, 3)), f"selectors_inv_{size}.html"),
+        "form": write_page(form_page(titles), f"selectors_form_{size}.html"),
+    }
+
+
+def driver_ms(driver, kind, expr, mode, reps):
+    """Median ms for the same query as one WebDriver command."""
+    by = {"xpath": By.XPATH, "css": By.CSS_SELECTOR}.get(kind)
+    times = []
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        try:
+            if by is None:
+                driver.execute_script(expr)
+            elif mode == "one":
+                driver.find_element(by, expr)
+            else:
+                driver.find_elements(by, expr)
+        except NoSuchElementException:
+            pass
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="37,150,600", help="Synthetic page sizes (rows / extra cards).")
+    ap.add_argument("--group-page", help="Saved group page (.html).")
+    ap.add_argument("--invitation-page", help="Saved invitation page (.html).")
+    ap.add_argument("--form-page", help="Saved page with the sign-up form open (.html).")
+    ap.add_argument("--budget-ms", type=float, default=50, help="In-page time per strategy per page.")
+    ap.add_argument("--wd-reps", type=int, default=5)
+    ap.add_argument("--no-headless", action="store_true")
+    args = ap.parse_args()
+
+    columns = [(str(n), pages_at(n)) for n in (int(x) for x in args.sizes.split(",") if x.strip())]
+    saved = {k: "file://" + os.path.abspath(v) for k, v in
+             (("group", args.group_page), ("invitation", args.invitation_page), ("form", args.form_page)) if v}
+    if saved:
+        columns.append(("saved", saved))
+    table = cases()
+
+    # results[(case, label)][column] = harness result; wd[(case, label)] = ms at the last column
+    results, wd = {}, {}
+    driver = sa.build_driver(headless=not args.no_headless)
+    try:
+        for col, urls in columns:
+            for page in ("group", "invitation", "form"):
+                if page not in urls:
+                    continue
+                driver.get(urls[page])
+                for case, pg, mode, strategies in table:
+                    if pg != page:
+                        continue
+                    _, ref_kind, ref_expr = strategies[0]
+                    for label, kind, expr in strategies:
+                        results.setdefault((case, label), {})[col] = driver.execute_script(
+                            HARNESS_JS, kind, expr, mode, ref_kind, ref_expr, args.budget_ms)
+                        if col == columns[-1][0]:
+                            wd[(case, label)] = driver_ms(driver, kind, expr, mode, args.wd_reps)
+    finally:
+        driver.quit()
+
+    def cell(res):
+        if res is None:
+            return f"{'':>9}"
+        if "error" in res:
+            return f"{'error':>9}"
+        mark = "-" if not res["n"] else ("" if res["ok"] else "*")
+        return f"{res['us']:>8.1f}{mark or ' '}"
+
+    heads = "".join(f"{c:>9}" for c, _ in columns)
+    print("µs per query in page; * different match than the script's selector, - no match")
+    for case, _, _, strategies in table:
+        print(f"\n{case:<30}{heads}{'wd ms':>8}")
+        best = None
+        for label, _, _ in strategies:
+            row = results.get((case, label), {})
+            print(f"  {label:<28}" + "".join(cell(row.get(c)) for c, _ in columns) + f"{wd.get((case, label), 0):>8.2f}")
+            ran = [r for r in row.values() if r]
+            last = row.get(columns[-1][0]) or (ran[-1] if ran else None)
+            if ran and all("error" not in r and r["n"] and r["ok"] for r in ran) \
+                    and (best is None or last["us"] < best[1]):
+                best = (label, last["us"])
+        if best:
+            print(f"  pick: {best[0]}")
+
+
+if __name__ == "__main__":
+    main()
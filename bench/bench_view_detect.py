@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark observe-mode 'View' detection (detection-to-click latency).
+
+Run with the .venv python (selenium must be importable):
+  .venv/bin/python bench/bench_view_detect.py
+  .venv/bin/python bench/bench_view_detect.py --delay 3000 --runs 5 --no-headless
+
+Two scenarios against a local fixture server:
+  dom     the Parent Duties card is inserted client-side after --delay ms;
+          the MutationObserver should click it within a frame or two.
+  server  the server starts rendering the card --delay ms after page load;
+          the background fetch notices, the page refreshes once and the
+          card is clicked on the fresh DOM.
+"""
+import argparse
+import statistics
+import time
+
+from fixtures import group_page, import_autosign, serve
+
+sa = import_autosign()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--delay", type=int, default=2000, help="Reveal delay in ms.")
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--fetch-ms", type=int, default=sa.VIEW_FETCH_MS)
+    ap.add_argument("--no-headless", action="store_true")
+    args = ap.parse_args()
+
+    state = {"release": float("inf")}
+    routes = {
+        "/dom": lambda: group_page(sa.PARENT_DUTIES_ENTRY_ID, reveal_ms=args.delay),
+        "/server": lambda: group_page(sa.PARENT_DUTIES_ENTRY_ID, released=time.time() >= state["release"]),
+    }
+    server, base = serve(routes)
+    driver = sa.build_driver(headless=not args.no_headless)
+    results = {"dom": [], "server": []}
+    try:
+        for _ in range(args.runs):
+            # dom: both timestamps come from the same document clock
+            sa.GROUP_URL = base + "/dom"
+            driver.get(sa.GROUP_URL)
+            sa.wait_view_event(driver, time.time() + args.delay / 1000 + 30, fetch_ms=0)
+            time.sleep(0.1)
+            revealed, clicked = driver.execute_script("return [window.__revealedAt, window.__clickedAt];")
+            results["dom"].append(clicked - revealed)
+
+            # server: compare the click's epoch time with the server-side release
+            sa.GROUP_URL = base + "/server"
+            state["release"] = float("inf")
+            driver.get(sa.GROUP_URL)
+            state["release"] = time.time() + args.delay / 1000
+            sa.wait_view_event(driver, state["release"] + 30, fetch_ms=args.fetch_ms)
+            time.sleep(0.1)
+            clicked_epoch = driver.execute_script("return performance.timeOrigin + window.__clickedAt;")
+            results["server"].append(clicked_epoch - state["release"] * 1000)
+    finally:
+        driver.quit()
+        server.shutdown()
+
+    print(f"{'scenario':<10} {'runs':>5} {'p50 ms':>9} {'max ms':>9}")
+    for name, vals in results.items():
+        print(f"{name:<10} {len(vals):>5} {statistics.median(vals):>9.1f} {max(vals):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
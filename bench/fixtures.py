@@ -0,0 +1,184 @@
+"""
+Offline page builders for the bench/ scripts.
+
+Pages mimic the signup.com DOM structures stglac_autosign.py depends on
+(assignment-widget rows, SIGN UP / Full buttons, spot titles). They are
+not copies of the live site, just enough structure for the selectors.
+"""
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_autosign():
+    """Import stglac_autosign without triggering its venv bootstrap/relaunch."""
+    os.environ.setdefault("STGLAC_BOOTSTRAPPED", "1")
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import stglac_autosign
+    return stglac_autosign
+
+
+def assignment_row(title: str, state: str = "signup", hidden: bool = False, spot_id: str = "") -> str:
+    data = f' data-spot="{spot_id}"' if spot_id else ""
+    if state == "signup":
+        btn = f'<button class="btn vsl-signup"{data}>SIGN UP</button>'
+    elif state == "full":
+        btn = f'<button class="btn vsl-full disabled"{data}>Full</button>'
+    else:
+        btn = f'<button class="btn disabled"{data} disabled>SIGN UP</button>'
+    style = ' style="display:none"' if hidden else ""
+    full = ' data-full="1"' if state == "full" else ""
+    return (f'<div class="assignment-widget row"{full}{style}>'
+            f'<div class="spot-info"><a class="title SpotTitle" href="#">{title}</a>'
+            f'<span class="slots">1 of 1 slots</span></div>'
+            f'<div class="form-row button">{btn}</div></div>')
+
+
+def invitation_page(titles: Iterable[str], full: Iterable[int] = (), hidden: Iterable[int] = (),
+                    disabled: Iterable[int] = ()) -> str:
+    """Invitation list with one row per title; full/hidden/disabled are 1-based row numbers."""
+    full, hidden, disabled = set(full), set(hidden), set(disabled)
+    rows = []
+    for i, t in enumerate(titles, start=1):
+        state = "full" if i in full else "disabled" if i in disabled else "signup"
+        rows.append(assignment_row(t, state, hidden=i in hidden))
+    return ("<!doctype html><html><head><meta charset='utf-8'><title>Invitation</title></head>"
+            "<body><div id='invitation'><div class='dayRow'>" + "\n".join(rows) +
+            "</div></div></body></html>")
+
+
+# Records when the Parent Duties card shows up and when any control in it is clicked,
+# without navigating away, so benches can read both timestamps afterwards.
+_GROUP_SCRIPT = """
+<script>
+window.__clickedAt = null;
+document.addEventListener('click', e => {
+  if (e.target.closest('#pd-card')) {
+    e.preventDefault();
+    if (window.__clickedAt === null) window.__clickedAt = performance.now();
+  }
+}, true);
+function revealParentDuties() {
+  document.getElementById('cards').insertAdjacentHTML('beforeend', PD_CARD);
+  window.__revealedAt = performance.now();
+}
+%s
+</script>
+"""
+
+
+def group_page(entry_id: str, reveal_ms: Optional[int] = None, released: bool = True,
+               record_clicks: bool = True, filler: int = 0) -> str:
+    """
+    Group page with a 'Club Info' card and a 'Parent Duties Week A' card.
+    reveal_ms: insert the Parent Duties card client-side after this delay.
+    released=False: the server does not render the Parent Duties card at all.
+    record_clicks=False: clicks navigate normally instead of being recorded.
+    filler: extra activity cards after Parent Duties, to grow the document.
+    """
+    other = ('<div class="card"><a href="/login/entry/1000000000001">Club Info</a>'
+             '<div class="form-row button"><button data-i18n="View">View</button></div></div>')
+    pd = (f'<div class="card" id="pd-card"><a href="/login/entry/{entry_id}">Parent Duties Week A</a>'
+          f'<div class="form-row button"><button data-i18n="View">View</button></div></div>')
+    inline = released and reveal_ms is None
+    trigger = f"setTimeout(revealParentDuties, {int(reveal_ms)});" if (released and reveal_ms is not None) else ""
+    script = _GROUP_SCRIPT % (f"const PD_CARD = {pd!r};\n" + trigger)
+    if not record_clicks:
+        script = script.replace("e.preventDefault();", "")
+    if inline:
+        script += "<script>window.__revealedAt = 0;</script>"
+    extra = "".join(f'<div class="card"><a href="/login/entry/{2000000000000 + i}">Activity {i}</a>'
+                    f'<p>Round {i} helpers</p><div class="form-row button">'
+                    f'<button data-i18n="View">View</button></div></div>' for i in range(filler))
+    return ("<!doctype html><html><head><meta charset='utf-8'><title>Group</title></head><body>"
+            f"<div id='cards'>{other}{pd if inline else ''}{extra}</div>{script}</body></html>")
+
+
+def form_page(titles: Iterable[str]) -> str:
+    """Invitation list with the participant sign-up modal open on top of it (label, then input)."""
+    fields = (("Name *", "input"), ("Email *", "input"), ("Phone", "input"),
+              ("ONE Bib Number", "input"), ("Comment", "textarea"))
+    form = "".join(f"<div class='form-group'><label>{label}</label>"
+                   + ("<textarea></textarea>" if tag == "textarea" else "<input type='text'>") + "</div>"
+                   for label, tag in fields)
+    return invitation_page(titles).replace(
+        "</body>", "<div class='modal-dialog' id='signupModal'><form>" + form +
+        "<button class='btn' type='button'>Save and Done</button></form></div></body>")
+
+
+def scaled_titles(base: Dict[int, str], count: Optional[int] = None):
+    """Repeat an event map's titles until there are `count` rows (default: map size)."""
+    items = [base[k] for k in sorted(base)]
+    count = count or len(items)
+    return [items[i % len(items)] + ("" if i < len(items) else f" #{i // len(items) + 1}")
+            for i in range(count)]
+
+
+def write_page(html: str, name: str, out_dir: Optional[str] = None) -> str:
+    """Write html under bench/.pages and return a file:// URL for driver.get()."""
+    out_dir = out_dir or os.path.join(ROOT, "bench", ".pages")
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, name)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return "file://" + os.path.abspath(path)
+
+
+def heavy_page(rows: str, images: int = 24, fonts: int = 2) -> str:
+    """Wrap invitation rows with slow images, web fonts and a fake analytics tag (see heavy_asset)."""
+    imgs = "".join(f'<img src="/img/banner{i}.png" width="40" height="40">' for i in range(images))
+    faces = "".join(f"@font-face{{font-family:F{i};src:url(/fonts/f{i}.woff2)}}" for i in range(fonts))
+    return ("<!doctype html><html><head><meta charset='utf-8'><title>Invitation</title>"
+            f"<style>{faces} body{{font-family:F0,sans-serif}}</style>"
+            "<script async src='/www.googletagmanager.com/gtag/js'></script></head>"
+            f"<body><div class='banners'>{imgs}</div>{rows}</body></html>")
+
+
+def heavy_asset(path: str, delay: float = 0.4, size: int = 200_000):
+    """Slow binary responses for heavy_page's images, fonts and analytics script."""
+    if path.startswith("/img/"):
+        return b"\x89PNG" + bytes(size), "image/png", delay
+    if path.startswith("/fonts/"):
+        return bytes(size // 4), "font/woff2", delay
+    if "googletagmanager.com" in path:
+        return b"/* analytics */", "application/javascript", delay * 3
+    return None
+
+
+def serve(routes: Dict[str, Callable[[], str]], port: int = 0,
+          assets: Optional[Callable[[str], Optional[tuple]]] = None):
+    """
+    Serve {path: callable -> html} on 127.0.0.1 from a daemon thread. Other paths go
+    to assets(path) -> (bytes, content_type, delay_secs) or None (404).
+    Returns (server, base_url); call server.shutdown() when done.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            fn = routes.get(path)
+            asset = None if fn or assets is None else assets(path)
+            if asset is not None:
+                body, ctype, delay = asset
+                time.sleep(delay)
+            else:
+                body = (fn() if fn else "not found").encode("utf-8")
+                ctype = "text/html; charset=utf-8"
+            self.send_response(200 if (fn or asset) else 404)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the signup.com pages and endpoints stglac_autosign.py uses.
+
+  .venv/bin/python bench/standin.py --port 8765 --release-in 60 --fill 36:0.5,38:3
+  python stglac_autosign.py --site-base http://127.0.0.1:8765 --detect observe
+
+Routes (GROUP/ENTRY default to stglac_autosign.GROUP_ID/PARENT_DUTIES_ENTRY_ID; one
+server can host several StandIn sites with different ids, see start()):
+  GET  /group/GROUP                             group page; the Parent Duties card
+                                                appears once the release time passes
+  GET  /login/entry/ENTRY                       redirects to the invitation page
+  GET  /client/invitation2/secure/ENTRY/false   invitation list: "Continue as" modal,
+                                                Hide Full Spots / Show My Spots Only
+                                                filters, "Show more spots" paging, and
+                                                the Identify → Confirm → participant
+                                                form modals behind each SIGN UP button
+  GET  /api/invitation/ENTRY/spots              JSON spot list
+  POST /api/invitation/ENTRY/identify           {"email"}
+  POST /api/invitation/ENTRY/signup             {"spotId", "name", "email", "phone", "bib"}
+  POST /api/invitation/ENTRY/event             page beacons (signup_click, save) for benches
+
+Spots can fill on a schedule (seconds after release). Not a copy of the live
+site: just the structures the selectors and the HTTP engine rely on.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional
+
+from fixtures import assignment_row, group_page, import_autosign, scaled_titles
+
+sa = import_autosign()
+PAGE_SIZE = 20  # rows shown before "Show more spots"
+
+# Client side of the invitation page. Modals are created on open and removed on
+# close, so at most one email input / Continue button exists at any time.
+_INVITATION_JS = """
+const API = %(api)s, PAGE = %(page)d;
+let shown = PAGE, spot = null, email = '';
+const rows = () => Array.from(document.querySelectorAll('.assignment-widget'));
+const beacon = (event, extra) => navigator.sendBeacon(API + '/event',
+  JSON.stringify(Object.assign({event: event, t: Date.now()}, extra || {})));
+function applyView() {
+  const hideFull = document.getElementById('hideFull').checked;
+  const mine = document.getElementById('mineOnly').checked;
+  rows().forEach((r, i) => {
+    const off = i >= shown || (hideFull && r.dataset.full === '1') || mine;
+    r.style.display = off ? 'none' : '';
+  });
+  document.getElementById('more').style.display = shown < rows().length ? '' : 'none';
+}
+function modal(html) {
+  closeModal();
+  const m = document.createElement('div');
+  m.id = 'modal'; m.className = 'modal-backdrop';
+  m.innerHTML = '<div class="modal-dialog">' + html + '</div>';
+  document.body.appendChild(m);
+  return m;
+}
+function closeModal() { const m = document.getElementById('modal'); if (m) m.remove(); }
+function openIdentify() {
+  modal('<h3>Identify yourself</h3><input type="email" class="email" placeholder="you@example.com">' +
+        '<button class="btn" id="idContinue">Continue</button>');
+}
+function openConfirm() {
+  modal('<p>Sign up as <b>' + email + '</b>?</p><button class="btn" id="confirmBtn">Confirm</button>');
+}
+function openForm() {
+  modal('<form onsubmit="return false"><label>Name</label><input type="text" name="name">' +
+        '<label>Email</label><input type="text" name="pemail"><label>Phone</label><input type="text" name="phone">' +
+        '<label>ONE Bib Number</label><input type="text" name="bib">' +
+        '<button class="btn" id="saveDone">Save and Done</button></form>');
+}
+document.addEventListener('click', async e => {
+  const t = e.target;
+  if (t.closest('#continueAsBtn')) { document.getElementById('continueAs').remove(); return; }
+  if (t.closest('#more')) { setTimeout(() => { shown += PAGE; applyView(); }, 150); return; }
+  const su = t.closest('button.vsl-signup');
+  if (su) { spot = su.dataset.spot; beacon('signup_click', {spot: spot}); setTimeout(openIdentify, 80); return; }
+  if (t.closest('#idContinue')) {
+    email = document.querySelector('#modal input[type=email]').value;
+    await fetch(API + '/identify', {method: 'POST', body: JSON.stringify({email: email})});
+    setTimeout(openConfirm, 80); return;
+  }
+  if (t.closest('#confirmBtn')) { setTimeout(openForm, 80); return; }
+  if (t.closest('#saveDone')) {
+    const v = n => document.querySelector('#modal input[name=' + n + ']').value;
+    const body = {spotId: spot, name: v('name'), email: v('pemail'), phone: v('phone'), bib: v('bib')};
+    const r = await fetch(API + '/signup', {method: 'POST', body: JSON.stringify(body)});
+    beacon('save', {spot: spot, status: r.status});
+    modal(r.ok ? '<h3>Thank you for signing up!</h3>' : '<h3>Sorry, this spot is full.</h3>');
+  }
+});
+document.addEventListener('change', e => { if (e.target.type === 'checkbox') applyView(); });
+applyView();
+"""
+
+
+class StandIn:
+    """
+    Mutable site state shared by all request threads.
+    release_at: epoch seconds when the Parent Duties entry opens (None = already open).
+    fill: {row number: seconds after release} when that spot becomes Full by itself.
+    group_id/entry_id: the ids in its URLs (default: the script's configured group).
+    """
+
+    def __init__(self, titles: List[str], full: Iterable[int] = (), expose_api: bool = True,
+                 release_at: Optional[float] = None, fill: Optional[Dict[int, float]] = None,
+                 continue_as: bool = True, group_id: Optional[str] = None, entry_id: Optional[str] = None):
+        self.lock = threading.Lock()
+        self.group_id = group_id or sa.GROUP_ID
+        self.entry_id = entry_id or sa.PARENT_DUTIES_ENTRY_ID
+        self.group_path = f"/group/{self.group_id}"
+        self.entry_path = f"/login/entry/{self.entry_id}"
+        self.invitation_path = f"/client/invitation2/secure/{self.entry_id}/false"
+        self.api = f"/api/invitation/{self.entry_id}"
+        full = set(full)
+        self.spots = [{"id": f"s{i}", "title": t, "remaining": 0 if i in full else 1}
+                      for i, t in enumerate(titles, start=1)]
+        self.expose_api = expose_api
+        self.release_at = release_at
+        self.fill = dict(fill or {})
+        self.continue_as = continue_as
+        self.signups: List[Dict] = []
+        self.events: List[Dict] = []
+        self.identified: set = set()
+
+    def released(self) -> bool:
+        return self.release_at is None or time.time() >= self.release_at
+
+    def _remaining(self, i: int, sp: Dict) -> int:
+        # Scheduled fills count from the release time
+        due = self.fill.get(i)
+        if due is not None and time.time() >= (self.release_at or 0) + due:
+            return 0
+        return sp["remaining"]
+
+    def spot_list(self) -> List[Dict]:
+        with self.lock:
+            return [{**sp, "remaining": self._remaining(i, sp)} for i, sp in enumerate(self.spots, start=1)]
+
+    def group_html(self) -> str:
+        return group_page(self.entry_id, released=self.released(), record_clicks=False)
+
+    def invitation_html(self) -> str:
+        head = ""
+        if self.expose_api:
+            head = ("<script>window.__INVITATION__ = " + json.dumps({
+                "entryId": self.entry_id,
+                "urls": {"spots": f"{self.api}/spots", "identify": f"{self.api}/identify",
+                         "signup": f"{self.api}/signup"},
+            }) + ";</script>")
+        if not self.released():
+            body = "<div id='invitation'><p>This sign up is not open yet.</p></div>"
+        else:
+            rows = "\n".join(assignment_row(sp["title"], "signup" if sp["remaining"] > 0 else "full",
+                                            spot_id=sp["id"]) for sp in self.spot_list())
+            modal = ""
+            if self.continue_as:
+                modal = ("<div id='continueAs' class='modal-backdrop'><div class='modal-dialog'>"
+                         "<button class='btn' id='continueAsBtn'><span data-i18n='ConfirmEmailContinueAs'>"
+                         "Continue as bench@example.com</span></button></div></div>")
+            body = ("<div id='invitation'><div class='filters'>"
+                    "<label><input type='checkbox' id='hideFull' checked> Hide Full Spots</label>"
+                    "<label><input type='checkbox' id='mineOnly'> Show My Spots Only</label></div>"
+                    f"<div class='dayRow'>{rows}</div>"
+                    "<button class='btn vsl-orangebtn' id='more' data-i18n='_OverflowMoreJobs_'>Show more spots</button>"
+                    f"</div>{modal}<script>{_INVITATION_JS % {'api': json.dumps(self.api), 'page': PAGE_SIZE}}</script>")
+        return ("<!doctype html><html><head><meta charset='utf-8'><title>Invitation</title>" + head +
+                "</head><body>" + body + "</body></html>")
+
+    def claim(self, body: Dict):
+        with self.lock:
+            i, sp = next(((i, x) for i, x in enumerate(self.spots, start=1) if x["id"] == body.get("spotId")),
+                         (None, None))
+            if sp is None:
+                return 404, {"ok": False, "error": "no such spot"}
+            if not self.released() or self._remaining(i, sp) <= 0:
+                return 409, {"ok": False, "error": "full"}
+            sp["remaining"] -= 1
+            self.signups.append({**body, "at": time.time()})
+            return 200, {"ok": True, "spotId": sp["id"]}
+
+
+def make_handler(sites: List[StandIn]):
+    def site_for(path: str) -> Optional[StandIn]:
+        return next((s for s in sites if path in (s.group_path, s.entry_path, s.invitation_path)
+                     or path.startswith(s.api + "/")), None)
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code: int, body, ctype: str, headers: Optional[Dict[str, str]] = None):
+            data = body if isinstance(body, bytes) else body.encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Cache-Control", "no-store")
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _json(self, code: int, obj):
+            self._send(code, json.dumps(obj), "application/json")
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            site = site_for(path)
+            if site is None:
+                self._send(404, "not found", "text/plain")
+            elif path == site.group_path:
+                self._send(200, site.group_html(), "text/html; charset=utf-8")
+            elif path == site.entry_path:
+                self._send(302, "", "text/plain", {"Location": site.invitation_path})
+            elif path == site.invitation_path:
+                self._send(200, site.invitation_html(), "text/html; charset=utf-8")
+            elif path == f"{site.api}/spots" and site.expose_api and site.released():
+                self._json(200, {"spots": site.spot_list()})
+            else:
+                self._send(404, "not found", "text/plain")
+
+        def do_POST(self):
+            path = self.path.split("?", 1)[0]
+            site = site_for(path)
+            if site is None:
+                return self._send(404, "not found", "text/plain")
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            except ValueError:
+                return self._json(400, {"ok": False, "error": "bad json"})
+            if path == f"{site.api}/event":
+                with site.lock:
+                    site.events.append({**body, "server_t": time.time()})
+                self._json(200, {"ok": True})
+            elif path == f"{site.api}/signup":
+                self._json(*site.claim(body))
+            elif path == f"{site.api}/identify":
+                site.identified.add(body.get("email"))
+                self._json(200, {"ok": True})
+            else:
+                self._send(404, "not found", "text/plain")
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+
+def start(site, port: int = 0):
+    """
+    Run the stand-in on 127.0.0.1 in a daemon thread. site is one StandIn or a list of
+    them with distinct group/entry ids (several groups on one origin). Returns (server, base_url).
+    """
+    sites = site if isinstance(site, list) else [site]
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(sites))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def parse_fill(raw: str) -> Dict[int, float]:
+    """"36:0.5,38:3" → {36: 0.5, 38: 3.0}"""
+    out = {}
+    for part in raw.split(","):
+        if ":" in part:
+            k, v = part.split(":", 1)
+            out[int(k)] = float(v)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--week", choices=("A", "B"), default="A")
+    ap.add_argument("--full", default="", help="Comma-separated row numbers that start Full.")
+    ap.add_argument("--release-in", type=float, default=0, help="Open the entry this many seconds from now.")
+    ap.add_argument("--fill", default="", help="Spots that fill after release, e.g. 36:0.5,38:3")
+    ap.add_argument("--no-api", action="store_true", help="Hide the JSON endpoints (forces fallback).")
+    ap.add_argument("--no-continue-as", action="store_true", help="Skip the 'Continue as' modal.")
+    ap.add_argument("--group", default=sa.GROUP_ID, help="Group id in the URLs.")
+    ap.add_argument("--entry", default=sa.PARENT_DUTIES_ENTRY_ID, help="Parent Duties entry id in the URLs.")
+    args = ap.parse_args()
+    full = [int(x) for x in args.full.split(",") if x.strip().isdigit()]
+    site = StandIn(scaled_titles(sa.week_map(args.week)), full=full, expose_api=not args.no_api,
+                   release_at=time.time() + args.release_in if args.release_in else None,
+                   fill=parse_fill(args.fill), continue_as=not args.no_continue_as,
+                   group_id=args.group, entry_id=args.entry)
+    server, base = start(site, args.port)
+    print(f"stand-in serving {base}  (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
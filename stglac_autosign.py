@@ -4,7 +4,7 @@ STGLAC SignUp auto-joiner (self-bootstrapping, index-based, Test vs Auto) with a
 
 Parents only need Python + Google Chrome. On first run this script:
 - creates a local .venv
-- installs selenium + webdriver-manager
+- installs selenium + webdriver-manager + requests
 - relaunches itself inside the venv
 
 Run:
@@ -14,20 +14,53 @@ Optional flags:
   --dry-run    # stop after clicking Sign Up (modal open), do not submit
   --shots-subdir NAME  # save under ./screenshots/NAME/<timestamp>
   --start-only # open group → click View → handle Continue → stop on invitation page
+  --detect observe  # click 'View' the moment it appears (MutationObserver) instead of 30 s refresh polling
+  --detect adaptive --expect-open HH:MM:SS  # cheap checks: sparse far from the open time, sub-second around it
+  --release-at HH:MM:SS  # warm Chrome during the prompts, wait for the release time, then go
+  --engine http  # browserless fast path (direct HTTP), falls back to Chrome if discovery fails
+  --snap-mode deferred  # cheap CDP screenshots written in the background, none written mid-race
+  --snap-frames critical --snap-keep-runs N  # write only sign-up/failure frames; trim runs older than the last N
+  --profile-dir DIR  # keep a Chrome profile between runs: warm cache, already-identified session
+  --fast-load  # eager page loads; images, fonts and analytics blocked
+  --scrape-index A|B  # save the live spot list as that week's event index; later runs pick by title
+  --watch-minutes MIN  # preferences full? watch them and claim one as soon as it frees up
+  --backend cdp  # talk to Chrome over the DevTools websocket (no chromedriver round trips)
+  --record  # also save DOM snapshots, network responses and step timings (record.zip; holds contact details, keep it private)
+  --replay ARCHIVE  # re-run the flow offline against a --record archive
+  --daemon FILE --release-day MON --release-at HH:MM:SS  # weekly, unattended; recycles Chrome, resumes after crashes
+  --profile-startup  # print launch → first prompt time (bootstrap, imports, setup)
+  --targets FILE  # several groups/entries from one browser, one tab each (roster columns + group,entry)
+  --serve PORT [--workers N]  # local HTTP API (token printed at startup): queue sign-up jobs onto N warm Chrome sessions
+  --roster FILE  # batch: every family in a CSV/JSON roster at once (name,email,phone,bib,week,prefs)
+Every run also writes trace.json (per-step time, WebDriver commands, expired waits) into its
+screenshot folder; open it in chrome://tracing or ui.perfetto.dev.
 """
 
 # --- self-bootstrap: create .venv, install deps, relaunch inside it ---
-import os, sys, subprocess, venv
-NEEDED = ("selenium", "webdriver-manager")
+import os, sys, subprocess, time, venv
+import importlib.util
+_T_SCRIPT = time.time()  # --profile-startup
+# (import name, pip/distribution name)
+NEEDED = (("selenium", "selenium"), ("webdriver_manager", "webdriver-manager"),
+          ("requests", "requests"))  # --engine http; declared, not left to webdriver-manager
+DEPS_MARKER = ".stglac-deps"  # inside .venv: hash of the installed dependency versions
 
 def _have_needed() -> bool:
-    try:
-        import importlib
-        for m in NEEDED:
-            importlib.import_module(m)
-        return True
-    except Exception:
-        return False
+    # find_spec only locates the packages; nothing is imported
+    return all(importlib.util.find_spec(mod) is not None for mod, _ in NEEDED)
+
+def _deps_hash(venv_dir: str) -> str | None:
+    """Hash of the NEEDED name-version dist-info folders in the venv (None if any is missing)."""
+    import glob, hashlib
+    found = []
+    for _, dist in NEEDED:
+        pat = os.path.join(venv_dir, "Lib" if os.name == "nt" else "lib*/python*", "site-packages",
+                           dist.replace("-", "_") + "-*.dist-info")
+        hits = sorted(os.path.basename(h) for h in glob.glob(pat))
+        if not hits:
+            return None
+        found += hits
+    return hashlib.sha1("\n".join([sys.version] + found).encode()).hexdigest()
 
 if os.environ.get("STGLAC_BOOTSTRAPPED") != "1":
     venv_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".venv")
@@ -35,39 +68,129 @@ if os.environ.get("STGLAC_BOOTSTRAPPED") != "1":
         if not os.path.isdir(venv_dir):
             venv.EnvBuilder(with_pip=True).create(venv_dir)
         py = os.path.join(venv_dir, "Scripts" if os.name == "nt" else "bin", "python")
-        # Install/upgrade pip and required packages
-        subprocess.check_call([py, "-m", "pip", "install", "--upgrade", "pip"])
-        subprocess.check_call([py, "-m", "pip", "install", "selenium", "webdriver-manager"])
+        marker = os.path.join(venv_dir, DEPS_MARKER)
+        try:
+            with open(marker) as f:
+                warm = f.read().strip() == _deps_hash(venv_dir)
+        except OSError:
+            warm = False
+        if not warm:
+            # Cold start: install the required packages (pip itself is left as it is)
+            subprocess.check_call([py, "-m", "pip", "install", "--disable-pip-version-check",
+                                   *(dist for _, dist in NEEDED)])
+            with open(marker, "w") as f:
+                f.write(_deps_hash(venv_dir) or "")
         # Relaunch inside venv
         env = dict(os.environ)
         env["STGLAC_BOOTSTRAPPED"] = "1"
+        env["STGLAC_T_SCRIPT"] = str(_T_SCRIPT)
+        env["STGLAC_BOOT"] = "warm venv" if warm else "installed deps"
         os.execve(py, [py, __file__, *sys.argv[1:]], env)
 # --- end self-bootstrap ---
 
 import argparse
+import base64
+import concurrent.futures
+import contextlib
+import fnmatch
+import functools
+import hashlib
+import itertools
+import json
+import queue
+import random
 import re
-import time
-from datetime import datetime
+import secrets
+import shutil
+import statistics
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import Dict, List
+from urllib.parse import urljoin, urlparse
+
+class _LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access (see warm_imports).
+    A plain import_module under the import lock, not importlib's LazyLoader: the
+    warm-up thread and prearm/session threads may touch it at the same time, which
+    LazyLoader does not survive before Python 3.12.3.
+    """
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import (ElementNotInteractableException, JavascriptException,
+                                        NoSuchElementException, StaleElementReferenceException,
+                                        TimeoutException, WebDriverException)
+# The heavy ones (remote WebDriver + BiDi, chromedriver service, webdriver-manager)
+# load on first use, or in the background while the prompts are answered
+EC = _LazyModule("selenium.webdriver.support.expected_conditions")
 import os as _os  # after bootstrap; used by Snapper
+_T_IMPORTED = time.time()
 
 # ---------- Config ----------
-GROUP_URL = "https://signup.com/group/581591834043"
+# Default target; set_site / set_target repoint these (--site-base, --targets)
+SITE_BASE = "https://signup.com"
+GROUP_ID = "581591834043"
+GROUP_URL = f"{SITE_BASE}/group/{GROUP_ID}"
 INVITATION_URL_HINT = "signup.com/client/invitation2"
 PARENT_DUTIES_ENTRY_ID = "9140767160102"  # Stable entry id for Parent Duties card
+INVITATION_URL = f"{SITE_BASE}/client/invitation2/secure/{PARENT_DUTIES_ENTRY_ID}/false"
+HTTP_TIMEOUT = 10       # --engine http: per-request timeout (seconds)
+# --fast-load: eager page loads, and these URL patterns ('*' wildcard) blocked over CDP.
+# CSS and scripts are never blocked: visibility checks and the list/forms need them.
+FAST_LOAD_BLOCK = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.mp4",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*",
+    "*connect.facebook.*", "*hotjar.com*", "*nr-data.net*", "*newrelic.com*", "*fullstory.com*",
+    "*intercom.io*", "*intercomcdn.com*", "*clarity.ms*",
+]
+# URLs matching any of these are never blocked (extend with --fast-load-allow)
+FAST_LOAD_ALLOW: List[str] = []
+# chromedriver paths keyed by Chrome major version, kept next to .venv
+DRIVER_CACHE = _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), ".chromedriver-cache.json")
 
 POLL_SECS = 30          # group page poll interval for "View"
 MAX_POLL_MINUTES = 30   # max time to wait for "View"
+# --detect adaptive: (seconds from the expected open time ≥, check interval), first match wins
+POLL_SCHEDULE = ((600, 30.0), (120, 5.0), (20, 1.0), (0, 0.3))
+POLL_JITTER = 0.15      # ± fraction of each interval
+POLL_BACKOFF_MAX = 60   # cap (seconds) while the site throttles (429/503/no answer)
+ADAPTIVE_REFRESH_SECS = 120  # full reload at least this often even if checks see nothing
+DAEMON_RSS_MB = 1500    # daemon: recycle Chrome once its process tree uses this much memory
+DAEMON_RECYCLE_MINUTES = 45  # daemon: ...or once it has been running this long
+DAEMON_CHECK_SECS = 10  # daemon: liveness/memory check interval
+DAEMON_LEAD_MINUTES = 10  # daemon: start Chrome this long before each release
+DAEMON_RESTARTS = 3     # daemon: attempts per release, counted across process restarts
+# daemon checkpoint, one per roster file ({key}: hash of its absolute path)
+DAEMON_STATE = _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), ".daemon-state-{key}.json")
+SERVE_HOST = "127.0.0.1"  # --serve: local only; requests also need the per-run token
 WAIT = 20               # explicit wait (seconds)
+SCRIPT_TIMEOUT = 30     # session async-script timeout (the WebDriver default); restored after long scripts
 SHORT = 5
+SNAP_FORMAT = "webp"    # --snap-mode async/deferred: CDP-encoded frames ("webp" or "jpeg") instead of PNG
+SNAP_QUALITY = 70
+# Shot labels containing these are kept by --snap-frames critical and by retention
+SNAP_FAILURE_HINTS = ("exception", "missing", "fail", "timeout", "cancel", "no_", "nothing")
+SNAP_CRITICAL_HINTS = ("pref_", "manual_pick", "clicked", "save", "final_state", "dry_run", "confirm", "identify")
+SNAP_QUEUE_MAX = 16     # max frames waiting for the writer threads (shot() blocks beyond this)
+VIEW_FETCH_MS = 750     # observe mode: background fetch of the group page (0 = off)
+VIEW_REARM_SECS = 60    # observe mode: refresh + re-arm the observer at least this often
+WATCH_RESYNC_SECS = 60  # watch mode: re-snapshot the preferred rows this often (no reload)
+WATCH_REFRESH_SECS = 300  # watch mode: full page reload this often
+# Scraped spot lists (--scrape-index), one versioned JSON per group and week
+EVENT_INDEX_DIR = _os.path.join(_os.path.dirname(_os.path.abspath(__file__)), "event-index")
 
 # ---------- Full 62-item EVENT MAP (index = row number shown to parent) ----------
 EVENT_MAP: Dict[int, str] = {
@@ -202,418 +325,3730 @@ WEEK_A_EVENT_MAP: Dict[int, str] = {
   63: "_9G Age Group Assistant (5:15pm)",
 }
 WEEK_B_EVENT_MAP: Dict[int, str] = dict(EVENT_MAP)
+# Weeks whose hand-kept map copies the live spot titles; the others (shortened labels)
+# cannot be matched by title, so --engine http needs a --scrape-index for them
+TITLED_WEEKS = ("A",)
 
 # ---------- Utils ----------
 class Snapper:
-    def __init__(self, base_dir: str | None = None):
+    """
+    Audit screenshots, numbered in call order.
+    mode="sync"      (default) lossless PNG captured and written inline (no background work,
+                     large files)
+    mode="async"     one CDP Page.captureScreenshot inline; Chrome encodes the frame to
+                     SNAP_FORMAT inside that call, so only the base64 decode and the disk
+                     write happen on background threads behind a bounded queue (PNG
+                     through WebDriver if CDP is unavailable)
+    mode="deferred"  async, and frames taken between hold() and release() (the
+                     Sign Up → Save and Done critical path) are only written on release()
+    Identical frames (same content hash) are written once. frames="critical" writes only
+    critical and failure frames (see frame_kind). Every call, written or not, is listed
+    in the run's index.json on close(); keep_runs > 0 then trims older runs in base_dir.
+    With a recorder, shots between hold() and release() only mark its timeline (any
+    mode): the DOM snapshot and response pull wait for the first shot after release().
+    """
+    def __init__(self, base_dir: str | None = None, mode: str = "sync", frames: str = "all",
+                 keep_runs: int = 0):
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base = base_dir or _os.path.join(".", "screenshots")
-        self.dir = _os.path.join(base, ts)
-        _os.makedirs(self.dir, exist_ok=True)
+        self.base = base_dir or _os.path.join(".", "screenshots")
+        _os.makedirs(self.base, exist_ok=True)
+        # Snappers started in the same second (sessions, targets) each get their own folder
+        for k in itertools.count(1):
+            self.dir = _os.path.join(self.base, ts if k == 1 else f"{ts}_{k}")
+            try:
+                _os.mkdir(self.dir)
+                break
+            except FileExistsError:
+                continue
         self.n = 0
+        self.mode = mode
+        self.frames = frames
+        self.keep_runs = keep_runs
+        self.t0 = time.monotonic()
+        self.index = []   # one entry per shot() call
+        self._seen = {}   # content hash -> file name
+        self._pool = ThreadPoolExecutor(max_workers=2) if mode != "sync" else None
+        self._slots = threading.BoundedSemaphore(SNAP_QUEUE_MAX)
+        self._futures = []
+        self._held = False
+        self._critical = False  # between hold() and release(), whatever the mode
+        self._deferred = []
+        self.recorder = None  # --record: a Recorder checkpointed on every shot
+
     def shot(self, driver, label: str):
         self.n += 1
-        path = _os.path.join(self.dir, f"{self.n:02d}_{label}.png")
-        try:
-            driver.save_screenshot(path)
+        if self.recorder is not None:
+            if self._critical:
+                self.recorder.mark(f"{self.n:02d}_{label}")
+            else:
+                self.recorder.checkpoint(driver, f"{self.n:02d}_{label}")
+        entry = {"n": self.n, "label": label, "kind": frame_kind(label),
+                 "t": round(time.monotonic() - self.t0, 3), "file": None}
+        self.index.append(entry)
+        if self.frames == "critical" and entry["kind"] == "info":
+            return
+        if self._pool is None:
+            try:
+                data, ext = driver.get_screenshot_as_png(), "png"
+            except Exception as e:
+                print(f"[snap] failed: {e}")
+                return
+            digest = hashlib.sha1(data).hexdigest()
+        else:
+            try:
+                data = driver.execute_cdp_cmd("Page.captureScreenshot",
+                                              {"format": SNAP_FORMAT, "quality": SNAP_QUALITY})["data"]
+                ext = "jpg" if SNAP_FORMAT == "jpeg" else SNAP_FORMAT
+            except Exception:
+                try:
+                    data, ext = driver.get_screenshot_as_base64(), "png"
+                except Exception as e:
+                    print(f"[snap] failed: {e}")
+                    return
+            digest = hashlib.sha1(data.encode()).hexdigest()
+        if digest in self._seen:
+            entry.update(file=self._seen[digest], sha1=digest[:12], dup=True)
+            print(f"[snap] {label}: unchanged, same as {self._seen[digest]}")
+            return
+        name = f"{self.n:02d}_{label}.{ext}"
+        path = _os.path.join(self.dir, name)
+        self._seen[digest] = name
+        entry.update(file=name, sha1=digest[:12],
+                     bytes=len(data) if isinstance(data, bytes) else len(data) * 3 // 4 - data[-2:].count("="))
+        if self._pool is None:
+            try:
+                with open(path, "wb") as f:
+                    f.write(data)
+                print(f"[snap] {path}")
+            except Exception as e:
+                print(f"[snap] write failed {path}: {e}")
+        elif self._held:
+            self._deferred.append((path, data))
+            print(f"[snap] {path} (deferred)")
+        else:
+            self._submit(path, data)
             print(f"[snap] {path}")
+
+    def _submit(self, path: str, data: str):
+        self._slots.acquire()
+        fut = self._pool.submit(self._write, path, data)
+        fut.add_done_callback(lambda _: self._slots.release())
+        # Long-lived Snappers (--serve sessions) would otherwise keep every finished write
+        self._futures = [f for f in self._futures if not f.done()] + [fut]
+
+    @staticmethod
+    def _write(path: str, data: str):
+        try:
+            with open(path, "wb") as f:
+                f.write(base64.b64decode(data))
         except Exception as e:
-            print(f"[snap] failed: {e}")
+            print(f"[snap] write failed {path}: {e}")
 
-def build_driver(headless: bool):
-    opts = Options()
-    if headless:
-        opts.add_argument("--headless=new")
-        opts.add_argument("--window-size=1400,1800")
-    else:
-        opts.add_argument("--start-maximized")
-    opts.add_experimental_option("excludeSwitches", ["enable-automation"])
-    opts.add_experimental_option("useAutomationExtension", False)
-    service = Service(ChromeDriverManager().install())
-    return webdriver.Chrome(service=service, options=opts)
+    def hold(self):
+        """Start the critical path: deferred mode keeps frames in memory until release()."""
+        self._critical = True
+        if self.mode == "deferred":
+            self._held = True
 
-def wait_exist(driver, xp, timeout=WAIT):
-    return WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.XPATH, xp)))
+    def release(self):
+        """End the critical path and queue held frames in their original order. Idempotent."""
+        self._held = self._critical = False
+        if self._pool is None:
+            return
+        pending, self._deferred = self._deferred, []
+        for path, data in pending:
+            self._submit(path, data)
 
-def wait_click(driver, xp, timeout=WAIT):
-    el = WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((By.XPATH, xp)))
-    driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-    el.click()
-    return el
+    def close(self):
+        """Flush held frames, wait for every pending write, then write index.json and apply retention."""
+        self.release()
+        for fut in self._futures:
+            fut.result()
+        self._futures = []
+        written = {e["file"] for e in self.index if e["file"] and not e.get("dup")}
+        write_snap_index(self.dir, {"run": _os.path.basename(self.dir), "mode": self.mode,
+                                    "frames": self.frames, "shots": self.n, "files": len(written),
+                                    "bytes": sum(e.get("bytes", 0) for e in self.index if not e.get("dup")),
+                                    "pruned": False, "index": self.index})
+        if self.keep_runs > 0:
+            prune_runs(self.base, self.keep_runs)
 
-def click_any(driver, xps: List[str], timeout=WAIT) -> bool:
-    for xp in xps:
-        try:
-            wait_click(driver, xp, timeout)
-            return True
-        except Exception:
-            pass
-    return False
+def frame_kind(label: str) -> str:
+    """'failure', 'critical' (the sign-up itself) or 'info' (navigation, polling) for a shot label."""
+    low = label.lower()
+    if any(h in low for h in SNAP_FAILURE_HINTS):
+        return "failure"
+    if any(h in low for h in SNAP_CRITICAL_HINTS):
+        return "critical"
+    return "info"
 
-def exist_any(driver, xps: List[str], timeout=SHORT) -> bool:
-    for xp in xps:
-        try:
-            wait_exist(driver, xp, timeout)
-            return True
-        except Exception:
-            pass
-    return False
+def write_snap_index(run_dir: str, data: Dict):
+    try:
+        with open(_os.path.join(run_dir, "index.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+    except Exception as e:
+        print(f"[snap] could not write index for {run_dir}: {e}")
 
-# ---------- Group page: poll 'View' only ----------
-def handle_view_button_only(driver, snap: Snapper) -> bool:
+def prune_runs(base_dir: str, keep: int):
     """
-    Stay on the group page and poll until the orange 'View' button is clickable,
-    then click it. No other entry paths are used.
+    Retention: the newest `keep` run folders under base_dir stay complete; older ones
+    keep only their critical and failure frames (their index.json stays whole, with
+    pruned frames marked file=None).
     """
-    driver.get(GROUP_URL)
-    time.sleep(2)
-    snap.shot(driver, "group_loaded")
-
-    # Prefer clicking the Parent Duties link by its stable entry id if present
-    try:
-        pd_link = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((
-            By.XPATH,
-            f"//a[contains(@href, '/login/entry/{PARENT_DUTIES_ENTRY_ID}')]"
-        )))
-        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", pd_link)
-        snap.shot(driver, "group_parent_duties_link_visible")
-        pd_link.click()
-        snap.shot(driver, "group_parent_duties_link_clicked")
-        WebDriverWait(driver, WAIT).until(EC.url_contains(INVITATION_URL_HINT))
-        return True
-    except Exception:
-        # Try navigating directly to the secure invitation URL as a fallback
+    runs = sorted((d for d in _os.listdir(base_dir)
+                   if re.fullmatch(r"\d{8}_\d{6}(_\d+)?", d) and _os.path.isdir(_os.path.join(base_dir, d))),
+                  key=lambda d: (d[:15], int(d[16:] or 1)))
+    freed = 0
+    for run in runs[:-keep]:
+        run_dir = _os.path.join(base_dir, run)
         try:
-            direct_url = f"https://signup.com/client/invitation2/secure/{PARENT_DUTIES_ENTRY_ID}/false"
-            driver.get(direct_url)
-            snap.shot(driver, "group_parent_duties_direct_nav")
-            WebDriverWait(driver, WAIT).until(EC.url_contains(INVITATION_URL_HINT))
-            return True
+            with open(_os.path.join(run_dir, "index.json"), encoding="utf-8") as f:
+                data = json.load(f)
         except Exception:
-            pass
-
-    VIEW_XPATHS = [
-        # Target the Parent Duties card by its title/link text, then find its View button
-        "//a[contains(., 'Parent Duties') or contains(., 'Parent Duty') or contains(., 'Parent Duties Week')]/ancestor::div[.//button[@data-i18n='View' or contains(., 'View')]][1]//button[@data-i18n='View' or contains(., 'View')]",
-        # Alt: search any element containing Parent Duties text and pick a descendant View button
-        "(//*[contains(normalize-space(.), 'Parent Duties') or contains(normalize-space(.), 'Parent Duties Week')]//button[@data-i18n='View' or contains(., 'View')])[1]",
-        # Fallback: the second visible 'View' (Parent Duties typically second card)
-        "(//button[@data-i18n='View' or contains(., 'View')])[2]",
-        # Generic fallbacks
-        "//div[contains(@class,'form-row') and contains(@class,'button')]//button[@data-i18n='View']",
-        "//div[contains(@class,'form-row') and contains(@class,'button')]//button[contains(., 'View')]",
-        "//button[@data-i18n='View']",
-        "//button[contains(., 'View')]",
-        "//a[contains(., 'View')]",
-    ]
-
-    deadline = time.time() + MAX_POLL_MINUTES * 60
-    while time.time() < deadline:
-        for xp in VIEW_XPATHS:
-            try:
-                el = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, xp)))
-                driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-                snap.shot(driver, "group_view_visible")
-                el.click()
-                snap.shot(driver, "group_view_clicked")
-                WebDriverWait(driver, WAIT).until(EC.url_contains(INVITATION_URL_HINT))
-                return True
-            except Exception:
-                pass
-        print(f"[poll] 'View' not visible/clickable yet… retrying in {POLL_SECS}s")
-        time.sleep(POLL_SECS)
-        driver.refresh()
-    return False
+            # Older run without an index: classify by file name
+            data = {"run": run, "index": [{"label": _os.path.splitext(n)[0], "file": n,
+                                           "kind": frame_kind(n)} for n in sorted(_os.listdir(run_dir))
+                                          if n.endswith((".png", ".jpg", ".webp"))]}
+        if data.get("pruned"):
+            continue
+        keep_files = {e["file"] for e in data["index"] if e["file"] and e["kind"] != "info"}
+        for e in data["index"]:
+            if e["file"] and e["file"] not in keep_files:
+                path = _os.path.join(run_dir, e["file"])
+                if _os.path.exists(path):
+                    freed += _os.path.getsize(path)
+                    _os.remove(path)
+                e["file"] = None
+        data["pruned"] = True
+        write_snap_index(run_dir, data)
+    if freed:
+        print(f"[snap] retention: freed {freed / 1e6:.1f} MB in runs older than the last {keep}")
 
-# ---------- Invitation page utilities ----------
-def handle_continue_as_if_present(driver, snap: Snapper):
-    try:
-        if exist_any(driver, ["//span[@data-i18n='ConfirmEmailContinueAs']"], timeout=3):
-            snap.shot(driver, "continue_as_modal_seen")
-            btn = "//button[.//span[@data-i18n='ConfirmEmailContinueAs']]"
-            wait_click(driver, btn, timeout=WAIT)
-            snap.shot(driver, "continue_as_clicked")
-            WebDriverWait(driver, WAIT).until_not(EC.presence_of_element_located((By.XPATH, btn)))
-    except Exception:
-        pass
+def chrome_major_version() -> str | None:
+    """Installed Chrome's major version (e.g. "124"), or None if it cannot be read."""
+    if _os.name == "nt":
+        cmds = [["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"],
+                ["reg", "query", r"HKEY_LOCAL_MACHINE\Software\Google\Chrome\BLBeacon", "/v", "version"]]
+    elif sys.platform == "darwin":
+        cmds = [["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome", "--version"]]
+    else:
+        cmds = [[b, "--version"] for b in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")]
+    for cmd in cmds:
+        try:
+            out = subprocess.run(cmd, capture_output=True, text=True, timeout=5).stdout
+        except Exception:
+            continue
+        m = re.search(r"(\d+)\.\d+\.\d+\.\d+", out)
+        if m:
+            return m.group(1)
+    return None
 
-def ensure_day_expanded(driver, snap: Snapper):
+def _load_driver_cache() -> Dict[str, str]:
     try:
-        snap.shot(driver, "invitation_list_initial")
-        # Keep clicking "Show more spots" until it no longer appears
-        while True:
-            try:
-                btn = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((
-                    By.XPATH,
-                    "//*[self::button or self::a][@data-i18n='_OverflowMoreJobs_' or contains(@class,'vsl-orangebtn') or contains(normalize-space(.), 'Show more spots')]"
-                )))
-                driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
-                snap.shot(driver, "show_more_spots_visible")
-                txt_before = driver.page_source
-                btn.click()
-                # wait briefly for list to grow / button to re-render
-                time.sleep(0.6)
-            except Exception:
-                break
-        # Expand the current day if collapsed (generic selectors)
-        clicked = click_any(driver, [
-            "//div[contains(@class,'dayRow') and contains(@class,'collapsed')]",
-            "//button[contains(@class,'day') and contains(@class,'expand')]",
-        ], timeout=3)
-        if clicked:
-            time.sleep(0.5)
-            snap.shot(driver, "day_expanded")
+        with open(DRIVER_CACHE, encoding="utf-8") as f:
+            return json.load(f)
     except Exception:
-        pass
+        return {}
 
-def uncheck_hide_full_spots_if_checked(driver, snap: Snapper):
+def resolve_chromedriver():
+    """
+    Offline-first chromedriver lookup. Returns (path, source):
+      cache             path recorded for this Chrome major version, still on disk
+      selenium-manager  Selenium Manager in --offline mode (its own cache, no network)
+      webdriver-manager download; only reached when the Chrome version changed
+    """
+    major = chrome_major_version()
+    cache = _load_driver_cache()
+    path = cache.get(major) if major else None
+    if path and _os.path.isfile(path):
+        return path, "cache"
+    path, source = None, "webdriver-manager"
     try:
-        lbl = driver.find_element(By.XPATH, "//label[contains(.,'Hide Full Spots')]")
-        cb = lbl.find_element(By.XPATH, ".//input[@type='checkbox']")
-        if cb.is_selected():
-            (lbl or cb).click()
-            time.sleep(0.3)
-            snap.shot(driver, "hide_full_spots_unchecked")
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+        path = SeleniumManager().binary_paths(["--browser", "chrome", "--offline"]).get("driver_path")
+        source = "selenium-manager"
     except Exception:
-        pass
+        path = None
+    if not path or not _os.path.isfile(path):
+        from webdriver_manager.chrome import ChromeDriverManager
+        path, source = ChromeDriverManager().install(), "webdriver-manager"
+    if major:
+        cache[major] = path
+        try:
+            with open(DRIVER_CACHE, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=1)
+        except Exception as e:
+            print(f"[driver] could not write {DRIVER_CACHE}: {e}")
+    return path, source
 
-def uncheck_show_my_spots_only_if_checked(driver, snap: Snapper):
-    try:
-        lbl = driver.find_element(By.XPATH, "//label[contains(.,'Show My Spots Only')]")
-        cb = lbl.find_element(By.XPATH, ".//input[@type='checkbox']")
-        if cb.is_selected():
-            (lbl or cb).click()
-            time.sleep(0.3)
-            snap.shot(driver, "show_my_spots_unchecked")
-    except Exception:
-        pass
+def globs_overlap(a: str, b: str) -> bool:
+    """True if some string matches both '*'-wildcard patterns."""
+    @functools.lru_cache(maxsize=None)
+    def meet(i: int, j: int) -> bool:
+        if i < len(a) and a[i] == "*":
+            return meet(i + 1, j) or (j < len(b) and meet(i, j + 1))
+        if j < len(b) and b[j] == "*":
+            return meet(i, j + 1) or (i < len(a) and meet(i + 1, j))
+        if i == len(a) or j == len(b):
+            return i == len(a) and j == len(b)
+        return a[i].lower() == b[j].lower() and meet(i + 1, j + 1)
+    return meet(0, 0)
+
+def fast_load_allow(allow: List[str] | None = None) -> List[str]:
+    return list(FAST_LOAD_ALLOW) + list(allow or [])
 
-def collect_event_actions(driver):
+def fast_load_blocked(url: str, allow: List[str] | None = None) -> bool:
+    """The per-request rule: a FAST_LOAD_BLOCK pattern matches the URL and no allow pattern does."""
+    low = url.lower()
+    return (any(fnmatch.fnmatchcase(low, b.lower()) for b in FAST_LOAD_BLOCK)
+            and not any(fnmatch.fnmatchcase(low, a.lower()) for a in fast_load_allow(allow)))
+
+def fast_load_patterns(allow: List[str] | None = None) -> List[str]:
     """
-    Return a DOM-ordered list of visible assignment rows with their action button and title.
-    Each item: {"index": i, "row": WebElement, "btn": WebElement, "title": str}
+    Block patterns that no allowed URL can match, safe to block wholesale with
+    Network.setBlockedURLs. The rest need the per-request check (fast_load_blocked).
     """
-    rows = driver.find_elements(By.XPATH, "//div[contains(@class,'assignment-widget')]")
-    actions = []
-    idx = 0
-    for row in rows:
-        # Find the action control (Sign Up / Full) within the row
-        try:
-            btn = row.find_element(
-                By.XPATH,
-                ".//*[self::button or self::a]"
-                "[normalize-space()='SIGN UP' or contains(.,'Sign Up') or "
-                " normalize-space()='Full' or normalize-space()='FULL']"
-            )
-        except Exception:
-            continue
-        try:
-            if not row.is_displayed():
-                continue
-        except Exception:
-            pass
-        idx += 1
-        try:
-            title_el = row.find_element(By.XPATH, ".//a[contains(@class,'title') or contains(@class,'SpotTitle')]")
-            title = title_el.text
-        except Exception:
-            title = row.text
-        actions.append({"index": idx, "row": row, "btn": btn, "title": title})
-    return actions
+    allow = fast_load_allow(allow)
+    return [b for b in FAST_LOAD_BLOCK if not any(globs_overlap(a, b) for a in allow)]
 
-def is_signup_button(btn) -> bool:
+def apply_fast_load(driver, allow: List[str] | None = None):
+    """
+    Block non-essential requests over CDP for this driver's tabs. Patterns an allow
+    entry overlaps are checked per request on the CDP backend (Fetch interception);
+    chromedriver does not deliver CDP events, so the webdriver backend leaves them open.
+    """
+    patterns = fast_load_patterns(allow)
+    mixed = [b for b in FAST_LOAD_BLOCK if b not in patterns]
     try:
-        txt = (btn.text or "").lower()
-        cls = (btn.get_attribute("class") or "").lower()
-        return ("sign up" in txt) and btn.is_enabled() and ("disabled" not in cls)
-    except Exception:
-        return False
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        note = ""
+        if mixed and isinstance(driver, CdpDriver):
+            driver.intercept_blocked(mixed, allow)
+            note = f", {len(mixed)} checked per request against the allow list"
+        elif mixed:
+            note = f", {len(mixed)} left open for the allow list (--backend cdp checks them per request)"
+        print(f"[fast-load] eager loads, {len(patterns)} URL patterns blocked{note}")
+    except Exception as e:
+        print(f"[fast-load] could not block URLs ({e}); eager loads only")
 
-# ---------- Identify / Confirm / Participant form ----------
-def identify_and_confirm(driver, snap: Snapper, email: str):
-    # Identify modal
-    snap.shot(driver, "identify_modal_open")
-    email_x = ["//input[@type='email']", "//input[contains(@placeholder,'@')]", "//input[contains(@class,'email')]"]
-    for xp in email_x:
-        try:
-            el = wait_exist(driver, xp); el.clear(); el.send_keys(email); break
-        except Exception:
-            pass
+def build_driver(headless: bool, profile_dir: str | None = None, fast: bool = False,
+                 allow: List[str] | None = None, backend: str = "webdriver", record: bool = False):
+    t0 = time.perf_counter()
+    if backend == "cdp":
+        driver = CdpDriver(headless, profile_dir=profile_dir, fast=fast, allow=allow, record=record)
+        print(f"[timing] build_driver {time.perf_counter() - t0:.2f}s (raw CDP, no chromedriver)")
+        return driver
+    opts = Options()
+    if fast:
+        # driver.get/refresh return at DOMContentLoaded; waits and observers cover the rest
+        opts.page_load_strategy = "eager"
+    if profile_dir:
+        # Isolated Chrome profile (batch workers each get their own)
+        opts.add_argument(f"--user-data-dir={_os.path.abspath(profile_dir)}")
+    if headless:
+        opts.add_argument("--headless=new")
+        opts.add_argument("--window-size=1400,1800")
     else:
-        snap.shot(driver, "identify_email_not_found")
-        raise RuntimeError("Email input not found on Identify modal.")
-    snap.shot(driver, "identify_email_filled")
-    if not click_any(driver, ["//button[contains(.,'Continue')]", "//a[contains(.,'Continue')]"]):
-        snap.shot(driver, "identify_continue_missing")
-        raise RuntimeError("Continue button not found on Identify modal.")
-
-    # Confirm modal
-    snap.shot(driver, "confirm_modal_open")
-    if not click_any(driver, ["//button[contains(.,'Confirm')]", "//a[contains(.,'Confirm')]"]):
-        snap.shot(driver, "confirm_button_missing")
-        raise RuntimeError("Confirm button not found.")
-    snap.shot(driver, "confirm_clicked")
-
-def fill_participant_form(driver, snap: Snapper, name: str, email: str, phone: str, bib: str,
-                          confirm_before_save: bool, selection_text: str) -> bool:
-    def set_field(label_contains: str, val: str):
-        xp = f"//label[contains(.,'{label_contains}')]/following::*[self::input or self::textarea][1]"
-        el = wait_exist(driver, xp); el.clear(); el.send_keys(val)
+        opts.add_argument("--start-maximized")
+    opts.add_experimental_option("excludeSwitches", ["enable-automation"])
+    opts.add_experimental_option("useAutomationExtension", False)
+    if record:
+        # Network events for Recorder (read back with driver.get_log("performance"))
+        opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    path, source = resolve_chromedriver()
+    t1 = time.perf_counter()
+    from selenium.webdriver.chrome.service import Service
+    driver = count_commands(webdriver.Chrome(service=Service(path), options=opts))
+    if fast:
+        apply_fast_load(driver, allow)
+    print(f"[timing] build_driver {time.perf_counter() - t0:.2f}s "
+          f"(driver lookup {t1 - t0:.2f}s via {source}, Chrome start {time.perf_counter() - t1:.2f}s)")
+    return driver
 
-    snap.shot(driver, "participant_form_open")
-    set_field("Name", name)
-    set_field("Email", email)
-    set_field("Phone", phone)
-    try:
-        set_field("ONE Bib", bib)
-    except Exception:
-        set_field("Bib", bib)
-    snap.shot(driver, "participant_form_filled")
+# ---------- Raw CDP backend (--backend cdp) ----------
+# Same Selenium-shaped surface the helpers above use (find_element(s), execute_script,
+# execute_async_script, get/refresh, screenshots, element click/text/...), but every
+# call is one DevTools message to Chrome over a websocket: no chromedriver hop.
+asyncio = _LazyModule("asyncio")  # only the cdp backend needs it; loaded on first use
+def chrome_binary() -> str | None:
+    """Path of the installed Chrome/Chromium executable, or None."""
+    if _os.name == "nt":
+        roots = [_os.environ.get(k, "") for k in ("PROGRAMFILES", "PROGRAMFILES(X86)", "LOCALAPPDATA")]
+        cands = [_os.path.join(r, "Google", "Chrome", "Application", "chrome.exe") for r in roots if r]
+    elif sys.platform == "darwin":
+        cands = ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"]
+    else:
+        cands = [shutil.which(b) for b in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")]
+    return next((c for c in cands if c and _os.path.isfile(c)), None)
 
-    if confirm_before_save:
-        print("\n=== TEST MODE: Review selection before saving ===")
-        print(selection_text)
-        resp = input("Proceed to 'Save and Done'? [y/N]: ").strip().lower()
-        if resp not in ("y", "yes"):
-            print("Aborted before save. (Nothing submitted.)")
-            snap.shot(driver, "aborted_before_save")
-            return False
+class CdpSocket:
+    """Minimal RFC 6455 websocket client (text frames, masked sends) on asyncio streams."""
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
 
-    if not click_any(driver, ["//button[contains(.,'Save and Done')]", "//a[contains(.,'Save and Done')]"]):
-        snap.shot(driver, "save_and_done_missing")
-        raise RuntimeError("Save and Done not found.")
-    snap.shot(driver, "save_and_done_clicked")
-    return True
+    @classmethod
+    async def connect(cls, url: str) -> "CdpSocket":
+        u = urlparse(url)
+        reader, writer = await asyncio.open_connection(u.hostname, u.port or 80, limit=1 << 26)
+        key = base64.b64encode(_os.urandom(16)).decode()
+        writer.write((f"GET {u.path or '/'} HTTP/1.1\r\nHost: {u.netloc}\r\nUpgrade: websocket\r\n"
+                      f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                      "Sec-WebSocket-Version: 13\r\n\r\n").encode())
+        head = await reader.readuntil(b"\r\n\r\n")
+        if b" 101 " not in head.split(b"\r\n", 1)[0]:
+            raise WebDriverException(f"CDP websocket handshake failed: {head[:80]!r}")
+        return cls(reader, writer)
 
-# ---------- Main ----------
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--headless", action="store_true", help="Run Chrome headless")
-    ap.add_argument("--dry-run", action="store_true",
-                    help="Stop after clicking 'Sign Up' (modal open), do not submit anything.")
-    ap.add_argument("--shots-subdir", default="", metavar="NAME",
-                    help="Save screenshots under ./screenshots/NAME/<timestamp>.")
-    ap.add_argument("--start-only", action="store_true",
-                    help="Open group page, click orange 'View', handle 'Continue as…' modal, then exit on invitation page.")
-    args = ap.parse_args()
+    async def _frame(self, opcode: int, payload: bytes):
+        n = len(payload)
+        if n < 126:
+            head = bytes([0x80 | opcode, 0x80 | n])
+        elif n < 1 << 16:
+            head = bytes([0x80 | opcode, 0x80 | 126]) + n.to_bytes(2, "big")
+        else:
+            head = bytes([0x80 | opcode, 0x80 | 127]) + n.to_bytes(8, "big")
+        mask = _os.urandom(4)
+        key = (mask * (n // 4 + 1))[:n]
+        body = (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big") if n else b""
+        self.writer.write(head + mask + body)
+        await self.writer.drain()
 
-    print("== STGLAC Auto Sign ==")
+    async def send(self, text: str):
+        await self._frame(0x1, text.encode())
 
-    # Fast smoke test for locked weeks
-    if args.start_only:
-        try:
-            base_shots_dir = _os.path.join(".", "screenshots", args.shots_subdir) if args.shots_subdir else _os.path.join(".", "screenshots")
-            snap = Snapper(base_dir=base_shots_dir)
-            driver = build_driver(args.headless)
-            if not handle_view_button_only(driver, snap):
-                print("[error] Timed out waiting for the orange 'View' button.")
-                return
-            handle_continue_as_if_present(driver, snap)
-            snap.shot(driver, "start_only_invitation_page")
-            print("[start-only] Reached invitation page. Exiting.")
-        except Exception as e:
-            print(f"[exception] {e}")
-            snap.shot(driver, "start_only_exception")
-        finally:
-            time.sleep(3)
-        return
-    # Choose mode
-    def ask(prompt, ok):
+    async def recv(self) -> str:
+        parts = []
         while True:
-            s = input(prompt).strip()
-            if ok(s): return s
-            print("  -> Please try again.")
+            b0, b1 = await self.reader.readexactly(2)
+            n = b1 & 0x7F
+            if n == 126:
+                n = int.from_bytes(await self.reader.readexactly(2), "big")
+            elif n == 127:
+                n = int.from_bytes(await self.reader.readexactly(8), "big")
+            mask = await self.reader.readexactly(4) if b1 & 0x80 else None
+            data = await self.reader.readexactly(n)
+            if mask:
+                data = bytes(c ^ mask[i % 4] for i, c in enumerate(data))
+            opcode = b0 & 0x0F
+            if opcode == 0x8:
+                raise ConnectionError("CDP websocket closed")
+            if opcode == 0x9:
+                await self._frame(0xA, data)
+                continue
+            if opcode in (0x0, 0x1, 0x2):
+                parts.append(data)
+                if b0 & 0x80:
+                    return b"".join(parts).decode()
 
-    # Week selection first
-    week = ask("Week: [A] or [B] : ", lambda s: s.strip().upper() in ("A","B"))
-    week = week.strip().upper()
+    def close(self):
+        self.writer.close()
 
-    mode = ask("Mode: [1] Test (confirm before save)  [2] Auto : ",
-               lambda s: s in ("1","2"))
-    test_mode = (mode == "1")
+# Selenium-style script wrappers. DOM nodes in the result are swapped for markers
+# and parked in globalThis.__stglacRefs, fetched as remote objects only when present.
+_CDP_ENCODE = r"""
+  const refs = [];
+  const enc = v => {
+    if (v instanceof Node) { refs.push(v); return {__stglac_el: refs.length - 1}; }
+    if (Array.isArray(v)) return v.map(enc);
+    if (v && typeof v === 'object') { const o = {}; for (const k of Object.keys(v)) o[k] = enc(v[k]); return o; }
+    return v === undefined ? null : v;
+  };
+  const out = x => { globalThis.__stglacRefs = refs; return {v: enc(x), n: refs.length}; };
+"""
+_CDP_SYNC = "function () {" + _CDP_ENCODE + " return out((function () {\n@BODY@\n}).apply(this, arguments)); }"
+_CDP_ASYNC = ("function () {" + _CDP_ENCODE + " const a = Array.from(arguments);"
+              " return new Promise(res => { a.push(x => res(out(x))); (function () {\n@BODY@\n}).apply(this, a); }); }")
+_FIND_JS = r"""
+const root = arguments[0] || document, how = arguments[1], what = arguments[2], all = arguments[3];
+if (how === 'css selector') return all ? Array.from(root.querySelectorAll(what)) : root.querySelector(what);
+if (!all) return document.evaluate(what, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const it = document.evaluate(what, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const out = [];
+for (let i = 0; i < it.snapshotLength; i++) out.push(it.snapshotItem(i));
+return out;
+"""
 
-    # Choose the week's map
-    ACTIVE_MAP = WEEK_A_EVENT_MAP if week == "A" else WEEK_B_EVENT_MAP
+class CdpElement:
+    """A DOM node held as a CDP remote object; the WebElement methods the flow uses."""
+    def __init__(self, driver: "CdpDriver", object_id: str):
+        self._driver, self.object_id = driver, object_id
 
-    print("\nPick up to 3 event numbers (comma-separated) from:")
-    for k in range(1, len(ACTIVE_MAP)+1):
-        print(f"  {k:02d}: {ACTIVE_MAP[k]}")
+    def _js(self, body: str, *args):
+        return self._driver.execute_script(body, self, *args)
 
-    name  = ask("\nYour full name: ", lambda s: len(s) > 1)
-    email = ask("Email: ", lambda s: "@" in s and "." in s)
-    phone = ask("Phone: ", lambda s: len(re.sub(r'\D+','', s)) >= 6)
-    bib   = ask("Bib number: ", lambda s: len(s) > 0)
+    def find_element(self, by: str, value: str):
+        return self._driver._find(self, by, value, False)
 
-    def parse_prefs(raw: str) -> List[int]:
-        out, seen = [], set()
-        for p in raw.split(","):
-            p = p.strip()
-            if p.isdigit():
-                n = int(p)
-                if 1 <= n <= len(ACTIVE_MAP) and n not in seen:
-                    out.append(n); seen.add(n)
-        return out[:3]
+    def find_elements(self, by: str, value: str):
+        return self._driver._find(self, by, value, True)
 
-    prefs = parse_prefs(ask("Preferred events (e.g. 36,38,35): ",
-                            lambda s: len(parse_prefs(s)) > 0))
-    print(f"> preferences: {prefs}\n")
+    @property
+    def text(self) -> str:
+        return self._js("return (arguments[0].innerText || '').trim();")
 
-    # Now open Chrome after collecting inputs
-    base_shots_dir = _os.path.join(".", "screenshots", args.shots_subdir) if args.shots_subdir else _os.path.join(".", "screenshots")
-    snap = Snapper(base_dir=base_shots_dir)
-    driver = build_driver(args.headless)
+    @property
+    def tag_name(self) -> str:
+        return self._js("return arguments[0].tagName.toLowerCase();")
 
-    try:
-        # 1) Group page: wait for and click the orange "View"
-        if not handle_view_button_only(driver, snap):
-            print("[error] Timed out waiting for the orange 'View' button.")
-            return
+    def get_attribute(self, name: str):
+        return self._js("const e = arguments[0], p = e[arguments[1]];"
+                        "if (typeof p === 'boolean') return p ? 'true' : null;"
+                        "if (p != null && typeof p !== 'object' && typeof p !== 'function') return String(p);"
+                        "return e.getAttribute(arguments[1]);", name)
 
-        # 2) Invitation page: handle dialogs/filters
-        handle_continue_as_if_present(driver, snap)
-        if INVITATION_URL_HINT not in driver.current_url:
-            print(f"[warn] Invitation URL not detected (ok if embedded): {driver.current_url}")
+    def is_displayed(self) -> bool:
+        return bool(self._js("const e = arguments[0];"
+                             "return !!e.getClientRects().length && getComputedStyle(e).visibility !== 'hidden';"))
 
-        ensure_day_expanded(driver, snap)
-        uncheck_hide_full_spots_if_checked(driver, snap)
-        uncheck_show_my_spots_only_if_checked(driver, snap)
+    def is_enabled(self) -> bool:
+        return not self._js("return !!arguments[0].disabled;")
 
-        # 3) Collect rows and step by index
-        snap.shot(driver, "preference_index_mode_list")
-        actions = collect_event_actions(driver)
-        if not actions:
-            print("[result] No assignment rows found. (Filters? Day collapsed?)")
-            snap.shot(driver, "no_assignment_rows")
-            return
-        print(f"[info] Detected {len(actions)} assignment rows.")
+    def is_selected(self) -> bool:
+        return bool(self._js("return !!(arguments[0].checked || arguments[0].selected);"))
 
-        chosen = None
-        chosen_title = ""
-        for n in prefs:
-            i = n - 1
-            if i < 0 or i >= len(actions):
-                print(f"[skip] Preference #{n} is out of range (we see {len(actions)} rows).")
-                continue
+    def click(self):
+        """Trusted mouse press/release at the element's centre, like WebDriver's click."""
+        x, y, ok = self._js("const e = arguments[0]; e.scrollIntoView({block: 'center', inline: 'center'});"
+                            "const r = e.getBoundingClientRect();"
+                            "return [r.left + r.width / 2, r.top + r.height / 2, r.width > 0 && r.height > 0];")
+        if not ok:
+            raise ElementNotInteractableException("element has no size")
+        for kind in ("mousePressed", "mouseReleased"):
+            self._driver.execute_cdp_cmd("Input.dispatchMouseEvent", {"type": kind, "x": x, "y": y,
+                                                                      "button": "left", "clickCount": 1})
 
-            item = actions[i]
-            row, btn, title = item["row"], item["btn"], (item["title"] or "").strip()
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", row)
-            snap.shot(driver, f"pref_{n:02d}_row")
+    def clear(self):
+        self._js("const e = arguments[0]; e.focus(); e.value = '';"
+                 "e.dispatchEvent(new Event('input', {bubbles: true}));"
+                 "e.dispatchEvent(new Event('change', {bubbles: true}));")
 
-            if is_signup_button(btn):
-                print(f"[select] Preference #{n} is AVAILABLE — “{title[:80]}”. Clicking Sign Up…")
-                snap.shot(driver, f"pref_{n:02d}_before_click")
-                btn.click()
-                snap.shot(driver, f"pref_{n:02d}_clicked")
+    def send_keys(self, *values):
+        self._js("arguments[0].focus();")
+        self._driver.execute_cdp_cmd("Input.insertText", {"text": "".join(map(str, values))})
+
+class CdpDriver:
+    """
+    Chrome driven over its DevTools websocket. An asyncio loop on a daemon thread owns
+    the socket; the public methods are blocking, so WebDriverWait, Snapper and the
+    helpers work unchanged. self.commands counts DevTools round trips. With record=True
+    Network events are buffered for get_log("performance"), as chromedriver does.
+    """
+    def __init__(self, headless: bool, profile_dir: str | None = None, fast: bool = False,
+                 allow: List[str] | None = None, record: bool = False):
+        import urllib.request  # only the cdp backend needs it
+        binary = chrome_binary()
+        if not binary:
+            raise WebDriverException("Chrome executable not found for the CDP backend")
+        self._tmp = None if profile_dir else tempfile.mkdtemp(prefix="stglac-cdp-")
+        self._data_dir = _os.path.abspath(profile_dir or self._tmp)
+        port_file = _os.path.join(self._data_dir, "DevToolsActivePort")
+        if _os.path.exists(port_file):
+            _os.remove(port_file)
+        cmd = [binary, "--remote-debugging-port=0", f"--user-data-dir={self._data_dir}",
+               "--no-first-run", "--no-default-browser-check"]
+        cmd += ["--headless=new", "--window-size=1400,1800"] if headless else ["--start-maximized"]
+        self._proc = subprocess.Popen(cmd + ["about:blank"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.time() + WAIT
+        while not _os.path.exists(port_file) or _os.path.getsize(port_file) == 0:
+            if time.time() > deadline or self._proc.poll() is not None:
+                self._proc.kill()
+                raise WebDriverException("Chrome did not open a DevTools port")
+            time.sleep(0.05)
+        with open(port_file, encoding="utf-8") as f:
+            port = int(f.readline())
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/list", timeout=HTTP_TIMEOUT) as r:
+            page = next(t for t in json.load(r) if t.get("type") == "page")
+        self.commands = self.timeouts = 0
+        self._ids = itertools.count(1)
+        self._pending, self._waiters = {}, {}
+        self._perf = [] if record else None
+        self._allow = None  # set by intercept_blocked
+        self._script_timeout = 30.0
+        # Page.lifecycleEvent name that ends a navigation (keyed to its loaderId in _nav)
+        self._load_event = "DOMContentLoaded" if fast else "load"
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        self._await(self._open(page["webSocketDebuggerUrl"]))
+        for domain in ("Page.enable", "Runtime.enable") + (("Network.enable",) if record else ()):
+            self.execute_cdp_cmd(domain, {})
+        self.execute_cdp_cmd("Page.setLifecycleEventsEnabled", {"enabled": True})
+        self._main_frame = self.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]["frame"]["id"]
+        if fast:
+            apply_fast_load(self, allow)
+
+    # -- plumbing --
+    async def _open(self, url: str):
+        self._ws = await CdpSocket.connect(url)
+        self._reader = asyncio.ensure_future(self._read())
+
+    async def _read(self):
+        try:
+            while True:
+                msg = json.loads(await self._ws.recv())
+                if "id" in msg:
+                    fut = self._pending.pop(msg["id"], None)
+                    if fut and not fut.done():
+                        fut.set_result(msg)
+                else:
+                    if self._perf is not None and msg.get("method", "").startswith("Network."):
+                        self._perf.append({"message": json.dumps({"message": msg})})
+                    if msg.get("method") == "Fetch.requestPaused":
+                        asyncio.ensure_future(self._decide(msg["params"]))
+                    for on_event in list(self._waiters.get(msg.get("method"), [])):
+                        on_event(msg.get("params", {}))
+        except Exception as e:
+            for fut in list(self._pending.values()):
+                if not fut.done():
+                    fut.set_exception(WebDriverException(f"CDP connection lost: {e}"))
+
+    async def _call(self, method: str, params: Dict):
+        i = next(self._ids)
+        fut = self._pending[i] = self._loop.create_future()
+        await self._ws.send(json.dumps({"id": i, "method": method, "params": params}))
+        msg = await fut
+        if "error" in msg:
+            err = msg["error"].get("message", str(msg["error"]))
+            if "object" in err.lower() and "id" in err.lower():
+                raise StaleElementReferenceException(err)
+            raise WebDriverException(f"{method}: {err}")
+        return msg.get("result", {})
+
+    async def _nav(self, method: str, params: Dict):
+        """
+        Run a navigation command and wait for the main frame's load lifecycle event of
+        the document it created: Page.navigate names its loaderId, a reload is the first
+        new loader after it. A late event from the previous document cannot end the wait.
+        """
+        seen, done = [], self._loop.create_future()
+        want = {"loader": None, "old": None}
+
+        def check():
+            if not done.done() and any(e.get("loaderId") == want["loader"] and e.get("name") == self._load_event
+                                       for e in seen):
+                done.set_result(None)
+
+        def on_event(p: Dict):
+            if p.get("frameId") != self._main_frame:
+                return
+            seen.append(p)
+            if want["loader"] is None and want["old"] is not None and p.get("name") == "init" \
+                    and p.get("loaderId") != want["old"]:
+                want["loader"] = p["loaderId"]
+            check()
+
+        self._waiters.setdefault("Page.lifecycleEvent", []).append(on_event)
+        try:
+            if method == "Page.reload":
+                want["old"] = (await self._call("Page.getFrameTree", {}))["frameTree"]["frame"].get("loaderId")
+            res = await self._call(method, params)
+            if res.get("errorText"):
+                raise WebDriverException(f"{method}: {res['errorText']}")
+            if method == "Page.navigate":
+                if not res.get("loaderId"):
+                    return  # same-document navigation: no new load
+                want["loader"] = res["loaderId"]
+                check()  # its events may have arrived before the answer
+            await done
+        finally:
+            self._waiters["Page.lifecycleEvent"].remove(on_event)
+
+    async def _decide(self, p: Dict):
+        """Let a paused request through unless fast_load_blocked says otherwise."""
+        try:
+            if fast_load_blocked(p["request"]["url"], self._allow):
+                await self._call("Fetch.failRequest", {"requestId": p["requestId"], "errorReason": "BlockedByClient"})
+            else:
+                await self._call("Fetch.continueRequest", {"requestId": p["requestId"]})
+        except Exception:
+            pass
+
+    def intercept_blocked(self, patterns: List[str], allow: List[str] | None):
+        """Pause requests matching patterns and decide each one by its URL (see _decide)."""
+        self._allow = allow
+        self.execute_cdp_cmd("Fetch.enable", {"patterns": [{"urlPattern": p} for p in patterns]})
+
+    def _await(self, coro, timeout: float | None = None):
+        fut = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return fut.result(timeout)
+        except concurrent.futures.TimeoutError:
+            fut.cancel()
+            self.timeouts += 1
+            raise TimeoutException(f"CDP command timed out after {timeout}s")
+
+    def execute_cdp_cmd(self, cmd: str, params: Dict):
+        self.commands += 1
+        return self._await(self._call(cmd, params), timeout=self._script_timeout + WAIT)
+
+    # -- scripts --
+    def _script(self, template: str, body: str, args, is_async: bool):
+        fn = template.replace("@BODY@", body)
+        elems = [a for a in args if isinstance(a, CdpElement)]
+        params = {"returnByValue": True, "awaitPromise": is_async}
+        if elems:
+            params.update(functionDeclaration=fn, objectId=elems[0].object_id,
+                          arguments=[{"objectId": a.object_id} if isinstance(a, CdpElement) else {"value": a}
+                                     for a in args])
+            method = "Runtime.callFunctionOn"
+        else:
+            params["expression"] = f"({fn}).apply(globalThis, {json.dumps(list(args))})"
+            method = "Runtime.evaluate"
+        self.commands += 1
+        res = self._await(self._call(method, params), timeout=self._script_timeout + (1 if is_async else WAIT))
+        if "exceptionDetails" in res:
+            d = res["exceptionDetails"]
+            raise JavascriptException((d.get("exception") or {}).get("description") or d.get("text", "script error"))
+        out = res["result"].get("value") or {}
+        if not out.get("n"):
+            return out.get("v")
+        refs = self.execute_cdp_cmd("Runtime.evaluate", {"expression": "globalThis.__stglacRefs"})["result"]
+        props = self.execute_cdp_cmd("Runtime.getProperties", {"objectId": refs["objectId"], "ownProperties": True})
+        ids = {p["name"]: p["value"]["objectId"] for p in props["result"] if p["name"].isdigit()}
+
+        def dec(v):
+            if isinstance(v, dict):
+                if "__stglac_el" in v:
+                    return CdpElement(self, ids[str(v["__stglac_el"])])
+                return {k: dec(x) for k, x in v.items()}
+            if isinstance(v, list):
+                return [dec(x) for x in v]
+            return v
+        return dec(out.get("v"))
+
+    def execute_script(self, body: str, *args):
+        return self._script(_CDP_SYNC, body, args, False)
+
+    def execute_async_script(self, body: str, *args):
+        return self._script(_CDP_ASYNC, body, args, True)
+
+    def delete_all_cookies(self):
+        self.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+    def get_log(self, kind: str) -> List[Dict]:
+        if kind != "performance" or self._perf is None:
+            return []
+        out, self._perf = self._perf, []
+        return out
+
+    def set_script_timeout(self, secs: float):
+        self._script_timeout = float(secs)
+
+    def _find(self, root, by: str, value: str, many: bool):
+        found = self.execute_script(_FIND_JS, root, by, value, many)
+        if not many and found is None:
+            raise NoSuchElementException(f"no element for {by} {value}")
+        return found or []
+
+    def find_element(self, by: str, value: str):
+        return self._find(None, by, value, False)
+
+    def find_elements(self, by: str, value: str):
+        return self._find(None, by, value, True)
+
+    # -- navigation and screenshots --
+    def _navigate(self, method: str, params: Dict):
+        self.commands += 1
+        self._await(self._nav(method, params), timeout=60)
+
+    def get(self, url: str):
+        self._navigate("Page.navigate", {"url": url})
+
+    def refresh(self):
+        self._navigate("Page.reload", {})
+
+    @property
+    def current_url(self) -> str:
+        # Browser-side history, not the page: answers while a navigation is committing
+        h = self.execute_cdp_cmd("Page.getNavigationHistory", {})
+        return h["entries"][h["currentIndex"]]["url"]
+
+    @property
+    def title(self) -> str:
+        return self.execute_script("return document.title;")
+
+    def get_screenshot_as_base64(self) -> str:
+        return self.execute_cdp_cmd("Page.captureScreenshot", {"format": "png"})["data"]
+
+    def get_screenshot_as_png(self) -> bytes:
+        return base64.b64decode(self.get_screenshot_as_base64())
+
+    def save_screenshot(self, path: str) -> bool:
+        with open(path, "wb") as f:
+            f.write(self.get_screenshot_as_png())
+        return True
+
+    def quit(self):
+        try:
+            self._await(self._call("Browser.close", {}), timeout=5)
+        except Exception:
+            pass
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+        if self._tmp:
+            shutil.rmtree(self._tmp, ignore_errors=True)
+
+# ---------- Step trace (Chrome trace JSON) ----------
+class TimedWait:
+    """
+    WebDriverWait that counts expired waits on its driver (driver.timeouts, next to
+    driver.commands) for the step trace, so sessions on other threads never mix in.
+    Wraps rather than subclasses it, so selenium's wait module loads on first use.
+    """
+    def __init__(self, driver, timeout: float, **kwargs):
+        from selenium.webdriver.support.ui import WebDriverWait
+        self._driver = driver
+        self._wait = WebDriverWait(driver, timeout, **kwargs)
+
+    def until(self, method, message: str = ""):
+        try:
+            return self._wait.until(method, message)
+        except TimeoutException:
+            count_timeout(self._driver)
+            raise
+
+    def until_not(self, method, message: str = ""):
+        try:
+            return self._wait.until_not(method, message)
+        except TimeoutException:
+            count_timeout(self._driver)
+            raise
+
+def count_timeout(driver):
+    try:
+        driver.timeouts = getattr(driver, "timeouts", 0) + 1
+    except AttributeError:
+        pass
+
+def count_commands(driver):
+    """
+    Give a Selenium driver .commands (WebDriver commands) and .timeouts (expired waits
+    and script/page-load timeouts) counters; CdpDriver keeps its own.
+    """
+    if hasattr(driver, "commands"):
+        return driver
+    driver.commands = driver.timeouts = 0
+    execute = driver.execute
+
+    def counted(command, params=None):
+        driver.commands += 1
+        try:
+            return execute(command, params)
+        except TimeoutException:  # script / page-load timeouts
+            driver.timeouts += 1
+            raise
+    driver.execute = counted
+    return driver
+
+class Tracer:
+    """
+    Named step spans: wall time, driver commands issued and waits that expired on the
+    span's driver while it was open (nested spans count inclusively). save() writes Chrome trace
+    JSON for chrome://tracing or ui.perfetto.dev. Inside `with tracer.use():` the spans a
+    thread opens on TRACER go to that tracer instead (--serve: one per job); a disabled
+    tracer records nothing.
+    """
+    _local = threading.local()
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.reset()
+
+    @contextlib.contextmanager
+    def use(self):
+        prev, Tracer._local.tracer = getattr(Tracer._local, "tracer", None), self
+        try:
+            yield self
+        finally:
+            Tracer._local.tracer = prev
+
+    def reset(self):
+        self.events = []
+        self.t0 = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, name: str, driver=None):
+        routed = getattr(Tracer._local, "tracer", None)
+        if routed is not None and routed is not self:
+            with routed.span(name, driver):
+                yield
+            return
+        if not self.enabled:
+            yield
+            return
+        c0, w0, t = getattr(driver, "commands", 0), getattr(driver, "timeouts", 0), time.perf_counter()
+        try:
+            yield
+        finally:
+            t1 = time.perf_counter()
+            self.events.append({"name": name, "cat": "step", "ph": "X", "pid": _os.getpid(),
+                                "tid": threading.get_native_id(),
+                                "ts": round((t - self.t0) * 1e6), "dur": round((t1 - t) * 1e6),
+                                "args": {"commands": getattr(driver, "commands", 0) - c0,
+                                         "timeouts": getattr(driver, "timeouts", 0) - w0}})
+
+    def save(self, path: str):
+        if not self.events:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": sorted(self.events, key=lambda e: e["ts"]),
+                           "displayTimeUnit": "ms"}, f, indent=1)
+        except Exception as e:
+            print(f"[trace] could not write {path}: {e}")
+            return
+        slow = sorted(self.events, key=lambda e: -e["dur"])[:3]
+        print(f"[trace] {len(self.events)} spans → {path}; slowest: "
+              + ", ".join(f"{e['name']} {e['dur'] / 1e6:.2f}s ({e['args']['commands']} cmds)" for e in slow))
+
+TRACER = Tracer()
+
+def traced(name: str):
+    """Run the decorated step inside a TRACER span (driver = first argument, if it is one)."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kw):
+            driver = args[0] if args and hasattr(args[0], "execute_script") else None
+            with TRACER.span(name, driver):
+                return fn(*args, **kw)
+        return inner
+    return wrap
+
+def wait_exist(driver, xp, timeout=WAIT):
+    return TimedWait(driver, timeout).until(EC.presence_of_element_located((By.XPATH, xp)))
+
+def wait_click(driver, xp, timeout=WAIT):
+    el = TimedWait(driver, timeout).until(EC.element_to_be_clickable((By.XPATH, xp)))
+    driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
+    el.click()
+    return el
+
+# One poll for all candidates: the first XPath (in list order) with a match wins.
+RACE_JS = r"""
+const xps = arguments[0], clickable = arguments[1];
+for (let i = 0; i < xps.length; i++) {
+  const el = document.evaluate(xps[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  if (!el) continue;
+  if (clickable && (!el.getClientRects().length || el.disabled ||
+                    getComputedStyle(el).visibility === 'hidden')) continue;
+  return [i, el];
+}
+return null;
+"""
+
+def race_any(driver, xps: List[str], timeout=WAIT, clickable: bool = False):
+    """
+    Wait once for whichever candidate XPath matches first. Every poll checks all of
+    them in a single execute_script, so a missing primary selector costs nothing
+    extra. Returns (index, element); raises TimeoutException if none shows up.
+    """
+    return TimedWait(driver, timeout, poll_frequency=0.1).until(
+        lambda d: d.execute_script(RACE_JS, xps, clickable) or False)
+
+def _report_winner(xps: List[str], i: int):
+    if i:
+        print(f"[race] fallback selector #{i + 1} won: {xps[i]}")
+
+def click_any(driver, xps: List[str], timeout=WAIT) -> bool:
+    deadline = time.time() + timeout
+    for _ in range(2):  # second pass only if the winner went stale before the click
+        try:
+            i, el = race_any(driver, xps, max(0.5, deadline - time.time()), clickable=True)
+            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
+            el.click()
+            _report_winner(xps, i)
+            return True
+        except Exception:
+            if time.time() >= deadline:
+                break
+    return False
+
+# ---------- Group page: poll 'View' only ----------
+def pd_link_xpath(entry_id: str) -> str:
+    return f"//a[contains(@href, '/login/entry/{entry_id}')]"
+
+PD_LINK_XPATH = pd_link_xpath(PARENT_DUTIES_ENTRY_ID)
+
+VIEW_XPATHS = [
+    # Target the Parent Duties card by its title/link text, then find its View button
+    "//a[contains(., 'Parent Duties') or contains(., 'Parent Duty') or contains(., 'Parent Duties Week')]/ancestor::div[.//button[@data-i18n='View' or contains(., 'View')]][1]//button[@data-i18n='View' or contains(., 'View')]",
+    # Alt: search any element containing Parent Duties text and pick a descendant View button
+    "(//*[contains(normalize-space(.), 'Parent Duties') or contains(normalize-space(.), 'Parent Duties Week')]//button[@data-i18n='View' or contains(., 'View')])[1]",
+    # Fallback: the second visible 'View' (Parent Duties typically second card)
+    "(//button[@data-i18n='View' or contains(., 'View')])[2]",
+    # Generic fallbacks
+    "//div[contains(@class,'form-row') and contains(@class,'button')]//button[@data-i18n='View']",
+    "//div[contains(@class,'form-row') and contains(@class,'button')]//button[contains(., 'View')]",
+    "//button[@data-i18n='View']",
+    "//button[contains(., 'View')]",
+    "//a[contains(., 'View')]",
+]
+
+# The configured entry; only its card is known to carry the "Parent Duties" text
+DEFAULT_ENTRY_ID = PARENT_DUTIES_ENTRY_ID
+
+def pd_view_xpaths(entry_id: str) -> List[str]:
+    """
+    Parent Duties–specific subset used by observe/adaptive mode (no generic "any View"
+    fallbacks). Other entries (--targets) match by entry id only: the text XPaths
+    would find this group's Parent Duties card instead.
+    """
+    return [pd_link_xpath(entry_id)] + (VIEW_XPATHS[:2] if entry_id == DEFAULT_ENTRY_ID else [])
+
+PD_VIEW_XPATHS = pd_view_xpaths(PARENT_DUTIES_ENTRY_ID)
+
+# Async script: click the first visible match, else wait on a MutationObserver for one.
+# A background fetch of the group page reports 'stale' when the server already renders
+# the control but the live DOM does not, so the caller can refresh once.
+VIEW_OBSERVER_JS = r"""
+const xps = arguments[0], fetchUrl = arguments[1], fetchMs = arguments[2], windowMs = arguments[3];
+const done = arguments[arguments.length - 1];
+const first = (doc, xp) => doc.evaluate(xp, doc, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const clickable = el => el && el.getClientRects().length && !el.disabled &&
+                        getComputedStyle(el).visibility !== 'hidden';
+let finished = false, obs = null, timer = null;
+const finish = r => {
+  if (finished) return;
+  finished = true;
+  if (obs) obs.disconnect();
+  if (timer) clearInterval(timer);
+  done(r);
+};
+const tryClick = (seenAt) => {
+  for (let i = 0; i < xps.length; i++) {
+    const el = first(document, xps[i]);
+    if (!clickable(el)) continue;
+    el.scrollIntoView({block: 'center'});
+    const clickedAt = performance.now();
+    window.__stglacView = {xpath: i, seenAt: seenAt, clickedAt: clickedAt};
+    finish({status: 'clicked', xpath: i, latencyMs: clickedAt - seenAt});
+    // Click after the callback so navigation cannot swallow the script result
+    setTimeout(() => el.click(), 0);
+    return true;
+  }
+  return false;
+};
+if (tryClick(performance.now())) return;
+obs = new MutationObserver(() => { if (!finished) tryClick(performance.now()); });
+obs.observe(document.documentElement, {childList: true, subtree: true, attributes: true,
+                                       attributeFilter: ['class', 'style', 'disabled', 'hidden']});
+if (fetchUrl && fetchMs > 0) {
+  let busy = false;
+  timer = setInterval(async () => {
+    if (busy || finished) return;
+    busy = true;
+    try {
+      const r = await fetch(fetchUrl, {credentials: 'include', cache: 'no-store'});
+      const doc = new DOMParser().parseFromString(await r.text(), 'text/html');
+      for (let i = 0; i < xps.length; i++) {
+        // Only stale if the live page lacks the node entirely (hidden nodes are the observer's job)
+        if (first(doc, xps[i]) && !first(document, xps[i])) { finish({status: 'stale', xpath: i}); break; }
+      }
+    } catch (e) {
+    } finally { busy = false; }
+  }, fetchMs);
+}
+setTimeout(() => finish({status: 'timeout'}), windowMs);
+"""
+
+@contextlib.contextmanager
+def script_timeout(driver, secs: float):
+    """Set the session-wide async-script timeout for one block, then restore SCRIPT_TIMEOUT."""
+    driver.set_script_timeout(secs)
+    try:
+        yield
+    finally:
+        try:
+            driver.set_script_timeout(SCRIPT_TIMEOUT)
+        except Exception:
+            pass
+
+def wait_view_event(driver, deadline: float, fetch_ms: int = VIEW_FETCH_MS,
+                    rearm_secs: int = VIEW_REARM_SECS):
+    """
+    Block on VIEW_OBSERVER_JS until a Parent Duties control is clicked in-page or the
+    deadline passes. Refreshes only when the background fetch says the page is stale,
+    or every rearm_secs as a safety net. Returns the script result dict or None.
+    """
+    while time.time() < deadline:
+        window = max(1.0, min(rearm_secs, deadline - time.time()))
+        try:
+            with script_timeout(driver, window + 5):
+                res = driver.execute_async_script(VIEW_OBSERVER_JS, PD_VIEW_XPATHS, GROUP_URL,
+                                                  fetch_ms, int(window * 1000))
+        except Exception as e:
+            print(f"[observe] script interrupted ({e.__class__.__name__}); re-arming")
+            res = {"status": "error"}
+        status = (res or {}).get("status")
+        if status == "clicked":
+            print(f"[observe] Parent Duties control #{res['xpath']} clicked "
+                  f"{res.get('latencyMs', 0):.0f} ms after it appeared")
+            return res
+        if status == "stale":
+            print("[observe] group page changed server-side; refreshing")
+        driver.refresh()
+    return None
+
+# Async script for --detect adaptive: one background fetch of the group page, parsed
+# off-DOM, plus a check of the live DOM; no reload. Reports the HTTP status (0 on a
+# network error) and Retry-After so the caller can back off.
+VIEW_CHECK_JS = r"""
+const xps = arguments[0], url = arguments[1], done = arguments[arguments.length - 1];
+const first = (doc, xp) => doc.evaluate(xp, doc, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const findIn = doc => { for (let i = 0; i < xps.length; i++) if (first(doc, xps[i])) return i; return -1; };
+const t0 = performance.now();
+fetch(url, {credentials: 'include', cache: 'no-store'}).then(async r => {
+  const found = r.ok ? findIn(new DOMParser().parseFromString(await r.text(), 'text/html')) : -1;
+  done({status: r.status, found: found, live: findIn(document), retryAfter: r.headers.get('Retry-After'),
+        ms: performance.now() - t0});
+}).catch(() => done({status: 0, found: -1, live: findIn(document), ms: performance.now() - t0}));
+"""
+
+def poll_interval(dt: float | None) -> float:
+    """
+    Base seconds between checks, dt seconds from the expected open time. With no
+    open time (None) there is nothing to ramp up around, so the sparse tier is
+    used: no more often than the old POLL_SECS refresh loop.
+    """
+    if dt is None:
+        return POLL_SCHEDULE[0][1]
+    return next(secs for edge, secs in POLL_SCHEDULE if abs(dt) >= edge)
+
+class ViewPoller:
+    """
+    --detect adaptive state for one group page: cheap VIEW_CHECK_JS checks on the
+    POLL_SCHEDULE ramp around the expected open time, with jitter, and exponential
+    backoff (honouring Retry-After) while the site answers 429/503 or not at all.
+    The page is only reloaded once the control is seen server-side, or every
+    ADAPTIVE_REFRESH_SECS as a safety net. check() runs one check and says when the
+    next is due, so one loop (poll_view_adaptive) or a shared scheduler over several
+    tabs (watch_targets) can drive it. save() writes poll-timeline.json.
+    """
+    def __init__(self, snap: Snapper, open_epoch: float | None = None, tag: str = "poll"):
+        self.snap = snap
+        self.open_epoch = open_epoch
+        self.tag = tag
+        self.timeline, self.strikes, self.phase = [], 0, None
+        self.last_refresh = time.time()
+
+    def check(self, driver) -> tuple[bool, float]:
+        """One check; (True, 0) once Parent Duties was clicked, else (False, seconds to the next check)."""
+        now = time.time()
+        dt = now - self.open_epoch if self.open_epoch else None
+        try:
+            with script_timeout(driver, HTTP_TIMEOUT + 5):
+                res = driver.execute_async_script(VIEW_CHECK_JS, PD_VIEW_XPATHS, GROUP_URL) or {}
+        except Exception as e:
+            res = {"status": 0, "found": -1, "live": -1, "error": e.__class__.__name__}
+        throttled = res.get("status") in (0, 429, 503)
+        self.strikes = self.strikes + 1 if throttled else 0
+        base = poll_interval(dt)
+        interval = base
+        if self.strikes:
+            interval = min(POLL_BACKOFF_MAX, max(base, 1.0) * 2 ** self.strikes)
+            retry = str(res.get("retryAfter") or "")
+            if retry.isdigit():
+                interval = max(interval, float(retry))
+        interval *= 1 + random.uniform(-POLL_JITTER, POLL_JITTER)
+        self.timeline.append({"t": round(now, 3), "dt": None if dt is None else round(dt, 3),
+                              "status": res.get("status"), "ms": round(res.get("ms") or 0, 1),
+                              "found": res.get("found"), "live": res.get("live"),
+                              "backoff": self.strikes, "next": round(interval, 3)})
+        if res.get("live", -1) >= 0 or res.get("found", -1) >= 0:
+            if res.get("live", -1) < 0:
+                driver.refresh()
+                self.last_refresh = time.time()
+            try:
+                i, el = race_any(driver, PD_VIEW_XPATHS, timeout=WAIT, clickable=True)
+                driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
+                self.snap.shot(driver, "group_view_visible")
+                el.click()
+                _report_winner(PD_VIEW_XPATHS, i)
+                print(f"[{self.tag}] Parent Duties clicked after {len(self.timeline)} checks")
+                self.snap.shot(driver, "group_view_clicked")
+                TimedWait(driver, WAIT).until(EC.url_contains(INVITATION_URL_HINT))
+                return True, 0.0
+            except Exception as e:
+                print(f"[{self.tag}] Parent Duties listed but not clickable yet ({e.__class__.__name__})")
+        elif time.time() - self.last_refresh >= ADAPTIVE_REFRESH_SECS:
+            driver.refresh()
+            self.last_refresh = time.time()
+        if (base, self.strikes > 0) != self.phase:
+            self.phase = (base, self.strikes > 0)
+            when = "" if dt is None else f" (open {'in' if dt < 0 else 'was'} {abs(dt):.0f}s{'' if dt < 0 else ' ago'})"
+            print(f"[{self.tag}] checking every ~{interval:.2f}s{when}"
+                  + (f"; backing off, HTTP {res.get('status')}" if self.strikes else ""))
+        return False, max(0.0, interval)
+
+    def save(self):
+        path = _os.path.join(self.snap.dir, "poll-timeline.json")
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.timeline, f, indent=1)
+            print(f"[{self.tag}] {len(self.timeline)} checks logged to {path}")
+        except Exception as e:
+            print(f"[{self.tag}] could not write {path}: {e}")
+
+def poll_view_adaptive(driver, snap: Snapper, open_epoch: float | None = None, keeper=None) -> bool:
+    """
+    --detect adaptive on one page: ViewPoller checks until 'View' is clicked or
+    MAX_POLL_MINUTES past the open time. With a DriverKeeper (daemon mode) the
+    driver may be swapped between checks.
+    """
+    deadline = max(time.time(), open_epoch or 0) + MAX_POLL_MINUTES * 60
+    poller = ViewPoller(snap, open_epoch)
+    try:
+        while time.time() < deadline:
+            if keeper is not None:
+                driver = keeper.tick()
+            opened, wait = poller.check(driver)
+            if opened:
+                return True
+            time.sleep(wait)
+        return False
+    finally:
+        poller.save()
+
+def handle_view_button_only(driver, snap: Snapper, detect: str = "poll",
+                            open_epoch: float | None = None) -> bool:
+    """
+    Stay on the group page and poll until the orange 'View' button is clickable,
+    then click it. No other entry paths are used.
+    detect="observe" skips the refresh loop: a MutationObserver (plus background
+    fetch) clicks the Parent Duties control in-page the moment it appears.
+    detect="adaptive" polls with cheap fetch checks, densest around open_epoch.
+    """
+    with TRACER.span("group_load", driver):
+        driver.get(GROUP_URL)
+    if detect == "adaptive":
+        snap.shot(driver, "group_loaded")
+        with TRACER.span("view_poll", driver):
+            return poll_view_adaptive(driver, snap, open_epoch)
+    if detect == "observe":
+        snap.shot(driver, "group_loaded")
+        deadline = time.time() + MAX_POLL_MINUTES * 60
+        with TRACER.span("view_poll", driver):
+            if not wait_view_event(driver, deadline):
+                # Same last resort as poll mode: the secure invitation URL directly
+                return direct_invitation(driver, snap)
+        snap.shot(driver, "group_view_clicked")
+        TimedWait(driver, WAIT).until(EC.url_contains(INVITATION_URL_HINT))
+        return True
+    time.sleep(2)
+    snap.shot(driver, "group_loaded")
+
+    # Prefer clicking the Parent Duties link by its stable entry id if present
+    with TRACER.span("parent_duties_link", driver):
+        try:
+            pd_link = TimedWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, PD_LINK_XPATH)))
+            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", pd_link)
+            snap.shot(driver, "group_parent_duties_link_visible")
+            pd_link.click()
+            snap.shot(driver, "group_parent_duties_link_clicked")
+            TimedWait(driver, WAIT).until(EC.url_contains(INVITATION_URL_HINT))
+            return True
+        except Exception:
+            # Try navigating directly to the secure invitation URL as a fallback
+            if direct_invitation(driver, snap):
+                return True
+
+    with TRACER.span("view_poll", driver):
+        deadline = time.time() + MAX_POLL_MINUTES * 60
+        while time.time() < deadline:
+            for xp in VIEW_XPATHS:
+                try:
+                    el = TimedWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, xp)))
+                    driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
+                    snap.shot(driver, "group_view_visible")
+                    el.click()
+                    snap.shot(driver, "group_view_clicked")
+                    TimedWait(driver, WAIT).until(EC.url_contains(INVITATION_URL_HINT))
+                    return True
+                except Exception:
+                    pass
+            print(f"[poll] 'View' not visible/clickable yet… retrying in {POLL_SECS}s")
+            time.sleep(POLL_SECS)
+            driver.refresh()
+    return False
+
+def direct_invitation(driver, snap: Snapper) -> bool:
+    """Fallback entry: open the secure invitation URL directly; True if it loaded."""
+    try:
+        driver.get(INVITATION_URL)
+        snap.shot(driver, "group_parent_duties_direct_nav")
+        TimedWait(driver, WAIT).until(EC.url_contains(INVITATION_URL_HINT))
+        return True
+    except Exception:
+        return False
+
+# ---------- Invitation page utilities ----------
+CONTINUE_AS_XPATH = "//span[@data-i18n='ConfirmEmailContinueAs']"
+# 'modal' when the Continue-as button shows; 'list' when a row is visible and the
+# topmost element at its centre belongs to it (nothing overlays the list); else null
+CONTINUE_AS_STATE_JS = r"""
+const modal = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (modal && modal.getClientRects().length) return 'modal';
+const row = document.querySelector("div[class*='assignment-widget']");
+if (!row) return null;
+row.scrollIntoView({block: 'center'});
+const r = row.getBoundingClientRect();
+if (!r.width || !r.height) return null;
+const top = document.elementFromPoint(r.left + r.width / 2, r.top + r.height / 2);
+return top && row.contains(top) ? 'list' : null;
+"""
+# The list can render before the modal is injected: 'list' must hold this long
+CONTINUE_AS_GRACE = 0.6
+
+@traced("continue_as")
+def handle_continue_as_if_present(driver, snap: Snapper) -> bool:
+    """Click through 'Continue as…' if it shows; False when the list stays clickable without it."""
+    try:
+        # Poll for the modal or an uncovered list; no fixed 3 s when there is no modal
+        clear_since = None
+        deadline = time.monotonic() + 3
+        while True:
+            state = driver.execute_script(CONTINUE_AS_STATE_JS, CONTINUE_AS_XPATH)
+            now = time.monotonic()
+            if state == "modal":
+                break
+            clear_since = (clear_since or now) if state == "list" else None
+            if clear_since is not None and now - clear_since >= CONTINUE_AS_GRACE or now >= deadline:
+                return False
+            time.sleep(0.1)
+        snap.shot(driver, "continue_as_modal_seen")
+        btn = "//button[.//span[@data-i18n='ConfirmEmailContinueAs']]"
+        wait_click(driver, btn, timeout=WAIT)
+        snap.shot(driver, "continue_as_clicked")
+        TimedWait(driver, WAIT).until_not(EC.presence_of_element_located((By.XPATH, btn)))
+        return True
+    except Exception:
+        return False
+
+SHOW_MORE_XPATH = ("//*[self::button or self::a][@data-i18n='_OverflowMoreJobs_' or contains(@class,'vsl-orangebtn')"
+                   " or contains(normalize-space(.), 'Show more spots')]")
+DAY_COLLAPSED_XPATHS = [
+    "//div[contains(@class,'dayRow') and contains(@class,'collapsed')]",
+    "//button[contains(@class,'day') and contains(@class,'expand')]",
+]
+
+# Shared by the row scripts: a row's action control and its state (mirrors the
+# per-row XPaths in collect_event_actions_webdriver and is_signup_button). listedRow
+# is what the expand count and the row snapshot both count, so the two agree.
+ROW_STATE_JS = r"""
+const norm = s => (s || '').replace(/\s+/g, ' ').trim();
+const rowButton = row => {
+  for (const el of row.querySelectorAll('button, a')) {
+    const t = norm(el.textContent);
+    if (t === 'SIGN UP' || t.includes('Sign Up') || t === 'Full' || t === 'FULL') return el;
+  }
+  return null;
+};
+const buttonState = btn => {
+  const txt = (btn.innerText || btn.textContent || '').toLowerCase();
+  const cls = (btn.getAttribute('class') || '').toLowerCase();
+  if (txt.includes('sign up') && !btn.disabled && !cls.includes('disabled')) return 'signup';
+  if (/^full$/i.test(norm(btn.textContent))) return 'full';
+  return 'disabled';
+};
+const listedRow = row => {
+  if (!rowButton(row) || !row.getClientRects().length) return false;
+  const st = getComputedStyle(row);
+  return st.visibility !== 'hidden' && st.opacity !== '0';
+};
+"""
+
+# Async script: expand collapsed days, then click "Show more spots" until the listed
+# row count stops growing (settleMs without change) or the button is gone.
+EXPAND_LIST_JS = ROW_STATE_JS + r"""
+const moreXp = arguments[0], dayXps = arguments[1], settleMs = arguments[2], maxMs = arguments[3];
+const done = arguments[arguments.length - 1];
+const first = xp => document.evaluate(xp, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const shown = el => el && el.getClientRects().length && !el.disabled;
+const count = () => Array.from(document.querySelectorAll("div[class*='assignment-widget']"))
+                         .filter(listedRow).length;
+const t0 = performance.now();
+let clicks = 0, days = 0;
+for (const xp of dayXps) { const d = first(xp); if (shown(d)) { d.click(); days++; } }
+const finish = stalled => done({rows: count(), clicks: clicks, days: days, stalled: stalled,
+                                ms: performance.now() - t0});
+function step() {
+  const btn = first(moreXp);
+  if (!shown(btn)) return finish(false);
+  if (performance.now() - t0 > maxMs) return finish(true);
+  const before = count(), since = performance.now();
+  btn.click(); clicks++;
+  (function settle() {
+    if (count() > before || !shown(first(moreXp))) return step();
+    if (performance.now() - since > settleMs) return finish(true);
+    setTimeout(settle, 25);
+  })();
+}
+step();
+"""
+
+@traced("day_expand")
+def ensure_day_expanded(driver, snap: Snapper) -> int | None:
+    """
+    Expand the whole list in-page with one async script and return the final
+    visible row count (None if it could not be expanded).
+    """
+    snap.shot(driver, "invitation_list_initial")
+    try:
+        with script_timeout(driver, WAIT + 5):
+            res = driver.execute_async_script(EXPAND_LIST_JS, SHOW_MORE_XPATH, DAY_COLLAPSED_XPATHS,
+                                              SHORT * 1000, WAIT * 1000) or {}
+    except Exception as e:
+        print(f"[expand] in-page expansion failed ({e.__class__.__name__}); using click loop")
+        return _ensure_day_expanded_webdriver(driver, snap)
+    print(f"[expand] {res.get('rows')} rows after {res.get('clicks')} 'Show more spots' clicks"
+          f" in {res.get('ms', 0):.0f} ms" + (" (stopped growing)" if res.get("stalled") else ""))
+    if res.get("clicks") or res.get("days"):
+        snap.shot(driver, "invitation_list_expanded")
+    return res.get("rows")
+
+def _ensure_day_expanded_webdriver(driver, snap: Snapper) -> int | None:
+    """Fallback: click "Show more spots" through WebDriver until it no longer appears."""
+    try:
+        while True:
+            try:
+                btn = TimedWait(driver, SHORT).until(EC.element_to_be_clickable((By.XPATH, SHOW_MORE_XPATH)))
+                driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
+                snap.shot(driver, "show_more_spots_visible")
+                btn.click()
+                time.sleep(0.6)
+            except Exception:
+                break
+        if click_any(driver, DAY_COLLAPSED_XPATHS, timeout=3):
+            time.sleep(0.5)
+            snap.shot(driver, "day_expanded")
+    except Exception:
+        pass
+    return None
+
+@traced("filter_unchecks")
+def uncheck_hide_full_spots_if_checked(driver, snap: Snapper):
+    try:
+        lbl = driver.find_element(By.XPATH, "//label[contains(.,'Hide Full Spots')]")
+        cb = lbl.find_element(By.XPATH, ".//input[@type='checkbox']")
+        if cb.is_selected():
+            (lbl or cb).click()
+            time.sleep(0.3)
+            snap.shot(driver, "hide_full_spots_unchecked")
+    except Exception:
+        pass
+
+@traced("filter_unchecks")
+def uncheck_show_my_spots_only_if_checked(driver, snap: Snapper):
+    try:
+        lbl = driver.find_element(By.XPATH, "//label[contains(.,'Show My Spots Only')]")
+        cb = lbl.find_element(By.XPATH, ".//input[@type='checkbox']")
+        if cb.is_selected():
+            (lbl or cb).click()
+            time.sleep(0.3)
+            snap.shot(driver, "show_my_spots_unchecked")
+    except Exception:
+        pass
+
+# Titles of rows whose text names the person (the list shows who took each spot)
+NAMED_ROWS_JS = r"""
+const name = arguments[0].toLowerCase();
+return Array.from(document.querySelectorAll("div[class*='assignment-widget']"))
+  .filter(r => (r.innerText || '').toLowerCase().includes(name))
+  .map(r => ((r.querySelector("a[class*='title'], a[class*='SpotTitle']") || r).innerText || '').trim());
+"""
+
+def my_spots(driver, snap: Snapper, name: str) -> List[str]:
+    """
+    Titles of spots this person already holds: the rows left with 'Show My Spots
+    Only' ticked (identified session) plus rows that list the name. Leaves the
+    filter unticked. Used before a retry that could otherwise sign up twice.
+    """
+    titles = []
+    try:
+        lbl = driver.find_element(By.XPATH, "//label[contains(.,'Show My Spots Only')]")
+        cb = lbl.find_element(By.XPATH, ".//input[@type='checkbox']")
+        if not cb.is_selected():
+            lbl.click()
+            time.sleep(0.3)
+            titles += [a["title"] for a in collect_event_actions(driver)]
+            snap.shot(driver, "my_spots_only")
+            lbl.click()
+            time.sleep(0.3)
+    except Exception:
+        pass
+    try:
+        titles += driver.execute_script(NAMED_ROWS_JS, name) or []
+    except Exception:
+        pass
+    return list(dict.fromkeys(t.strip() for t in titles if t and t.strip()))
+
+# One round trip: snapshot every visible assignment row.
+ROW_SNAPSHOT_JS = ROW_STATE_JS + r"""
+const out = [];
+let idx = 0;
+window.__stglacHandle = window.__stglacHandle || 0;
+for (const row of document.querySelectorAll("div[class*='assignment-widget']")) {
+  if (!listedRow(row)) continue;
+  const btn = rowButton(row);
+  idx += 1;
+  if (!row.dataset.stglacHandle) row.dataset.stglacHandle = 'r' + (++window.__stglacHandle);
+  const titleEl = row.querySelector("a[class*='title'], a[class*='SpotTitle']");
+  out.push({index: idx, row: row, btn: btn, state: buttonState(btn),
+            handle: row.dataset.stglacHandle,
+            title: ((titleEl || row).innerText || '').trim()});
+}
+return out;
+"""
+
+@traced("row_collection")
+def collect_event_actions(driver, expected: int | None = None):
+    """
+    Return a DOM-ordered list of visible assignment rows from a single in-page snapshot.
+    Each item: {"index": i, "row": WebElement, "btn": WebElement, "title": str,
+                "state": "signup" | "full" | "disabled", "handle": str}
+    The handle is stamped on the row as data-stglac-handle and survives re-snapshots.
+    expected: row count from ensure_day_expanded; re-snapshot (up to SHORT s) while
+    fewer rows than that have rendered.
+    """
+    deadline = time.time() + SHORT
+    while True:
+        try:
+            actions = driver.execute_script(ROW_SNAPSHOT_JS) or []
+        except Exception as e:
+            print(f"[rows] snapshot script failed ({e}); falling back to per-row scan")
+            return collect_event_actions_webdriver(driver)
+        if not expected or len(actions) >= expected or time.time() >= deadline:
+            return actions
+        time.sleep(0.1)
+
+def collect_event_actions_webdriver(driver):
+    """
+    Per-row WebDriver scan (several round trips per row). Kept as the fallback
+    and as the baseline for bench/bench_rows.py.
+    Each item: {"index": i, "row": WebElement, "btn": WebElement, "title": str}
+    """
+    rows = driver.find_elements(By.XPATH, "//div[contains(@class,'assignment-widget')]")
+    actions = []
+    idx = 0
+    for row in rows:
+        # Find the action control (Sign Up / Full) within the row
+        try:
+            btn = row.find_element(
+                By.XPATH,
+                ".//*[self::button or self::a]"
+                "[normalize-space()='SIGN UP' or contains(.,'Sign Up') or "
+                " normalize-space()='Full' or normalize-space()='FULL']"
+            )
+        except Exception:
+            continue
+        try:
+            if not row.is_displayed():
+                continue
+        except Exception:
+            pass
+        idx += 1
+        try:
+            title_el = row.find_element(By.XPATH, ".//a[contains(@class,'title') or contains(@class,'SpotTitle')]")
+            title = title_el.text
+        except Exception:
+            title = row.text
+        actions.append({"index": idx, "row": row, "btn": btn, "title": title})
+    return actions
+
+def is_signup_button(btn) -> bool:
+    try:
+        txt = (btn.text or "").lower()
+        cls = (btn.get_attribute("class") or "").lower()
+        return ("sign up" in txt) and btn.is_enabled() and ("disabled" not in cls)
+    except Exception:
+        return False
+
+def is_signup_action(item) -> bool:
+    # Snapshot rows carry their state; fallback rows still need the WebDriver check
+    if "state" in item:
+        return item["state"] == "signup"
+    return is_signup_button(item["btn"])
+
+def preference_rows(actions, prefs: List[int], keys: Dict[int, str] | None = None) -> Dict[int, Dict | None]:
+    """
+    Live row for each preference (None if it is not on the page). Without keys a
+    preference is a row position; with keys (EventIndex.keys_for) it is matched by
+    normalized title, so rows that moved since the index was scraped still resolve.
+    """
+    if keys is None:
+        return {n: actions[n - 1] if 1 <= n <= len(actions) else None for n in prefs}
+    live = dict(zip(title_keys(a["title"] for a in actions), actions))
+    return {n: live.get(keys.get(n)) for n in prefs}
+
+@traced("preference_scan")
+def resolve_preferences(actions, prefs: List[int], claim=None, keys: Dict[int, str] | None = None):
+    """
+    Walk preferences in order against a row snapshot (pure Python, no WebDriver calls).
+    claim(n) -> bool, if given, must accept an available row before it is chosen
+    (batch mode uses it so two families never race for the same spot).
+    keys, if given, matches preferences by indexed title instead of position.
+    Returns (n, item) for the first available preference, else (None, None).
+    """
+    rows = preference_rows(actions, prefs, keys)
+    for n in prefs:
+        item = rows[n]
+        if item is None:
+            if keys is None:
+                print(f"[skip] Preference #{n} is out of range (we see {len(actions)} rows).")
+            else:
+                print(f"[skip] Preference #{n} (“{keys.get(n, '?')[:60]}”) is not on the page.")
+            continue
+        title = (item["title"] or "").strip()
+        if is_signup_action(item):
+            if claim is not None and not claim(n):
+                print(f"[claimed] Preference #{n} is being taken by another family in this batch. Trying next…")
+                continue
+            print(f"[select] Preference #{n} is AVAILABLE — “{title[:80]}”. Clicking Sign Up…")
+            return n, item
+        print(f"[full] Preference #{n} is currently FULL — “{title[:80]}”. Trying next…")
+    return None, None
+
+# ---------- Identify / Confirm / Participant form ----------
+IDENTIFY_EMAIL_XPATHS = ["//input[@type='email']", "//input[contains(@placeholder,'@')]", "//input[contains(@class,'email')]"]
+CONFIRM_XPATHS = ["//button[contains(.,'Confirm')]", "//a[contains(.,'Confirm')]"]
+
+def identify_and_confirm(driver, snap: Snapper, email: str, warm: bool = False) -> Dict[str, float | None]:
+    """
+    Identify → Confirm after the Sign Up click. With warm=True (a persistent Chrome
+    profile) an already-identified session may open at Confirm or straight at the
+    participant form; whichever step shows up first decides, so skipped steps cost
+    no waits. Without one the steps run in order.
+    Returns {"identify": secs, "confirm": secs} with None for a skipped step.
+    """
+    with TRACER.span("identify", driver):
+        identify, skipped = _identify(driver, snap, email, warm)
+    times = {"identify": identify, "confirm": None}
+    if "confirm" in skipped:
+        return times
+    t1 = time.monotonic()
+    with TRACER.span("confirm", driver):
+        # Confirm modal
+        snap.shot(driver, "confirm_modal_open")
+        if not click_any(driver, CONFIRM_XPATHS):
+            snap.shot(driver, "confirm_button_missing")
+            raise RuntimeError("Confirm button not found.")
+        snap.shot(driver, "confirm_clicked")
+    times["confirm"] = time.monotonic() - t1
+    return times
+
+def _identify(driver, snap: Snapper, email: str, warm: bool = False):
+    """
+    The Identify step; returns (seconds, or None if skipped, and the skipped step names).
+    Only a warm (persistent-profile) session races for a later step; otherwise the
+    Identify email input is waited for as before, and nothing is skipped.
+    """
+    t0 = time.monotonic()
+    snap.shot(driver, "identify_modal_open")
+    form_x = PARTICIPANT_FORM_XPATH
+    # Most-advanced step first, so a form behind a closing modal still wins. A
+    # clickable Confirm control also beats the Identify email input, which is why a
+    # cold session (nothing to skip) does not race.
+    later = [form_x] + CONFIRM_XPATHS if warm else []
+    try:
+        # Clickable, not just present: a hidden Confirm button or stray label must not win
+        i, el = race_any(driver, later + IDENTIFY_EMAIL_XPATHS, clickable=True)
+    except Exception:
+        snap.shot(driver, "identify_email_not_found")
+        raise RuntimeError("Email input not found on Identify modal.")
+    skipped = []
+    if i < len(later):
+        skipped = ["identify", "confirm"] if i == 0 else ["identify"]
+    else:
+        _report_winner(IDENTIFY_EMAIL_XPATHS, i - len(later))
+        el.clear(); el.send_keys(email)
+        snap.shot(driver, "identify_email_filled")
+        if not click_any(driver, ["//button[contains(.,'Continue')]", "//a[contains(.,'Continue')]"]):
+            snap.shot(driver, "identify_continue_missing")
+            raise RuntimeError("Continue button not found on Identify modal.")
+        # Some identified sessions go from Identify straight to the form
+        if warm:
+            try:
+                j, _ = race_any(driver, later, clickable=True)
+                if j == 0:
+                    skipped = ["confirm"]
+            except Exception:
+                pass
+    if skipped:
+        print(f"[session] already identified: skipped {', '.join(skipped)}")
+    return (None if "identify" in skipped else time.monotonic() - t0), skipped
+
+# Participant form fields in fill order; later labels are fallbacks for the first
+FORM_FIELDS = (("Name",), ("Email",), ("Phone",), ("ONE Bib", "Bib"))
+
+def field_xpath(label_contains: str) -> str:
+    return f"//label[contains(.,'{label_contains}')]/following::*[self::input or self::textarea][1]"
+
+# The participant form's Name input, only where the Email and Bib labels follow it
+# (_identify must not take an unrelated "Name" field for the form)
+PARTICIPANT_FORM_XPATH = ("//label[contains(.,'Name')][following::label[contains(.,'Email')]]"
+                          "[following::label[contains(.,'Bib')]]/following::*[self::input or self::textarea][1]")
+
+# Set every field through the native value setter (so framework-bound inputs see it),
+# fire input/change/blur, and read the values back — all in one round trip.
+FILL_FORM_JS = r"""
+const out = [];
+for (const [xps, value] of arguments[0]) {
+  let el = null, which = -1;
+  for (let i = 0; i < xps.length && !el; i++) {
+    el = document.evaluate(xps[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    which = i;
+  }
+  if (!el) { out.push({found: false, ok: false}); continue; }
+  const proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+  el.focus();
+  Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+  el.dispatchEvent(new Event('input', {bubbles: true}));
+  el.dispatchEvent(new Event('change', {bubbles: true}));
+  el.blur();
+  out.push({found: true, label: which, ok: el.value === value});
+}
+return out;
+"""
+
+def fill_participant_form(driver, snap: Snapper, name: str, email: str, phone: str, bib: str,
+                          confirm_before_save: bool, selection_text: str) -> bool:
+    snap.shot(driver, "participant_form_open")
+    t0 = time.monotonic()
+    with TRACER.span("form_fill", driver):
+        _fill_form(driver, (name, email, phone, bib))
+    print(f"[form] filled in {(time.monotonic() - t0) * 1000:.0f} ms")
+    snap.shot(driver, "participant_form_filled")
+
+    if confirm_before_save:
+        print("\n=== TEST MODE: Review selection before saving ===")
+        print(selection_text)
+        resp = input("Proceed to 'Save and Done'? [y/N]: ").strip().lower()
+        if resp not in ("y", "yes"):
+            print("Aborted before save. (Nothing submitted.)")
+            snap.shot(driver, "aborted_before_save")
+            return False
+
+    with TRACER.span("save", driver):
+        if not click_any(driver, ["//button[contains(.,'Save and Done')]", "//a[contains(.,'Save and Done')]"]):
+            snap.shot(driver, "save_and_done_missing")
+            raise RuntimeError("Save and Done not found.")
+    if not confirm_before_save:
+        print(f"[timing] form open → Save and Done: {time.monotonic() - t0:.3f}s")
+    snap.shot(driver, "save_and_done_clicked")
+    snap.release()
+    return True
+
+def _fill_form(driver, values):
+    """Scripted fill of FORM_FIELDS, typing only the fields that rejected it."""
+    def set_field(label_contains: str, val: str):
+        el = wait_exist(driver, field_xpath(label_contains)); el.clear(); el.send_keys(val)
+
+    try:
+        wait_exist(driver, field_xpath(FORM_FIELDS[0][0]))  # form rendered
+        res = driver.execute_script(FILL_FORM_JS, [[[field_xpath(l) for l in labels], v]
+                                                   for labels, v in zip(FORM_FIELDS, values)])
+    except Exception as e:
+        print(f"[form] scripted fill failed ({e.__class__.__name__}); typing every field")
+        res = [{"ok": False}] * len(FORM_FIELDS)
+    # Per-keystroke typing only for fields that were missing or rejected the scripted value
+    for labels, val, r in zip(FORM_FIELDS, values, res):
+        if r.get("ok"):
+            continue
+        print(f"[form] '{labels[0]}' did not take the scripted value; typing it")
+        if r.get("found"):
+            labels = (labels[r["label"]],)  # the script already knows which label matched
+        for i, label in enumerate(labels):
+            try:
+                set_field(label, val)
+                break
+            except Exception:
+                if i == len(labels) - 1:
+                    raise
+
+# ---------- Flow pieces shared by interactive and batch runs ----------
+def week_map(week: str) -> Dict[int, str]:
+    return WEEK_A_EVENT_MAP if week == "A" else WEEK_B_EVENT_MAP
+
+def parse_prefs(raw: str, max_n: int) -> List[int]:
+    out, seen = [], set()
+    for p in raw.split(","):
+        p = p.strip()
+        if p.isdigit():
+            n = int(p)
+            if 1 <= n <= max_n and n not in seen:
+                out.append(n); seen.add(n)
+    return out[:3]
+
+def title_key(title: str) -> str:
+    """Normalized title for matching: case, punctuation and dash/spacing variants ignored."""
+    return " ".join(re.findall(r"[a-z0-9]+", (title or "").lower()))
+
+def title_keys(titles) -> List[str]:
+    """title_key for each title, with ~2, ~3… on repeats so every row keeps its own key."""
+    seen, out = {}, []
+    for t in titles:
+        k = title_key(t)
+        seen[k] = seen.get(k, 0) + 1
+        out.append(k if seen[k] == 1 else f"{k}~{seen[k]}")
+    return out
+
+class EventIndex:
+    """
+    One group's spot list for one week, as scraped from the live page and kept as
+    versioned JSON in EVENT_INDEX_DIR. Preference numbers are positions in the index;
+    each maps to a precomputed title key, so finding the live row on release night is
+    a dict lookup however the page order has drifted. An empty index (never scraped)
+    is falsy and callers fall back to the hand-kept week maps.
+    """
+    def __init__(self, week: str, group: str | None = None, base_dir: str | None = None):
+        self.group = group or GROUP_ID
+        self.week = week
+        self.path = _os.path.join(base_dir or EVENT_INDEX_DIR, f"{self.group}_week{week}.json")
+        self.version, self.rows, self.history = 0, [], []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.version, self.rows, self.history = data["version"], data["rows"], data.get("history", [])
+            if not all(isinstance(r, dict) and "key" in r and "title" in r for r in self.rows):
+                raise ValueError("malformed rows")
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            # Damaged or unreadable: treat as never scraped (week maps), a re-scrape rewrites it
+            print(f"[index] ignoring {self.path} ({e.__class__.__name__}: {e}); using the week map")
+            self.version, self.rows, self.history = 0, [], []
+
+    def __bool__(self) -> bool:
+        return bool(self.rows)
+
+    def event_map(self) -> Dict[int, str]:
+        return {n: r["title"] for n, r in enumerate(self.rows, start=1)}
+
+    def keys_for(self, prefs: List[int]) -> Dict[int, str]:
+        return {n: self.rows[n - 1]["key"] for n in prefs if 1 <= n <= len(self.rows)}
+
+    def update(self, actions) -> Dict[str, List[str]]:
+        """
+        Diff a fresh scrape against the index by title key. Any change (or a first
+        scrape) is saved as the next version with a one-line history entry; an
+        unchanged list leaves the file alone. Returns the added/removed/moved keys.
+        """
+        titles = [(a["title"] or "").strip() for a in actions]
+        keys = title_keys(titles)
+        old = {r["key"]: n for n, r in enumerate(self.rows, start=1)}
+        new = {k: n for n, k in enumerate(keys, start=1)}
+        diff = {"added": [k for k in keys if k not in old],
+                "removed": [k for k in old if k not in new],
+                "moved": [k for k in keys if k in old and old[k] != new[k]]}
+        if self.rows and not any(diff.values()):
+            return diff
+        self.version += 1
+        self.rows = [{"title": t, "key": k} for t, k in zip(titles, keys)]
+        self.history.append({"version": self.version, "scraped_at": datetime.now().isoformat(timespec="seconds"),
+                             "rows": len(keys), **{k: len(v) for k, v in diff.items()}})
+        _os.makedirs(_os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"group": self.group, "week": self.week, "version": self.version,
+                       "rows": self.rows, "history": self.history}, f, indent=1, ensure_ascii=False)
+        _os.replace(tmp, self.path)
+        return diff
+
+def active_event_map(week: str):
+    """(event map for the prompts, index keys or None): the scraped index when there is one."""
+    index = EventIndex(week)
+    if not index:
+        return week_map(week), None
+    print(f"[index] using {_os.path.basename(index.path)} v{index.version} ({len(index.rows)} rows)")
+    return index.event_map(), index
+
+def scrape_index(driver, snap: Snapper, week: str) -> bool:
+    """Open the invitation, snapshot the spot list and merge it into the week's EventIndex."""
+    expected = open_invitation(driver, snap)
+    if expected is None:
+        return False
+    actions = collect_event_actions(driver, expected=expected)
+    if not actions:
+        print("[index] no assignment rows found; index left unchanged.")
+        return False
+    index = EventIndex(week)
+    before = index.version
+    diff = index.update(actions)
+    if index.version == before:
+        print(f"[index] {len(actions)} rows, unchanged since v{before}.")
+    else:
+        print(f"[index] v{before} → v{index.version}: {len(diff['added'])} added, "
+              f"{len(diff['removed'])} removed, {len(diff['moved'])} moved ({index.path})")
+        for tag in ("added", "removed"):
+            for k in diff[tag]:
+                print(f"  {tag}: {k}")
+    return True
+
+def shots_base_dir(subdir: str = "") -> str:
+    return _os.path.join(".", "screenshots", subdir) if subdir else _os.path.join(".", "screenshots")
+
+STEP_HISTORY = 5
+
+class StepTimes:
+    """
+    Per-step wall times for the run log. With a profile dir, the last STEP_HISTORY
+    full (not skipped) times of each step are kept in it, and a run reports what skips
+    and cached page loads saved against their median — one slow outlier does not
+    inflate the figure.
+    """
+    def __init__(self, profile_dir: str | None = None):
+        self.path = _os.path.join(profile_dir, "stglac-steps.json") if profile_dir else None
+        self.rows = []
+        self.cold = {}
+        if self.path:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    # Older files kept a single number per step
+                    self.cold = {k: v if isinstance(v, list) else [v] for k, v in json.load(f).items()}
+            except Exception:
+                self.cold = {}
+
+    def record(self, step: str, secs: float, skipped: bool = False):
+        self.rows.append((step, secs, skipped))
+
+    def summary(self):
+        if not self.rows:
+            return
+        print("\n[steps] step              time   note")
+        for step, secs, skipped in self.rows:
+            note = "skipped" if skipped else ""
+            hist = self.cold.get(step)
+            cold = statistics.median(hist) if hist else None
+            if cold is not None and cold - secs > 0.05:
+                note = (note + f" saved ~{cold - secs:.2f}s vs median full run").strip()
+            print(f"[steps] {step:<16} {secs:>6.2f}s  {note}")
+            if not skipped:
+                self.cold[step] = (self.cold.get(step, []) + [round(secs, 3)])[-STEP_HISTORY:]
+        if self.path:
+            try:
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(self.cold, f, indent=1)
+            except Exception as e:
+                print(f"[steps] could not save {self.path}: {e}")
+
+def page_load_secs(driver) -> float | None:
+    """Navigation Timing duration of the current document (disk cache shows up here)."""
+    try:
+        ms = driver.execute_script(
+            "const n = performance.getEntriesByType('navigation')[0]; return n ? n.duration : null;")
+        return ms / 1000 if ms else None
+    except Exception:
+        return None
+
+# ---------- Record / replay (--record, --replay) ----------
+class Recorder:
+    """
+    --record: one run's DOM snapshots, network responses and step timeline, zipped
+    next to its screenshots. Snapper.shot() checkpoints here, so every audit frame
+    outside the critical path also gets the page's HTML; response bodies are pulled
+    from the driver's performance log (Network.getResponseBody) at each checkpoint.
+    The archive holds the family's name, email and phone as typed and sent.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.t0 = time.monotonic()
+        self.origin = "{0.scheme}://{0.netloc}".format(urlparse(GROUP_URL))
+        self.pages, self.responses, self.timeline = [], [], []
+        self.files: Dict[str, bytes] = {}
+        self._methods, self._pending = {}, {}
+
+    def _drain(self, driver):
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            return
+        for entry in entries:
+            msg = json.loads(entry["message"])["message"]
+            method, p = msg.get("method"), msg.get("params", {})
+            rid = p.get("requestId")
+            if method == "Network.requestWillBeSent":
+                self._methods[rid] = p["request"]["method"]
+                redirect = p.get("redirectResponse")
+                if redirect:
+                    self.responses.append({"method": p["request"]["method"], "url": redirect["url"],
+                                           "status": redirect["status"], "location": p["request"]["url"]})
+            elif method == "Network.responseReceived":
+                self._pending[rid] = p["response"]
+            elif method == "Network.loadingFinished" and rid in self._pending:
+                resp = self._pending.pop(rid)
+                if not resp["url"].startswith("http"):
+                    continue
+                try:
+                    body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": rid})
+                except Exception:
+                    continue  # evicted (e.g. navigated away before this checkpoint)
+                name = f"net/{len(self.responses) + 1:03d}"
+                self.files[name] = (base64.b64decode(body["body"]) if body.get("base64Encoded")
+                                    else body["body"].encode("utf-8"))
+                self.responses.append({"method": self._methods.get(rid, "GET"), "url": resp["url"],
+                                       "status": resp["status"], "mime": resp.get("mimeType", ""), "file": name})
+
+    def mark(self, label: str):
+        """Timeline entry only (no WebDriver calls): used on the critical path."""
+        self.timeline.append({"t": round(time.monotonic() - self.t0, 3), "step": label, "deferred": True})
+
+    def checkpoint(self, driver, label: str):
+        self._drain(driver)
+        t = round(time.monotonic() - self.t0, 3)
+        try:
+            url, page = driver.execute_script("return [location.href, document.documentElement.outerHTML];")
+            name = f"dom/{label}.html"
+            self.files[name] = page.encode("utf-8")
+            self.pages.append({"label": label, "url": url, "file": name, "t": t})
+        except Exception as e:
+            print(f"[record] DOM snapshot failed at {label}: {e.__class__.__name__}")
+        self.timeline.append({"t": t, "step": label})
+
+    def save(self, steps: "StepTimes | None" = None):
+        manifest = {"version": 1, "recorded_at": datetime.now().isoformat(timespec="seconds"),
+                    "origin": self.origin, "group_url": GROUP_URL, "invitation_url": INVITATION_URL,
+                    "pages": self.pages, "responses": self.responses, "timeline": self.timeline,
+                    "steps": [{"step": s, "secs": round(secs, 3), "skipped": sk}
+                              for s, secs, sk in (steps.rows if steps else [])]}
+        import zipfile
+        with zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED) as z:
+            z.writestr("manifest.json", json.dumps(manifest, indent=1))
+            for name, data in self.files.items():
+                z.writestr(name, data)
+        print(f"[record] {len(self.pages)} pages, {len(self.responses)} responses → {self.path}")
+
+def serve_archive(path: str, port: int = 0):
+    """
+    --replay: serve a --record archive on 127.0.0.1 (daemon thread). Requests to the
+    recorded origin get the recorded responses in their original order per URL
+    (the last one repeats), falling back to the DOM snapshots for pages whose
+    document body was not captured. The recorded origin is rewritten to the local
+    one in text bodies. Returns (server, base_url).
+    """
+    import zipfile
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    with zipfile.ZipFile(path) as z:
+        manifest = json.loads(z.read("manifest.json"))
+        files = {n: z.read(n) for n in z.namelist()}
+    origin = manifest["origin"]
+    routes: Dict[tuple, List[Dict]] = {}
+    for r in manifest["responses"]:
+        u = urlparse(r["url"])
+        if "{0.scheme}://{0.netloc}".format(u) != origin:
+            continue
+        # By full URL and by path alone; a URL without a query is one route, not two
+        for key in dict.fromkeys(((r["method"], u.path + ("?" + u.query if u.query else "")), (r["method"], u.path))):
+            routes.setdefault(key, []).append(r)
+    for p in manifest["pages"]:
+        key = ("GET", urlparse(p["url"]).path)
+        if key not in routes:
+            routes.setdefault(("DOM",) + key[1:], []).append({"status": 200, "mime": "text/html", "file": p["file"]})
+    served: Dict[tuple, int] = {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _replay(self):
+            u = urlparse(self.path)
+            full = u.path + ("?" + u.query if u.query else "")
+            key = next((k for k in ((self.command, full), (self.command, u.path), ("DOM", u.path))
+                        if k in routes), None)
+            if key is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            with lock:
+                i = served.get(key, 0)
+                served[key] = i + 1
+            r = routes[key][min(i, len(routes[key]) - 1)]
+            if r.get("location"):
+                self.send_response(r["status"])
+                self.send_header("Location", r["location"].replace(origin, base))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            data = files.get(r["file"], b"")
+            mime = r.get("mime") or "application/octet-stream"
+            if mime.startswith("text/") or "json" in mime or "javascript" in mime:
+                data = data.replace(origin.encode(), base.encode())
+                mime += "; charset=utf-8"
+            self.send_response(r["status"])
+            self.send_header("Content-Type", mime)
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PUT = _replay
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[replay] {path} (recorded {manifest['recorded_at']}, {len(manifest['responses'])} responses) at {base}")
+    return server, base
+
+def open_invitation(driver, snap: Snapper, detect: str = "poll", steps: StepTimes | None = None,
+                    open_epoch: float | None = None) -> int | None:
+    """
+    Group page → 'View' → invitation page with dialogs and list filters handled.
+    Returns None if 'View' never showed up, else the expanded row count (0 if unknown)
+    for collect_event_actions(expected=…).
+    """
+    if not handle_view_button_only(driver, snap, detect=detect, open_epoch=open_epoch):
+        print("[error] Timed out waiting for the orange 'View' button.")
+        return None
+    return enter_invitation(driver, snap, steps)
+
+def enter_invitation(driver, snap: Snapper, steps: StepTimes | None = None) -> int:
+    """The invitation page once 'View' was clicked: 'Continue as…', then prepare_list."""
+    t0 = time.monotonic()
+    shown = handle_continue_as_if_present(driver, snap)
+    if steps is not None:
+        load = page_load_secs(driver)
+        if load is not None:
+            steps.record("invitation_load", load)
+        steps.record("continue_as", time.monotonic() - t0, skipped=not shown)
+    if INVITATION_URL_HINT not in driver.current_url:
+        print(f"[warn] Invitation URL not detected (ok if embedded): {driver.current_url}")
+    return prepare_list(driver, snap)
+
+def prepare_list(driver, snap: Snapper) -> int:
+    """Expand the list and clear filters; returns the expanded row count (0 if unknown)."""
+    rows = ensure_day_expanded(driver, snap)
+    uncheck_hide_full_spots_if_checked(driver, snap)
+    uncheck_show_my_spots_only_if_checked(driver, snap)
+    return rows or 0
+
+@traced("signup_click")
+def click_signup(driver, snap: Snapper, item, label: str, release_mono: float | None = None):
+    # Critical path starts here; snap.release() once Save and Done is clicked (or the run stops)
+    snap.hold()
+    driver.execute_script("arguments[0].scrollIntoView({block:'center'});", item["row"])
+    snap.shot(driver, f"{label}_before_click")
+    item["btn"].click()
+    if release_mono is not None:
+        print(f"[timing] release → Sign Up click: {time.monotonic() - release_mono:.3f}s")
+    snap.shot(driver, f"{label}_clicked")
+
+def set_site(base: str):
+    """Point every site URL at another origin (local stand-in server or replay)."""
+    global SITE_BASE, INVITATION_URL_HINT
+    SITE_BASE = base.rstrip("/")
+    INVITATION_URL_HINT = "/client/invitation2"
+    set_target(GROUP_ID, PARENT_DUTIES_ENTRY_ID)
+
+def set_target(group_id: str, entry_id: str):
+    """
+    Point the group/entry globals (URLs, Parent Duties XPaths) at one group and entry
+    on SITE_BASE. --targets switches them with the tab; everything reads them per call.
+    """
+    global GROUP_ID, PARENT_DUTIES_ENTRY_ID, GROUP_URL, INVITATION_URL, PD_LINK_XPATH, PD_VIEW_XPATHS
+    GROUP_ID, PARENT_DUTIES_ENTRY_ID = group_id, entry_id
+    GROUP_URL = f"{SITE_BASE}/group/{group_id}"
+    INVITATION_URL = f"{SITE_BASE}/client/invitation2/secure/{entry_id}/false"
+    PD_LINK_XPATH = pd_link_xpath(entry_id)
+    PD_VIEW_XPATHS = pd_view_xpaths(entry_id)
+
+# ---------- Browserless HTTP fast path (--engine http) ----------
+class FastPathUnavailable(RuntimeError):
+    """
+    Endpoint discovery or a fast-path request failed; use the Selenium flow instead.
+    posted=True: a sign-up POST went out but was not confirmed, so the browser must
+    check the list (my_spots) before signing up again.
+    """
+    def __init__(self, msg: str, posted: bool = False):
+        super().__init__(msg)
+        self.posted = posted
+
+# Keyword → role for endpoint discovery; first match wins, checked in this order
+ENDPOINT_ROLES = (
+    ("spots", ("spots", "assignments", "jobs", "slots")),
+    ("identify", ("identify", "lookup", "email")),
+    ("signup", ("signup", "sign-up", "claim", "volunteer", "participant")),
+)
+ENDPOINT_RX = re.compile(r"""["'](/[^"'\s<>]*(?:api|json|ajax)[^"'\s<>]*)["']""", re.I)
+
+def discover_endpoints(page_html: str, page_url: str) -> Dict[str, str]:
+    """
+    Find the spot-list, identify and sign-up endpoints referenced by an invitation page:
+    API-looking paths in inline scripts/attributes plus POST form actions.
+    Returns {role: absolute_url} for whatever roles were found.
+    """
+    import html.parser  # only the HTTP fast path parses pages
+
+    class _FormParser(html.parser.HTMLParser):
+        """Collect <form action=… method=…> with their named inputs."""
+        def __init__(self):
+            super().__init__()
+            self.forms, self._cur = [], None
+        def handle_starttag(self, tag, attrs):
+            a = dict(attrs)
+            if tag == "form":
+                self._cur = {"action": a.get("action") or "", "method": (a.get("method") or "get").lower(), "fields": {}}
+                self.forms.append(self._cur)
+            elif tag in ("input", "textarea", "select") and self._cur is not None and a.get("name"):
+                self._cur["fields"][a["name"]] = a.get("value") or ""
+        def handle_endtag(self, tag):
+            if tag == "form":
+                self._cur = None
+
+    found: Dict[str, str] = {}
+    candidates = ENDPOINT_RX.findall(page_html)
+    p = _FormParser()
+    p.feed(page_html)
+    candidates += [f["action"] for f in p.forms if f["method"] == "post" and f["action"]]
+    for path in candidates:
+        low = path.lower()
+        for role, words in ENDPOINT_ROLES:
+            if role not in found and any(w in low for w in words):
+                found[role] = urljoin(page_url, path)
+                break
+    return found
+
+def _spot_list(payload) -> List[Dict]:
+    if isinstance(payload, dict):
+        for k in ("spots", "assignments", "jobs", "items", "data"):
+            if isinstance(payload.get(k), list):
+                return payload[k]
+        return []
+    return payload if isinstance(payload, list) else []
+
+def _spot_available(spot: Dict) -> bool:
+    if "available" in spot:
+        return bool(spot["available"])
+    for k in ("remaining", "openSlots", "open"):
+        if k in spot:
+            try:
+                return int(spot[k]) > 0
+            except (TypeError, ValueError):
+                return bool(spot[k])
+    return str(spot.get("status", "")).lower() in ("open", "available", "signup", "sign up")
+
+class HttpEngine:
+    """
+    Same flow as the browser path (invitation → spot list → identify → sign up) as
+    direct HTTP requests on one pooled keep-alive session. Any surprise raises
+    FastPathUnavailable so the caller can fall back to Selenium.
+    """
+    def __init__(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.s = requests.Session()
+        self.s.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=8))
+        self.s.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=8))
+        self.s.headers["User-Agent"] = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                                        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+        self.endpoints: Dict[str, str] = {}
+
+    def _req(self, method: str, url: str, posted: bool = False, **kw):
+        # Redirects are not followed: a 3xx here is usually a login page, not an answer
+        try:
+            r = self.s.request(method, url, timeout=HTTP_TIMEOUT, allow_redirects=False, **kw)
+        except Exception as e:
+            raise FastPathUnavailable(f"{method} {url}: {e}", posted=posted)
+        if not 200 <= r.status_code < 300:
+            raise FastPathUnavailable(f"{method} {url}: HTTP {r.status_code}", posted=posted)
+        return r
+
+    def discover(self) -> Dict[str, str]:
+        """Warm the pool and find endpoints on the invitation page (group page as a fallback)."""
+        for url in (INVITATION_URL, GROUP_URL):
+            r = self._req("GET", url)
+            self.endpoints.update({k: v for k, v in discover_endpoints(r.text, r.url).items()
+                                   if k not in self.endpoints})
+            if "spots" in self.endpoints and "signup" in self.endpoints:
+                return self.endpoints
+        raise FastPathUnavailable(f"endpoints not found (have: {sorted(self.endpoints) or 'none'})")
+
+    def _raw_spots(self, posted: bool = False) -> List[Dict]:
+        try:
+            spots = _spot_list(self._req("GET", self.endpoints["spots"], posted=posted).json())
+        except ValueError:
+            raise FastPathUnavailable("spot list is not JSON", posted=posted)
+        if not all(isinstance(sp, dict) for sp in spots):
+            raise FastPathUnavailable("spot list items are not objects", posted=posted)
+        return spots
+
+    def spots(self) -> List[Dict]:
+        """Spot list as collect_event_actions-style items (index/title/state/id)."""
+        out = []
+        for i, sp in enumerate(self._raw_spots(), start=1):
+            sid = sp.get("id") or sp.get("spotId") or sp.get("jobId")
+            if sid is None:
+                raise FastPathUnavailable("spot without an id")
+            out.append({"index": i, "id": sid, "title": str(sp.get("title") or sp.get("name") or ""),
+                        "state": "signup" if _spot_available(sp) else "full"})
+        if not out:
+            raise FastPathUnavailable("empty spot list")
+        return out
+
+    def signup(self, spot_id, name: str, email: str, phone: str, bib: str) -> Dict:
+        """
+        POST the sign-up and require the server to confirm it: the spot id echoed back
+        in a JSON answer, or the email/name listed on that spot in a fresh spot list.
+        Anything less raises FastPathUnavailable(posted=True) for the browser to check.
+        """
+        if "identify" in self.endpoints:
+            self._req("POST", self.endpoints["identify"], json={"email": email})
+        r = self._req("POST", self.endpoints["signup"], posted=True,
+                      json={"spotId": spot_id, "name": name, "email": email, "phone": phone, "bib": bib})
+        try:
+            body = r.json()
+        except ValueError:
+            body = None
+        if isinstance(body, dict) and (body.get("ok") is False or body.get("success") is False):
+            raise FastPathUnavailable(f"sign-up rejected: {body.get('error') or body}")
+        if isinstance(body, dict) and signup_confirmed(body, spot_id):
+            return body
+        spot = next((sp for sp in self._raw_spots(posted=True)
+                     if str(sp.get("id") or sp.get("spotId") or sp.get("jobId")) == str(spot_id)), None)
+        listed = json.dumps(spot).lower() if spot is not None else ""
+        if email.lower() in listed or (name and name.lower() in listed):
+            return body if isinstance(body, dict) else {}
+        raise FastPathUnavailable("sign-up not confirmed by the server", posted=True)
+
+def signup_confirmed(body: Dict, spot_id) -> bool:
+    """True if a sign-up answer echoes the spot id (top level or one level down)."""
+    keys = ("spotId", "spot_id", "assignmentId", "assignment_id", "jobId", "id")
+    for d in [body] + [v for v in body.values() if isinstance(v, dict)]:
+        if any(str(d.get(k)) == str(spot_id) for k in keys if d.get(k) is not None):
+            return True
+    return False
+
+def http_signup(prefs: List[int], name: str, email: str, phone: str, bib: str,
+                dry_run: bool = False, confirm=None, release_mono: float | None = None,
+                keys: Dict[int, str] | None = None):
+    """
+    Browserless sign-up. Returns {"status", "chosen", "title"} where status is
+    signed_up (confirmed by the server, see HttpEngine.signup), none_available,
+    aborted or dry_run. none_available is only the HTTP view: the caller still
+    checks in Chrome. Raises FastPathUnavailable otherwise.
+    confirm(n, title) -> bool, if given, is asked before the sign-up POST (Test mode).
+    keys match preferences to spots by title (spot order is not assumed to be page order).
+    """
+    eng = HttpEngine()
+    t0 = time.perf_counter()
+    eng.discover()
+    print(f"[http] endpoints {sorted(eng.endpoints)} in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    t1 = time.perf_counter()
+    try:
+        spots = eng.spots()
+        print(f"[http] {len(spots)} spots")
+        n, item = resolve_preferences(spots, prefs, keys=keys)
+    except (AttributeError, TypeError, KeyError) as e:
+        raise FastPathUnavailable(f"unexpected spot list ({e.__class__.__name__}: {e})")
+    if item is None:
+        return {"status": "none_available", "chosen": None, "title": ""}
+    res = {"status": "signed_up", "chosen": n, "title": item["title"].strip()}
+    if dry_run:
+        print(f"[dry-run] would sign up for #{n} “{res['title'][:80]}” via HTTP.")
+        return {**res, "status": "dry_run"}
+    if confirm is not None and not confirm(n, res["title"]):
+        print("Aborted before save. (Nothing submitted.)")
+        return {**res, "status": "aborted"}
+    try:
+        eng.signup(item["id"], name, email, phone, bib)
+    except (AttributeError, TypeError, KeyError) as e:
+        raise FastPathUnavailable(f"unexpected sign-up answer ({e.__class__.__name__}: {e})", posted=True)
+    print(f"[timing] http claim: {(time.perf_counter() - t1) * 1000:.0f} ms")
+    if release_mono is not None:
+        print(f"[timing] release → sign-up POST: {time.monotonic() - release_mono:.3f}s")
+    return res
+
+# ---------- Watch mode (--watch-minutes) ----------
+# Async script: observe the preferred rows (by handle, in preference order) and click
+# the first one whose button turns into SIGN UP. 'stale' means a row left the DOM.
+WATCH_JS = ROW_STATE_JS + r"""
+const handles = arguments[0], windowMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const rows = handles.map(h => document.querySelector('[data-stglac-handle="' + h + '"]'));
+let finished = false, obs = null;
+const finish = r => { if (finished) return; finished = true; if (obs) obs.disconnect(); done(r); };
+const check = () => {
+  for (let k = 0; k < rows.length; k++) {
+    const row = rows[k];
+    if (!row || !row.isConnected) return finish({status: 'stale', k: k});
+    const btn = rowButton(row);
+    if (btn && buttonState(btn) === 'signup') {
+      row.scrollIntoView({block: 'center'});
+      finish({status: 'open', k: k});
+      setTimeout(() => btn.click(), 0);
+      return;
+    }
+  }
+};
+check();
+if (!finished) {
+  obs = new MutationObserver(check);
+  for (const row of rows) obs.observe(row, {subtree: true, childList: true, characterData: true,
+                                            attributes: true, attributeFilter: ['class', 'disabled']});
+  setTimeout(() => finish({status: 'timeout'}), windowMs);
+}
+"""
+
+def watch_for_preferences(driver, snap: Snapper, actions, prefs: List[int], minutes: float,
+                          keys: Dict[int, str] | None = None):
+    """
+    Keep the invitation page open and claim the first preferred row that flips to
+    SIGN UP (another parent cancelled). An in-page observer watches only the
+    preferred rows; every WATCH_RESYNC_SECS the rows are re-snapshotted (no reload)
+    and every WATCH_REFRESH_SECS the page is reloaded in case the site does not push
+    updates. Returns (n, item) with the Sign Up already clicked, or (None, None).
+    """
+    deadline = time.time() + minutes * 60
+    last_refresh = time.time()
+    print(f"[watch] watching preferences {prefs} for up to {minutes:g} min")
+    while time.time() < deadline:
+        rows = preference_rows(actions, prefs, keys)
+        wanted = [(n, rows[n]) for n in prefs if rows[n] is not None]
+        if not wanted or not all(it.get("handle") for _, it in wanted):
+            print("[watch] preferred rows have no handles (snapshot unavailable); stopping")
+            return None, None
+        window = max(1.0, min(WATCH_RESYNC_SECS, deadline - time.time()))
+        try:
+            with script_timeout(driver, window + 5):
+                res = driver.execute_async_script(WATCH_JS, [it["handle"] for _, it in wanted],
+                                                  int(window * 1000)) or {}
+        except Exception as e:
+            print(f"[watch] observer interrupted ({e.__class__.__name__}); resyncing")
+            res = {}
+        if res.get("status") == "open":
+            n, item = wanted[res["k"]]
+            print(f"[watch] Preference #{n} just opened — “{(item['title'] or '').strip()[:80]}”. Sign Up clicked.")
+            snap.hold()
+            snap.shot(driver, f"watch_pref_{n:02d}_clicked")
+            return n, item
+        # Resync: cheap re-snapshot, with an occasional full reload
+        expected = None
+        if time.time() - last_refresh >= WATCH_REFRESH_SECS:
+            print("[watch] periodic reload")
+            driver.refresh()
+            handle_continue_as_if_present(driver, snap)
+            expected = prepare_list(driver, snap)
+            last_refresh = time.time()
+        actions = collect_event_actions(driver, expected=expected)
+        rows = preference_rows(actions, prefs, keys)
+        for n in prefs:
+            if rows[n] is not None and is_signup_action(rows[n]):
+                print(f"[watch] Preference #{n} is open after resync.")
+                click_signup(driver, snap, rows[n], f"watch_pref_{n:02d}")
+                return n, rows[n]
+    print("[watch] time cap reached; nothing opened up")
+    return None, None
+
+# ---------- Startup (--profile-startup) ----------
+# Left out of the module imports (see _LazyModule); warm_imports loads them during the prompts
+DEFERRED_IMPORTS = ("selenium.webdriver.support.expected_conditions", "selenium.webdriver.support.ui",
+                    "selenium.webdriver.chrome.service", "webdriver_manager.chrome")
+
+def warm_imports():
+    """Import DEFERRED_IMPORTS on a daemon thread while the main thread waits on input()."""
+    def run():
+        for name in DEFERRED_IMPORTS:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                print(f"[startup] background import of {name} failed: {e}")
+    threading.Thread(target=run, daemon=True).start()
+
+def process_launch_epoch() -> float | None:
+    """Wall-clock launch time of this process (Linux /proc; exec keeps it across the venv relaunch)."""
+    try:
+        with open("/proc/self/stat") as f:
+            ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - uptime + ticks / _os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def report_startup():
+    """Print process launch → first prompt, split into bootstrap, imports and argument handling."""
+    now = time.time()
+    first = _T_SCRIPT
+    try:
+        # Script start in the system python, before the venv relaunch
+        first = min(float(_os.environ.get("STGLAC_T_SCRIPT", "")), _T_SCRIPT)
+    except ValueError:
+        pass
+    launch = process_launch_epoch()
+    phases = [("python start", None if launch is None else first - launch),
+              (f"bootstrap ({_os.environ.get('STGLAC_BOOT', 'no relaunch')})", _T_SCRIPT - first),
+              ("module imports", _T_IMPORTED - _T_SCRIPT),
+              ("args → prompt", now - _T_IMPORTED)]
+    print("\n[startup] phase                          ms")
+    for name, secs in phases:
+        print(f"[startup] {name:<28} {'n/a' if secs is None else f'{secs * 1000:.0f}':>6}")
+    total = now - (launch if launch is not None else first)
+    print(f"[startup] {'launch → first prompt':<28} {total * 1000:>6.0f}")
+
+# ---------- Scheduled release (--release-at) ----------
+def parse_release_at(hhmmss: str) -> float:
+    """
+    Epoch seconds of the next HH:MM:SS local time. A time up to 5 minutes in the
+    past counts as today (already released → no wait); older means tomorrow.
+    """
+    t = datetime.strptime(hhmmss.strip(), "%H:%M:%S").time()
+    now = datetime.now()
+    at = datetime.combine(now.date(), t)
+    if (now - at).total_seconds() > 300:
+        at += timedelta(days=1)
+    return at.timestamp()
+
+def hhmmss(value: str) -> str:
+    """argparse type for --release-at / --expect-open: a valid HH:MM:SS, returned as given."""
+    try:
+        datetime.strptime(value.strip(), "%H:%M:%S")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected HH:MM:SS (24-hour), got {value!r}")
+    return value.strip()
+
+class HeldOutput:
+    """
+    Stand-in for sys.stdout while the prompts run: output from other threads
+    (prearm, screenshot writers) is held and printed in one piece on release(),
+    so it does not land in the middle of a question.
+    """
+    def __init__(self, out):
+        self.out = out
+        self.owner = threading.get_ident()
+        self.held = []
+        self.holding = True
+        self.lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        if threading.get_ident() != self.owner:
+            with self.lock:
+                if self.holding:
+                    self.held.append(text)
+                    return len(text)
+        return self.out.write(text)
+
+    def release(self):
+        with self.lock:
+            self.holding = False
+            pending, self.held = "".join(self.held), []
+        if pending:
+            self.out.write(pending)
+            self.out.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.out, name)
+
+def prearm_driver(headless: bool, snap: Snapper, profile_dir: str | None = None,
+                  fast: bool = False, allow: List[str] | None = None, backend: str = "webdriver",
+                  record: bool = False):
+    """
+    Start Chrome and warm it before the release: load the group page, pass the
+    'Continue as…' modal on the invitation page where the site shows it, then
+    park back on the group page. Runs in the background while prompts are answered.
+    """
+    t0 = time.monotonic()
+    driver = build_driver(headless, profile_dir=profile_dir, fast=fast, allow=allow, backend=backend,
+                          record=record)
+    print(f"[prearm] Chrome ready in {time.monotonic() - t0:.1f}s")
+    try:
+        driver.get(GROUP_URL)
+        driver.get(INVITATION_URL)
+        handle_continue_as_if_present(driver, snap)
+        driver.get(GROUP_URL)
+        snap.shot(driver, "prearm_group_parked")
+    except Exception as e:
+        print(f"[prearm] warm-up incomplete ({e}); continuing with a cold page")
+    print(f"[prearm] armed in {time.monotonic() - t0:.1f}s")
+    return driver
+
+def wait_until_release(release_epoch: float) -> float:
+    """
+    Block until release_epoch using the monotonic clock (immune to wall-clock steps
+    once computed). Coarse sleeps first, then short naps for the last second.
+    Returns the monotonic instant of the release.
+    """
+    target = time.monotonic() + (release_epoch - time.time())
+    print(f"[release] waiting for {datetime.fromtimestamp(release_epoch).strftime('%H:%M:%S')}"
+          f" ({max(0.0, target - time.monotonic()):.0f}s)")
+    while True:
+        left = target - time.monotonic()
+        if left <= 0:
+            break
+        if left > 60:
+            print(f"[release] {left:.0f}s to go")
+            time.sleep(min(60.0, left - 30))
+        elif left > 1.0:
+            time.sleep(left - 1.0)
+        else:
+            time.sleep(min(left, 0.005))
+    print(f"[release] go (+{(time.monotonic() - target) * 1000:.1f} ms)")
+    return target
+
+# ---------- Batch mode (--roster) ----------
+ROSTER_FIELDS = ("name", "email", "phone", "bib", "week", "prefs")
+
+def load_roster(path: str) -> List[Dict]:
+    """
+    Read a roster: CSV with header name,email,phone,bib,week,prefs (prefs like "36;38;35")
+    or a JSON list of objects with the same keys. Raises ValueError on bad rows.
+    """
+    return [roster_person(raw, f"roster row {i}", f"{i:02d}") for i, raw in enumerate(read_rows(path), start=1)]
+
+def read_rows(path: str) -> List[Dict]:
+    """Rows of a .json list of objects, or of a CSV with a header line."""
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    import csv
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return list(csv.DictReader(f))
+
+def roster_person(raw: Dict, where: str, tag: str) -> Dict:
+    """
+    Validate one person (roster row or --serve job): the ROSTER_FIELDS keys, prefs as a
+    list or a string like "36;38;35". Raises ValueError naming `where`; `tag` prefixes the slug.
+    """
+    r = {str(k).strip().lower(): v for k, v in raw.items()}
+    missing = [k for k in ROSTER_FIELDS if not str(r.get(k) or "").strip()]
+    if missing:
+        raise ValueError(f"{where}: missing {', '.join(missing)}")
+    week = str(r["week"]).strip().upper()
+    if week not in ("A", "B"):
+        raise ValueError(f"{where}: week must be A or B, got {r['week']!r}")
+    index = EventIndex(week)
+    prefs = parse_prefs(",".join(re.findall(r"\d+", str(r["prefs"]))),
+                        len(index.rows) if index else len(week_map(week)))
+    if not prefs:
+        raise ValueError(f"{where}: no valid preferences in {r['prefs']!r}")
+    slug = re.sub(r"[^a-z0-9]+", "_", str(r["name"]).lower()).strip("_") or "parent"
+    return {"name": str(r["name"]).strip(), "email": str(r["email"]).strip(),
+            "phone": str(r["phone"]).strip(), "bib": str(r["bib"]).strip(),
+            "week": week, "prefs": prefs, "slug": f"{tag}_{slug}",
+            "keys": index.keys_for(prefs) if index else None}
+
+def try_claim(table, lock, key: str, owner: str) -> bool:
+    """Claim key in the batch-wide table; False if another worker already holds it."""
+    with lock:
+        holder = table.get(key)
+        if holder is not None and holder != owner:
+            return False
+        table[key] = owner
+        return True
+
+def release_claims(table, lock, owner: str):
+    """Drop every claim owner holds (its sign-up failed or stopped before Save)."""
+    with lock:
+        for key in [k for k, v in table.items() if v == owner]:
+            del table[key]
+
+def sign_up_person(driver, snap: Snapper, person: Dict, expected: int | None, dry_run: bool,
+                   claim=None, ref: float | None = None, between=None, settle: float = 2.0,
+                   warm: bool = False) -> Dict:
+    """
+    Unattended (Auto mode) sign-up of one roster person on an open invitation list.
+    Returns {"status", "chosen", "click_s"}; click_s counts from the monotonic ref.
+    warm: the browser has a persistent profile (see identify_and_confirm).
+    between(), if given, runs once the form is saved (--targets checks the other
+    groups there, never while this claim is in flight); settle is the pause before
+    the final frame.
+    Driver errors propagate to the caller.
+    """
+    res = {"status": "none_available", "chosen": None, "click_s": None}
+    actions = collect_event_actions(driver, expected=expected)
+    n, item = resolve_preferences(actions, person["prefs"], claim=claim, keys=person["keys"])
+    if item is None:
+        snap.shot(driver, "no_preference_available")
+        return res
+    click_signup(driver, snap, item, f"pref_{n:02d}")
+    res["click_s"] = None if ref is None else time.monotonic() - ref
+    res["chosen"] = n
+    if dry_run:
+        res["status"] = "dry_run"
+        snap.shot(driver, "dry_run_modal_open")
+        return res
+    identify_and_confirm(driver, snap, person["email"], warm=warm)
+    fill_participant_form(driver, snap, person["name"], person["email"], person["phone"],
+                          person["bib"], confirm_before_save=False, selection_text="")
+    if between is not None:
+        between()
+    time.sleep(settle)
+    snap.shot(driver, "final_state")
+    res["status"] = "signed_up"
+    return res
+
+def batch_worker(job: Dict) -> Dict:
+    """
+    One family's sign-up in its own process, Chrome profile and Snapper folder.
+    Always Auto mode (no confirm prompt). Returns a summary row for the run table.
+    """
+    TRACER.reset()
+    person = job["person"]
+    slug = person["slug"]
+    res = {"name": person["name"], "week": person["week"], "chosen": None,
+           "status": "error", "start_s": None, "click_s": None, "total_s": None}
+    t0 = time.monotonic()
+    if job["site_base"] != SITE_BASE:
+        set_site(job["site_base"])  # spawned workers do not inherit module globals
+    snap = Snapper(base_dir=_os.path.join(job["shots_dir"], slug), mode=job["snap_mode"],
+                   frames=job["snap_frames"])
+    driver = None
+    try:
+        driver = build_driver(job["headless"], profile_dir=_os.path.join(job["profiles_dir"], slug),
+                              fast=job["fast_load"], allow=job["fast_load_allow"], backend=job["backend"])
+        res["start_s"] = time.monotonic() - t0
+        ref = t0
+        if job["release_epoch"] is not None:
+            driver.get(GROUP_URL)
+            ref = wait_until_release(job["release_epoch"])
+        expected = open_invitation(driver, snap, detect=job["detect"], open_epoch=job["release_epoch"])
+        if expected is None:
+            res["status"] = "no_view"
+            return res
+        claim = lambda n: try_claim(job["table"], job["lock"], f"{person['week']}:{n}", slug)
+        res.update(sign_up_person(driver, snap, person, expected, job["dry_run"], claim=claim, ref=ref,
+                                  warm=True))  # each family keeps its profile under profiles_dir
+    except Exception as e:
+        res["status"] = f"error: {e}".splitlines()[0][:60]
+        if driver is not None:
+            snap.shot(driver, "exception")
+    finally:
+        if res["status"] != "signed_up":
+            # Only a saved sign-up keeps its spot; anything else frees it for the others
+            release_claims(job["table"], job["lock"], slug)
+        res["total_s"] = time.monotonic() - t0
+        snap.close()
+        TRACER.save(_os.path.join(snap.dir, "trace.json"))
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    return res
+
+def run_batch(args, release_epoch: float | None):
+    try:
+        roster = load_roster(args.roster)
+    except (OSError, ValueError) as e:  # bad rows name themselves ("roster row 3: missing bib")
+        raise SystemExit(f"--roster {args.roster}: {e}")
+    print(f"[batch] {len(roster)} families from {args.roster}")
+    base = _os.path.join(shots_base_dir(args.shots_subdir), "batch_" + datetime.now().strftime("%Y%m%d_%H%M%S"))
+    workers = min(len(roster), args.workers or len(roster))
+    # Same rule as a single run: --release-at implies observe unless adaptive was asked for
+    detect = "observe" if release_epoch is not None and args.detect != "adaptive" else args.detect
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    with multiprocessing.Manager() as mgr, ProcessPoolExecutor(max_workers=workers) as pool:
+        table, lock = mgr.dict(), mgr.Lock()
+        jobs = [{"person": p, "headless": args.headless, "dry_run": args.dry_run, "detect": detect,
+                 "release_epoch": release_epoch, "shots_dir": base, "profiles_dir": args.profiles_dir,
+                 "site_base": SITE_BASE, "snap_mode": args.snap_mode, "snap_frames": args.snap_frames,
+                 "fast_load": args.fast_load, "fast_load_allow": args.fast_load_allow,
+                 "backend": args.backend,
+                 "table": table, "lock": lock} for p in roster]
+        results = list(pool.map(batch_worker, jobs))
+        claims = dict(table)
+
+    fmt = lambda v: "-" if v is None else f"{v:.2f}"
+    print("\n== Batch summary ==")
+    print(f"{'name':<24} {'wk':<3} {'pref':>4} {'start s':>8} {'click s':>8} {'total s':>8}  status")
+    for r in results:
+        print(f"{r['name'][:24]:<24} {r['week']:<3} {r['chosen'] or '-':>4} {fmt(r['start_s']):>8} "
+              f"{fmt(r['click_s']):>8} {fmt(r['total_s']):>8}  {r['status']}")
+    print(f"[batch] claims: {claims}")
+    print(f"[batch] screenshots under {base}")
+
+# ---------- Daemon mode (--daemon) ----------
+WEEKDAYS = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+
+def process_rss_mb(pid: int) -> float:
+    """Resident memory of pid plus all its descendants (chromedriver → Chrome → renderers), MB."""
+    procs = {}  # pid -> (ppid, rss KB)
+    try:
+        if _os.path.isdir("/proc"):
+            for d in _os.listdir("/proc"):
+                if not d.isdigit():
+                    continue
+                try:
+                    with open(f"/proc/{d}/status", encoding="ascii", errors="replace") as f:
+                        st = f.read()
+                except OSError:
+                    continue
+                rss = re.search(r"VmRSS:\s+(\d+)", st)
+                procs[int(d)] = (int(re.search(r"PPid:\s+(\d+)", st).group(1)), int(rss.group(1)) if rss else 0)
+        else:
+            out = subprocess.run(["ps", "-A", "-o", "pid=,ppid=,rss="], capture_output=True, text=True).stdout
+            for line in out.splitlines():
+                p, pp, rss = map(int, line.split()[:3])
+                procs[p] = (pp, rss)
+    except Exception:
+        return 0.0
+    children: Dict[int, List[int]] = {}
+    for p, (pp, _) in procs.items():
+        children.setdefault(pp, []).append(p)
+    total, stack = 0, [pid]
+    while stack:
+        p = stack.pop()
+        total += procs.get(p, (0, 0))[1]
+        stack.extend(children.get(p, []))
+    return total / 1024
+
+def driver_pid(driver) -> int | None:
+    """Root process of a driver: chromedriver for Selenium, Chrome itself for CdpDriver."""
+    proc = getattr(getattr(driver, "service", None), "process", None) or getattr(driver, "_proc", None)
+    return getattr(proc, "pid", None)
+
+def _quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+class DriverKeeper:
+    """
+    Daemon mode: owns the live driver, parked on the group page. tick() between checks
+    recycles it once Chrome's RSS passes DAEMON_RSS_MB or it is older than
+    DAEMON_RECYCLE_MINUTES: the replacement is built and warmed in the background and
+    swapped in only when ready, so checks never pause. A dead session is replaced on
+    the spot. build(slot) must return a driver already on the group page; slots
+    alternate so two Chromes never share a profile directory.
+    """
+    def __init__(self, build):
+        self.build = build
+        self.slot = 0
+        self.driver = build(self.slot)
+        self.born = time.time()
+        self._checked = 0.0
+        self._next = None
+        self._pool = ThreadPoolExecutor(max_workers=1)
+
+    def alive(self) -> bool:
+        try:
+            self.driver.execute_script("return 1;")
+            return True
+        except Exception:
+            return False
+
+    def _swap(self, new):
+        old, self.driver, self.born = self.driver, new, time.time()
+        threading.Thread(target=_quit_quietly, args=(old,), daemon=True).start()
+
+    def revive(self):
+        """Replace a crashed session now (the warm replacement if one is ready)."""
+        new = None
+        if self._next is not None:
+            try:
+                new = self._next.result(timeout=WAIT * 3)
+            except Exception:
+                new = None
+            self._next = None
+        if new is None:
+            self.slot += 1
+            new = self.build(self.slot)
+        self._swap(new)
+        print("[daemon] browser restarted")
+
+    def tick(self):
+        """Call between checks; returns the driver to use from now on."""
+        if self._next is not None and self._next.done():
+            try:
+                new = self._next.result()
+                self._swap(new)
+                print("[daemon] switched to the warm replacement")
+            except Exception as e:
+                print(f"[daemon] replacement failed to start ({e.__class__.__name__}); keeping the old one")
+            self._next = None
+        if time.time() - self._checked < DAEMON_CHECK_SECS:
+            return self.driver
+        self._checked = time.time()
+        if not self.alive():
+            print("[daemon] browser session lost")
+            self.revive()
+            return self.driver
+        if self._next is None:
+            pid = driver_pid(self.driver)
+            rss = process_rss_mb(pid) if pid else 0.0
+            age = (time.time() - self.born) / 60
+            if rss > DAEMON_RSS_MB or age > DAEMON_RECYCLE_MINUTES:
+                print(f"[daemon] recycling browser (RSS {rss:.0f} MB, {age:.0f} min old); warming a replacement")
+                self.slot += 1
+                self._next = self._pool.submit(self.build, self.slot)
+        return self.driver
+
+    def close(self):
+        if self._next is not None:
+            try:
+                _quit_quietly(self._next.result(timeout=WAIT * 3))
+            except Exception:
+                pass
+        _quit_quietly(self.driver)
+        self._pool.shutdown(wait=False)
+
+def daemon_state_path(roster_path: str) -> str:
+    """Checkpoint file for one roster, so two daemons on different rosters never share progress."""
+    return DAEMON_STATE.format(key=hashlib.sha1(_os.path.abspath(roster_path).encode()).hexdigest()[:10])
+
+def load_checkpoint(path: str) -> Dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def save_checkpoint(state: Dict, path: str):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+    _os.replace(tmp, path)
+
+def next_weekly_release(day: str, hhmmss: str, after: float) -> float:
+    """Epoch of the first DAY HH:MM:SS whose detection window has not closed by `after`."""
+    t = datetime.strptime(hhmmss.strip(), "%H:%M:%S").time()
+    base = datetime.fromtimestamp(after)
+    at = datetime.combine(base.date(), t) + timedelta(days=(WEEKDAYS.index(day) - base.weekday()) % 7)
+    while at.timestamp() + MAX_POLL_MINUTES * 60 <= after:
+        at += timedelta(days=7)
+    return at.timestamp()
+
+def daemon_release(args, roster: List[Dict], release: float, state: Dict, state_path: str):
+    """
+    One weekly release: warm Chrome, adaptive checks until 'View' opens, then every
+    roster person in order on the same browser (cookies cleared in between). Progress
+    is checkpointed after each step, so a crash (of the driver or of this process)
+    resumes at the first unfinished step instead of starting over. A person whose
+    step was interrupted is looked up on the list (my_spots) before being retried.
+    Attempts are counted in the checkpoint: after DAEMON_RESTARTS the release is
+    given up, also across process restarts.
+    """
+    save = functools.partial(save_checkpoint, path=state_path)
+    def build(slot: int):
+        profile = _os.path.join(args.profile_dir, f"slot{slot % 2}") if args.profile_dir else None
+        d = build_driver(args.headless, profile_dir=profile, fast=args.fast_load,
+                         allow=args.fast_load_allow, backend=args.backend)
+        d.get(GROUP_URL)
+        return d
+
+    if state.get("release") != release:
+        state.clear()
+        state.update(release=release, step="armed", done=[], attempts=0)
+        save(state)
+    if state["step"].startswith("person:"):
+        # The process died mid sign-up: the site may or may not have it
+        state.update(unsure=state["step"].split(":", 1)[1], step="open")
+    snap = Snapper(base_dir=_os.path.join(shots_base_dir(args.shots_subdir), "daemon"), mode=args.snap_mode,
+                   frames=args.snap_frames, keep_runs=args.snap_keep_runs)
+    TRACER.reset()
+    keeper = None
+    try:
+        while state.get("attempts", 0) < DAEMON_RESTARTS:
+            state["attempts"] = state.get("attempts", 0) + 1
+            save(state)
+            try:
+                # A Chrome that fails to start (or restart) costs this attempt, not the daemon
+                if keeper is None:
+                    keeper = DriverKeeper(build)
+                elif not keeper.alive():
+                    keeper.revive()
+                if state["step"] == "armed":
+                    if not poll_view_adaptive(keeper.driver, snap, release, keeper=keeper):
+                        print("[daemon] 'View' never appeared in this window")
+                        state["step"] = "missed"
+                        save(state)
+                        return
+                    state["step"] = "open"
+                    save(state)
+                    expected = enter_invitation(keeper.driver, snap)
+                else:
+                    print(f"[daemon] resuming at step '{state['step']}' (done: {state['done'] or 'none'})")
+                    keeper.driver.get(INVITATION_URL)
+                    expected = enter_invitation(keeper.driver, snap)
+                for person in roster:
+                    if person["slug"] in state["done"]:
+                        continue
+                    if state.get("unsure") == person["slug"]:
+                        # Fresh session: 'my spots' must not be whoever was identified before
+                        keeper.driver.delete_all_cookies()
+                        keeper.driver.get(INVITATION_URL)
+                        expected = enter_invitation(keeper.driver, snap)
+                        mine = my_spots(keeper.driver, snap, person["name"])
+                        state.pop("unsure")
+                        if mine:
+                            print(f"[daemon] {person['name']}: already on “{mine[0][:60]}” (interrupted step went through)")
+                            state["done"].append(person["slug"])
+                            save(state)
+                            continue
+                    state["step"] = f"person:{person['slug']}"
+                    save(state)
+                    res = sign_up_person(keeper.driver, snap, person, expected, args.dry_run,
+                                         warm=bool(args.profile_dir))
+                    print(f"[daemon] {person['name']}: {res['status']} (pref {res['chosen'] or '-'})")
+                    state["done"].append(person["slug"])
+                    state["step"] = "open"
+                    save(state)
+                    if len(state["done"]) < len(roster):
+                        keeper.driver.delete_all_cookies()
+                        keeper.driver.get(INVITATION_URL)
+                        expected = enter_invitation(keeper.driver, snap)
+                state["step"] = "finished"
+                save(state)
+                return
+            except Exception as e:
+                why = (str(e).splitlines() or [""])[0][:80]
+                print(f"[daemon] step '{state['step']}' failed ({e.__class__.__name__}: {why}); "
+                      f"attempt {state['attempts']}/{DAEMON_RESTARTS}")
+                if state["step"].startswith("person:"):
+                    state.update(unsure=state["step"].split(":", 1)[1], step="open")
+                save(state)
+        print(f"[daemon] giving up on this release after {DAEMON_RESTARTS} attempts")
+        state["step"] = "gave_up"
+        save(state)
+    finally:
+        if keeper is not None:
+            keeper.close()
+        snap.close()
+        TRACER.save(_os.path.join(snap.dir, "trace.json"))
+
+def run_daemon(args):
+    """--daemon ROSTER: sign the roster up every week at --release-day/--release-at, forever."""
+    if not args.release_at:
+        raise SystemExit("--daemon needs --release-at HH:MM:SS (and --release-day, default MON)")
+    roster = load_roster(args.daemon)
+    state_path = daemon_state_path(args.daemon)
+    state = load_checkpoint(state_path)
+    print(f"[daemon] {len(roster)} people, releases {args.release_day} {args.release_at}; state in {state_path}")
+    while True:
+        after = time.time()
+        # A release that ended (done, missed or out of attempts) is not retried in its window
+        if state.get("step") in ("finished", "missed", "gave_up") \
+                and state.get("release", 0) + MAX_POLL_MINUTES * 60 > after:
+            after = state["release"] + MAX_POLL_MINUTES * 60
+        release = next_weekly_release(args.release_day, args.release_at, after)
+        wake = release - DAEMON_LEAD_MINUTES * 60
+        if wake > time.time():
+            print(f"[daemon] next release {datetime.fromtimestamp(release):%a %Y-%m-%d %H:%M:%S}; "
+                  f"sleeping until {datetime.fromtimestamp(wake):%a %H:%M}")
+            time.sleep(wake - time.time())
+        try:
+            daemon_release(args, roster, release, state, state_path)
+        except Exception as e:
+            # Never let one release end the daemon: log it, skip to the next release
+            print(f"[daemon] release {datetime.fromtimestamp(release):%a %H:%M:%S} aborted "
+                  f"({e.__class__.__name__}: {(str(e).splitlines() or [''])[0][:80]}); waiting for the next one")
+            state.update(release=release, step="gave_up")
+            try:
+                save_checkpoint(state, state_path)
+            except Exception:
+                pass
+
+# ---------- Control API (--serve) ----------
+class SessionPool:
+    """
+    --serve: warm Chrome sessions parked on the invitation list (on the group page
+    while the sign-up is not open) and a FIFO job queue. Each session has a worker
+    thread that takes the next job, so a job starts on the first idle session; a
+    session parked on the list only refreshes it before signing up. Sessions are
+    DriverKeepers: health-checked and recycled while idle, as in daemon mode. Where a
+    driver is parked is kept on the driver (driver.parked), so a replacement warmed in
+    the background brings its own state with it when DriverKeeper swaps it in.
+    """
+    def __init__(self, args, size: int):
+        self.args = args
+        self.root = _os.path.join(shots_base_dir(args.shots_subdir), "serve")
+        self.queue = queue.Queue()
+        self.jobs: Dict[str, Dict] = {}
+        self.claims: Dict[str, str] = {}  # "week:pref" -> job id, see try_claim
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.sessions = [{"id": i, "state": "starting", "jobs": 0, "email": None,
+                          "keeper": None, "snap": Snapper(base_dir=_os.path.join(self.root, f"session{i}"),
+                                                          mode=args.snap_mode, frames="critical")}
+                         for i in range(size)]
+        for sess in self.sessions:
+            threading.Thread(target=self._work, args=(sess,), daemon=True).start()
+
+    def _build(self, sess: Dict, slot: int):
+        profile = (_os.path.join(self.args.profile_dir, f"session{sess['id']}_slot{slot % 2}")
+                   if self.args.profile_dir else None)
+        driver = build_driver(self.args.headless, profile_dir=profile, fast=self.args.fast_load,
+                              allow=self.args.fast_load_allow, backend=self.args.backend)
+        self._park(sess, driver)
+        return driver
+
+    def _park(self, sess: Dict, driver):
+        """Leave the driver on the invitation list if it is open, else on the group page."""
+        try:
+            driver.get(INVITATION_URL)
+            handle_continue_as_if_present(driver, sess["snap"])
+            if INVITATION_URL_HINT in driver.current_url and driver.find_elements(By.XPATH, "//div[contains(@class,'assignment-widget')]"):
+                driver.parked = "invitation"
+                return
+        except Exception as e:
+            print(f"[serve] session {sess['id']}: invitation list not reachable ({e.__class__.__name__})")
+        driver.get(GROUP_URL)
+        driver.parked = "group"
+
+    @staticmethod
+    def _parked(sess: Dict) -> str | None:
+        return getattr(sess["keeper"].driver, "parked", None) if sess["keeper"] is not None else None
+
+    def submit(self, raw: Dict) -> Dict:
+        """Queue a job from the API body; raises ValueError on a bad person/week/prefs."""
+        person = roster_person(raw, "job", "")
+        dry_run = raw.get("dry_run", bool(self.args.dry_run))
+        if not isinstance(dry_run, bool):
+            raise ValueError(f"job: dry_run must be true or false, got {dry_run!r}")
+        n = next(self._ids)
+        person["slug"] = f"job{n:04d}{person['slug']}"
+        job = {"id": str(n), "status": "queued", "name": person["name"], "week": person["week"],
+               "prefs": person["prefs"], "dry_run": dry_run,
+               "submitted": time.time(), "started": None, "finished": None, "session": None,
+               "result": None, "error": None, "shots_dir": None, "screenshots": []}
+        with self.lock:
+            self.jobs[job["id"]] = job
+        self.queue.put((job, person))
+        return job
+
+    def _work(self, sess: Dict):
+        while sess["keeper"] is None:
+            try:
+                sess["keeper"] = DriverKeeper(lambda slot: self._build(sess, slot))
+            except Exception as e:
+                self._failed(sess, e)
+                time.sleep(DAEMON_CHECK_SECS)
+        sess["state"] = "idle"
+        print(f"[serve] session {sess['id']} ready, parked on the {self._parked(sess)} page")
+        while True:
+            if sess["state"] != "idle":
+                # Broken browser: keep trying to revive it, take no jobs meanwhile
+                time.sleep(DAEMON_CHECK_SECS)
+                if self._tick(sess) is not None:
+                    sess["state"] = "idle"
+                    print(f"[serve] session {sess['id']} recovered")
+                continue
+            try:
+                job, person = self.queue.get(timeout=DAEMON_CHECK_SECS)
+            except queue.Empty:
+                self._tick(sess)
+                continue
+            driver = self._tick(sess)
+            if driver is None:
+                self.queue.put((job, person))  # for a healthy session, or failed below if none is left
+                self._fail_stranded()
+                continue
+            sess["state"] = "busy"
+            try:
+                with Tracer().use() as tracer:
+                    self._run(sess, job, person, driver)
+                if job["shots_dir"]:
+                    tracer.save(_os.path.join(job["shots_dir"], "trace.json"))
+            except Exception as e:
+                if job["status"] in ("queued", "running"):
+                    job.update(status="error", error=f"{e.__class__.__name__}: {e}".splitlines()[0][:200],
+                               finished=time.time())
+                    release_claims(self.claims, self.lock, job["id"])
+                self._failed(sess, e)
+            finally:
+                if sess["state"] == "busy":
+                    sess["state"] = "idle"
+
+    def _tick(self, sess: Dict):
+        """keeper.tick(); None (session marked errored) if Chrome could not be kept alive."""
+        try:
+            return sess["keeper"].tick()
+        except Exception as e:
+            self._failed(sess, e)
+            return None
+
+    def _failed(self, sess: Dict, e: Exception):
+        sess["state"] = f"error: {e.__class__.__name__}: {e}".splitlines()[0][:80]
+        print(f"[serve] session {sess['id']}: {sess['state']}")
+        self._fail_stranded()
+
+    def _fail_stranded(self):
+        """Every session is broken: fail the queued jobs instead of leaving them "queued" forever."""
+        if any(s["state"] in ("starting", "idle", "busy") for s in self.sessions):
+            return
+        while True:
+            try:
+                job, _ = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            job.update(status="error", error="no working browser session", finished=time.time())
+            release_claims(self.claims, self.lock, job["id"])
+
+    def _run(self, sess: Dict, job: Dict, person: Dict, driver):
+        keeper = sess["keeper"]
+        job.update(status="running", started=time.time(), session=sess["id"])
+        snap = Snapper(base_dir=_os.path.join(self.root, person["slug"]), mode=self.args.snap_mode,
+                       frames=self.args.snap_frames)
+        job["shots_dir"] = snap.dir
+        t0 = time.monotonic()
+        try:
+            if sess["email"] not in (None, person["email"]):
+                driver.delete_all_cookies()  # the previous job identified someone else
+            if getattr(driver, "parked", None) == "invitation":
+                driver.refresh()
+                expected = enter_invitation(driver, snap)
+            else:
+                expected = open_invitation(driver, snap, detect=self.args.detect)
+            if expected is None:
+                job["result"] = {"status": "no_view", "chosen": None, "click_s": None}
+            else:
+                claim = lambda n: try_claim(self.claims, self.lock, f"{person['week']}:{n}", job["id"])
+                job["result"] = sign_up_person(driver, snap, person, expected, job["dry_run"], claim=claim, ref=t0,
+                                               warm=bool(self.args.profile_dir))
+                sess["email"] = person["email"]
+            job["status"] = "done"
+        except Exception as e:
+            job.update(status="error", error=f"{e.__class__.__name__}: {e}".splitlines()[0][:200])
+            snap.shot(driver, "exception")
+        finally:
+            snap.close()
+            job["screenshots"] = [_os.path.join(snap.dir, e["file"]) for e in snap.index
+                                  if e["file"] and not e.get("dup")]
+            job["finished"] = time.time()
+            sess["jobs"] += 1
+            if (job["result"] or {}).get("status") != "signed_up":
+                release_claims(self.claims, self.lock, job["id"])  # the spot is still free for others
+            with self.lock:
+                # Nothing queued or running elsewhere: no one left to race for a spot
+                if self.queue.empty() and all(s is sess or s["state"] != "busy" for s in self.sessions):
+                    self.claims.clear()
+        res = job["result"] or {}
+        print(f"[serve] job {job['id']} ({person['name']}): {job['error'] or res.get('status')} "
+              f"pref {res.get('chosen') or '-'} in {job['finished'] - job['started']:.1f}s")
+        try:
+            if not keeper.alive():
+                keeper.revive()
+            self._park(sess, keeper.driver)
+        except Exception as e:
+            print(f"[serve] session {sess['id']}: re-park failed ({e.__class__.__name__})")
+            if not keeper.alive():
+                self._failed(sess, e)
+
+    def status(self) -> Dict:
+        with self.lock:
+            return {"queued": self.queue.qsize(),
+                    "sessions": [{**{k: s[k] for k in ("id", "state", "jobs")}, "parked": self._parked(s)}
+                                 for s in self.sessions]}
+
+    def close(self):
+        for sess in self.sessions:
+            if sess["keeper"] is not None:
+                sess["keeper"].close()
+            sess["snap"].close()
+
+def serve_api(pool: SessionPool, port: int, token: str):
+    """
+    HTTP API on SERVE_HOST:port (JSON in and out):
+      POST /jobs       {name, email, phone, bib, week, prefs[, dry_run]} → 202 + the job
+      GET  /jobs       every job, newest first
+      GET  /jobs/<id>  one job: status queued|running|done|error, result, screenshots
+      GET  /sessions   browser sessions and the queue length
+    Every request needs "Authorization: Bearer <token>" (printed at startup). POST also
+    needs Content-Type: application/json, and a browser Origin other than this server
+    is refused, so a web page cannot queue a sign-up through the user's browser.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    class Handler(BaseHTTPRequestHandler):
+        def _allowed(self) -> bool:
+            given = self.headers.get("Authorization", "")
+            if not secrets.compare_digest(given.encode(), f"Bearer {token}".encode()):
+                self._json(401, {"error": "missing or wrong token"})
+                return False
+            origin = self.headers.get("Origin")
+            port_ = self.server.server_address[1]
+            if origin and origin not in (f"http://{SERVE_HOST}:{port_}", f"http://localhost:{port_}"):
+                self._json(403, {"error": "cross-origin requests are not accepted"})
+                return False
+            return True
+
+        def _json(self, code: int, obj):
+            body = json.dumps(obj, indent=1).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if not self._allowed():
+                return
+            path = urlparse(self.path).path.rstrip("/")
+            with pool.lock:
+                jobs = {k: dict(v) for k, v in pool.jobs.items()}
+            if path == "/jobs":
+                self._json(200, sorted(jobs.values(), key=lambda j: -int(j["id"])))
+            elif path.startswith("/jobs/") and path[6:] in jobs:
+                self._json(200, jobs[path[6:]])
+            elif path == "/sessions":
+                self._json(200, pool.status())
+            else:
+                self._json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if not self._allowed():
+                return
+            if urlparse(self.path).path.rstrip("/") != "/jobs":
+                self._json(404, {"error": "not found"})
+                return
+            if self.headers.get("Content-Type", "").split(";")[0].strip().lower() != "application/json":
+                self._json(415, {"error": "Content-Type must be application/json"})
+                return
+            try:
+                raw = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                if not isinstance(raw, dict):
+                    raise ValueError("body must be a JSON object")
+                job = pool.submit(raw)
+            except ValueError as e:  # includes JSON decode errors
+                self._json(400, {"error": str(e)})
+                return
+            self._json(202, {**job, "queued_ahead": pool.queue.qsize() - 1})
+
+        def log_message(self, *args):
+            pass
+
+    return ThreadingHTTPServer((SERVE_HOST, port), Handler)
+
+def run_serve(args):
+    """--serve PORT: keep --workers warm sessions and run sign-up jobs posted to the API."""
+    # Each job traces into its own folder (SessionPool._work); nothing piles up globally
+    TRACER.enabled = False
+    pool = SessionPool(args, max(1, args.workers or 1))
+    token = secrets.token_urlsafe(18)
+    server = serve_api(pool, args.serve, token)
+    base = f"http://{SERVE_HOST}:{server.server_address[1]}"
+    print(f"[serve] {len(pool.sessions)} session(s) warming; API at {base}")
+    print(f"[serve] token for this run: {token}")
+    print(f"[serve] e.g. curl -H 'Authorization: Bearer {token}' -H 'Content-Type: application/json' "
+          f"-d '{{\"name\":\"…\",\"email\":\"…\",\"phone\":\"…\",\"bib\":\"…\","
+          f"\"week\":\"A\",\"prefs\":[36,38,35]}}' {base}/jobs")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[serve] stopping")
+    finally:
+        server.server_close()
+        pool.close()
+
+# ---------- Several groups/entries in one browser (--targets) ----------
+def load_targets(path: str, open_epoch: float | None = None) -> List[Dict]:
+    """
+    Read targets: roster columns (name,email,phone,bib,week,prefs) plus group and entry
+    (signup.com ids or URLs), optional label and open (HH:MM:SS, else open_epoch).
+    Preferences resolve against that group's event index. Raises ValueError on bad rows.
+    """
+    targets = []
+    for i, raw in enumerate(read_rows(path), start=1):
+        r = {str(k).strip().lower(): v for k, v in raw.items()}
+        ids = [re.findall(r"\d+", str(r.get(k) or "")) for k in ("group", "entry")]
+        if not all(ids):
+            raise ValueError(f"target {i}: group and entry (signup.com ids or URLs) are required")
+        group, entry = ids[0][-1], ids[1][-1]
+        set_target(group, entry)  # EventIndex(week) in roster_person reads GROUP_ID
+        person = roster_person(raw, f"target {i}", f"{i:02d}")
+        targets.append({"label": str(r.get("label") or f"{group}/{entry}").strip(), "group": group,
+                        "entry": entry, "person": person,
+                        "open_epoch": parse_release_at(str(r["open"])) if r.get("open") else open_epoch})
+    return targets
+
+def switch_target(driver, target: Dict):
+    """Bring target's tab to the front and point the site globals at it."""
+    driver.switch_to.window(target["handle"])
+    set_target(target["group"], target["entry"])
+
+def watch_targets(driver, targets: List[Dict]):
+    """
+    Shared scheduler over the target tabs: each has a ViewPoller, and the one whose
+    check is due soonest runs next (one tab at a time, so the browser stays as busy
+    as with a single group). Yields (target, peek) as each target's 'View' is
+    clicked, in the order they open, until every one has opened or MAX_POLL_MINUTES
+    after the latest open time. peek() checks the waiting targets that are due
+    server-side from the current tab, without switching, so a target that opens
+    during another's sign-up is the next one handled.
+    """
+    deadline = max([time.time()] + [t["open_epoch"] or 0 for t in targets]) + MAX_POLL_MINUTES * 60
+    due = {t["label"]: time.time() for t in targets}
+    waiting = list(targets)
+
+    def peek():
+        now = time.time()
+        for t in waiting:
+            if due[t["label"]] > now:
+                continue
+            try:
+                with script_timeout(driver, HTTP_TIMEOUT + 5):
+                    res = driver.execute_async_script(VIEW_CHECK_JS, pd_view_xpaths(t["entry"]),
+                                                      f"{SITE_BASE}/group/{t['group']}") or {}
+            except Exception:
+                continue
+            if res.get("found", -1) >= 0:
+                print(f"[targets] {t['label']} opened during a sign-up; it goes next")
+                due[t["label"]] = 0.0
+            else:
+                dt = now - t["open_epoch"] if t["open_epoch"] else None
+                due[t["label"]] = now + poll_interval(dt)
+
+    while waiting and time.time() < deadline:
+        target = min(waiting, key=lambda t: due[t["label"]])
+        time.sleep(max(0.0, due[target["label"]] - time.time()))
+        switch_target(driver, target)
+        with TRACER.span("view_poll", driver):
+            opened, wait = target["poller"].check(driver)
+        if opened:
+            waiting.remove(target)
+            yield target, peek
+        else:
+            due[target["label"]] = time.time() + wait
+    for target in waiting:
+        print(f"[targets] {target['label']}: 'View' never appeared")
+
+def run_targets(args, open_epoch: float | None):
+    """
+    --targets FILE: one browser, one tab per target, each parked on its group page and
+    polled by watch_targets; every target is signed up (Auto mode) as soon as it opens.
+    Each target has its own Snapper folder under screenshots/<subdir>/targets/.
+    """
+    if args.backend != "webdriver":
+        raise SystemExit("--targets needs --backend webdriver (tabs are switched through WebDriver)")
+    try:
+        targets = load_targets(args.targets, open_epoch)
+    except (OSError, ValueError) as e:  # bad rows name themselves ("target 2: missing bib")
+        raise SystemExit(f"--targets {args.targets}: {e}")
+    labels = [t["label"] for t in targets]
+    if len(set(labels)) != len(labels):
+        raise SystemExit("--targets: labels (default group/entry) must be unique")
+    base = _os.path.join(shots_base_dir(args.shots_subdir), "targets")
+    print(f"[targets] {len(targets)} targets in one browser: {', '.join(labels)}")
+    driver = build_driver(args.headless, profile_dir=args.profile_dir, fast=args.fast_load,
+                          allow=args.fast_load_allow, backend=args.backend)
+    TRACER.reset()
+    results = []
+    try:
+        for i, t in enumerate(targets):
+            if i:
+                driver.switch_to.new_window("tab")
+                if args.fast_load:
+                    apply_fast_load(driver, args.fast_load_allow)  # CDP blocking is per tab
+            t["handle"] = driver.current_window_handle
+            t["snap"] = Snapper(base_dir=_os.path.join(base, t["person"]["slug"]), mode=args.snap_mode,
+                                frames=args.snap_frames, keep_runs=args.snap_keep_runs)
+            t["poller"] = ViewPoller(t["snap"], t["open_epoch"], tag=f"poll {t['label']}")
+            switch_target(driver, t)
+            driver.get(GROUP_URL)
+            t["snap"].shot(driver, "group_loaded")
+        for t, peek in watch_targets(driver, targets):
+            print(f"[targets] {t['label']} is open; signing up {t['person']['name']}")
+            try:
+                expected = enter_invitation(driver, t["snap"])
+                res = sign_up_person(driver, t["snap"], t["person"], expected, args.dry_run,
+                                     between=peek, settle=0.5, warm=bool(args.profile_dir))
+            except Exception as e:
+                print(f"[exception] {t['label']}: {e}")
+                t["snap"].shot(driver, "exception")
+                res = {"status": f"error: {e}".splitlines()[0][:60], "chosen": None}
+            results.append((t, res))
+    finally:
+        for t in targets:
+            if "snap" in t:
+                t["poller"].save()
+                t["snap"].close()
+        TRACER.save(_os.path.join(base, "trace.json"))
+        _quit_quietly(driver)
+    print("\n== Targets summary ==")
+    done = {t["label"]: res for t, res in results}
+    for t in targets:
+        res = done.get(t["label"], {"status": "not opened", "chosen": None})
+        print(f"{t['label'][:28]:<28} {t['person']['name'][:20]:<20} {res['chosen'] or '-':>4}  {res['status']}")
+
+# ---------- Main ----------
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--headless", action="store_true", help="Run Chrome headless")
+    ap.add_argument("--dry-run", action="store_true",
+                    help="Stop after clicking 'Sign Up' (modal open), do not submit anything.")
+    ap.add_argument("--shots-subdir", default="", metavar="NAME",
+                    help="Save screenshots under ./screenshots/NAME/<timestamp>.")
+    ap.add_argument("--start-only", action="store_true",
+                    help="Open group page, click orange 'View', handle 'Continue as…' modal, then exit on invitation page.")
+    ap.add_argument("--detect", choices=("poll", "observe", "adaptive"), default="poll",
+                    help="'View' detection: poll (refresh every POLL_SECS), observe (MutationObserver + background fetch) "
+                         "or adaptive (cheap checks on POLL_SCHEDULE around --expect-open; every 30 s without it).")
+    ap.add_argument("--expect-open", type=hhmmss, default="", metavar="HH:MM:SS",
+                    help="When the sign-up is expected to open (adaptive polling ramps up around it; default --release-at).")
+    ap.add_argument("--release-at", type=hhmmss, default="", metavar="HH:MM:SS",
+                    help="Start and warm Chrome now, wait for this local time, then detect aggressively (implies --detect observe).")
+    ap.add_argument("--engine", choices=("browser", "http"), default="browser",
+                    help="http: try the browserless fast path first, fall back to Chrome if discovery fails.")
+    ap.add_argument("--site-base", default="", metavar="URL",
+                    help="Use another origin instead of https://signup.com (local stand-in server).")
+    ap.add_argument("--snap-mode", choices=("sync", "async", "deferred"), default="sync",
+                    help="Screenshots: sync (default; full-size lossless PNG captured, encoded and written inline on "
+                         "every shot, the slowest and largest option), async (WebP encoded by Chrome in the capture "
+                         "call, decoded and written in the background) or deferred "
+                         "(async, and Sign Up → Save and Done frames are written after the submit).")
+    ap.add_argument("--snap-frames", choices=("all", "critical"), default="all",
+                    help="critical: only write sign-up and failure frames (every shot is still listed in index.json).")
+    ap.add_argument("--snap-keep-runs", type=int, default=0, metavar="N",
+                    help="Keep the newest N screenshot runs complete; older runs keep only critical/failure frames.")
+    ap.add_argument("--profile-dir", default=None, metavar="DIR",
+                    help="Reuse this Chrome profile across runs (cookies, disk cache, identified session).")
+    ap.add_argument("--fast-load", action="store_true",
+                    help="Eager page loads and block images, fonts and analytics over CDP.")
+    ap.add_argument("--fast-load-allow", action="append", default=[], metavar="PATTERN",
+                    help="With --fast-load: never block URLs like this (checked per request with --backend cdp; "
+                         "the webdriver backend stops blocking any pattern it overlaps). Repeatable.")
+    ap.add_argument("--scrape-index", choices=("A", "B"), default="", metavar="WEEK",
+                    help="Scrape the live spot list into the week's event index (diffed against the last scrape) and exit.")
+    ap.add_argument("--watch-minutes", type=float, default=0, metavar="MIN",
+                    help="If every preference is full, keep watching them this long and sign up the moment one frees up.")
+    ap.add_argument("--backend", choices=("webdriver", "cdp"), default="webdriver",
+                    help="cdp: drive Chrome over its DevTools websocket directly instead of through chromedriver.")
+    ap.add_argument("--record", action="store_true",
+                    help="Save DOM snapshots, network responses and the step timeline to record.zip in the screenshot folder. "
+                         "The archive contains names, emails and phone numbers: keep it out of shared or synced folders.")
+    ap.add_argument("--replay", default="", metavar="ARCHIVE",
+                    help="Serve a --record archive locally and run the flow against it (offline).")
+    ap.add_argument("--daemon", default="", metavar="ROSTER",
+                    help="Run forever: sign this roster up at every weekly release (--release-day/--release-at).")
+    ap.add_argument("--release-day", choices=WEEKDAYS, default="MON",
+                    help="Daemon mode: weekday of the release.")
+    ap.add_argument("--roster", default="", metavar="FILE",
+                    help="Batch mode: sign up every family in this CSV/JSON roster concurrently (Auto mode, no prompts).")
+    ap.add_argument("--workers", type=int, default=0, metavar="N",
+                    help="Batch mode: max concurrent Chrome sessions (default: one per family). "
+                         "Serve mode: warm sessions in the pool (default 1).")
+    ap.add_argument("--targets", default="", metavar="FILE",
+                    help="Watch several groups/entries from one browser (one tab each) and sign each up as it opens. "
+                         "CSV/JSON rows: roster columns plus group, entry[, label, open].")
+    ap.add_argument("--serve", type=int, default=0, metavar="PORT",
+                    help="Run the local control API on this port over warm Chrome sessions (see serve_api). "
+                         "Requests need the bearer token printed at startup.")
+    ap.add_argument("--profiles-dir", default=_os.path.join(".", "profiles"), metavar="DIR",
+                    help="Batch mode: parent folder for per-family Chrome profiles.")
+    ap.add_argument("--profile-startup", action="store_true",
+                    help="Print the time from process launch to the first prompt, by phase.")
+    args = ap.parse_args()
+
+    print("== STGLAC Auto Sign ==")
+    if args.start_only and (args.release_at or args.expect_open):
+        print("[start-only] --release-at/--expect-open are ignored")
+        args.release_at = args.expect_open = ""
+    release_epoch = parse_release_at(args.release_at) if args.release_at else None
+    open_epoch = parse_release_at(args.expect_open) if args.expect_open else release_epoch
+    if args.site_base:
+        set_site(args.site_base)
+    if args.replay:
+        _, base = serve_archive(args.replay)
+        set_site(base)
+
+    if args.daemon:
+        run_daemon(args)
+        return
+    if args.serve:
+        run_serve(args)
+        return
+    if args.targets:
+        run_targets(args, open_epoch)
+        return
+    if args.roster:
+        run_batch(args, release_epoch)
+        return
+
+    # Scrape the live spot list into the week's index, then stop
+    if args.scrape_index:
+        snap = Snapper(base_dir=shots_base_dir(args.shots_subdir), mode=args.snap_mode,
+                       frames=args.snap_frames, keep_runs=args.snap_keep_runs)
+        driver = build_driver(args.headless, profile_dir=args.profile_dir,
+                              fast=args.fast_load, allow=args.fast_load_allow, backend=args.backend)
+        try:
+            scrape_index(driver, snap, args.scrape_index)
+        except Exception as e:
+            print(f"[exception] {e}")
+            snap.shot(driver, "scrape_index_exception")
+        finally:
+            snap.close()
+            driver.quit()
+        return
+
+    # Fast smoke test for locked weeks
+    if args.start_only:
+        try:
+            base_shots_dir = shots_base_dir(args.shots_subdir)
+            snap = Snapper(base_dir=base_shots_dir, mode=args.snap_mode,
+                           frames=args.snap_frames, keep_runs=args.snap_keep_runs)
+            driver = build_driver(args.headless, profile_dir=args.profile_dir,
+                                  fast=args.fast_load, allow=args.fast_load_allow, backend=args.backend)
+            if not handle_view_button_only(driver, snap, detect=args.detect):
+                print("[error] Timed out waiting for the orange 'View' button.")
+                return
+            handle_continue_as_if_present(driver, snap)
+            snap.shot(driver, "start_only_invitation_page")
+            print("[start-only] Reached invitation page. Exiting.")
+        except Exception as e:
+            print(f"[exception] {e}")
+            snap.shot(driver, "start_only_exception")
+        finally:
+            snap.close()
+            time.sleep(3)
+        return
+    # Pre-arm: Chrome starts and warms up while the prompts below are answered
+    warm_imports()
+    prearm, prearm_pool, held = None, None, None
+    if release_epoch is not None:
+        base_shots_dir = shots_base_dir(args.shots_subdir)
+        snap = Snapper(base_dir=base_shots_dir, mode=args.snap_mode,
+                       frames=args.snap_frames, keep_runs=args.snap_keep_runs)
+        if args.record:
+            snap.recorder = Recorder(_os.path.join(snap.dir, "record.zip"))
+        prearm_pool = ThreadPoolExecutor(max_workers=1)
+        prearm = prearm_pool.submit(prearm_driver, args.headless, snap, args.profile_dir,
+                                    args.fast_load, args.fast_load_allow, args.backend, args.record)
+        print("[prearm] warming Chrome in the background; its log follows the questions")
+        held = HeldOutput(sys.stdout)
+        sys.stdout = held
+
+    # Choose mode
+    def ask(prompt, ok):
+        while True:
+            s = input(prompt).strip()
+            if ok(s): return s
+            print("  -> Please try again.")
+
+    if args.profile_startup:
+        report_startup()
+
+    # Week selection first
+    week = ask("Week: [A] or [B] : ", lambda s: s.strip().upper() in ("A","B"))
+    week = week.strip().upper()
+
+    mode = ask("Mode: [1] Test (confirm before save)  [2] Auto : ",
+               lambda s: s in ("1","2"))
+    test_mode = (mode == "1")
+
+    # Choose the week's map (the scraped index if there is one)
+    ACTIVE_MAP, index = active_event_map(week)
+
+    print("\nPick up to 3 event numbers (comma-separated) from:")
+    for k in range(1, len(ACTIVE_MAP)+1):
+        print(f"  {k:02d}: {ACTIVE_MAP[k]}")
+
+    name  = ask("\nYour full name: ", lambda s: len(s) > 1)
+    email = ask("Email: ", lambda s: "@" in s and "." in s)
+    phone = ask("Phone: ", lambda s: len(re.sub(r'\D+','', s)) >= 6)
+    bib   = ask("Bib number: ", lambda s: len(s) > 0)
+
+    prefs = parse_prefs(ask("Preferred events (e.g. 36,38,35): ",
+                            lambda s: len(parse_prefs(s, len(ACTIVE_MAP))) > 0), len(ACTIVE_MAP))
+    print(f"> preferences: {prefs}\n")
+    keys = index.keys_for(prefs) if index else None
+    if held is not None:
+        sys.stdout = held.out
+        held.release()
+
+    release_mono = None
+    http_posted = False
+    if args.engine == "http" and not keys and week not in TITLED_WEEKS:
+        print(f"[http] week {week} has no scraped index (--scrape-index {week}) and its map labels are not "
+              "page titles; using Chrome")
+    elif args.engine == "http":
+        # Browserless fast path first; Chrome only starts if it cannot finish the job
+        if release_epoch is not None:
+            release_mono = wait_until_release(release_epoch)
+
+        def confirm(n, title):
+            print("\n=== TEST MODE: Review selection before saving ===")
+            print(f"\nSelection\n- Preference #: {n}\n- Week: {week}\n"
+                  f"- Event label (your list): {ACTIVE_MAP.get(n, 'N/A')}\n- Page title: {title}\n"
+                  f"- Name: {name}\n- Email: {email}\n- Phone: {phone}\n- Bib: {bib}\n")
+            return input("Proceed to sign up? [y/N]: ").strip().lower() in ("y", "yes")
+        # Match spots by title: the hand-kept map's numbering is page order, the API's may not be
+        http_keys = keys or {n: k for n, k in zip(sorted(ACTIVE_MAP), title_keys(ACTIVE_MAP[i] for i in sorted(ACTIVE_MAP)))
+                             if n in prefs}
+        try:
+            res = http_signup(prefs, name, email, phone, bib, dry_run=args.dry_run,
+                              confirm=confirm if test_mode else None, release_mono=release_mono,
+                              keys=http_keys)
+            if res["status"] == "none_available":
+                print("[http] none of your preferences look open over HTTP; checking in Chrome")
+            else:
+                if res["status"] == "signed_up":
+                    print(f"✓ Completed sign-up (HTTP, confirmed by the server): #{res['chosen']} “{res['title'][:80]}”.")
+                if prearm is not None:
+                    _quit_quietly(prearm.result())
+                    prearm_pool.shutdown()
+                return
+        except FastPathUnavailable as e:
+            http_posted = e.posted
+            print(f"[http] fast path unavailable ({e}); "
+                  + ("checking the list in Chrome before signing up again" if e.posted else "falling back to Chrome"))
+
+    # Now open Chrome after collecting inputs (or pick up the pre-armed one)
+    if prearm is not None:
+        driver = prearm.result()
+        prearm_pool.shutdown()
+        if release_mono is None:
+            release_mono = wait_until_release(release_epoch)
+    else:
+        base_shots_dir = shots_base_dir(args.shots_subdir)
+        snap = Snapper(base_dir=base_shots_dir, mode=args.snap_mode,
+                       frames=args.snap_frames, keep_runs=args.snap_keep_runs)
+        if args.record:
+            snap.recorder = Recorder(_os.path.join(snap.dir, "record.zip"))
+        driver = build_driver(args.headless, profile_dir=args.profile_dir, fast=args.fast_load,
+                              allow=args.fast_load_allow, backend=args.backend, record=args.record)
+
+    steps = StepTimes(args.profile_dir)
+    TRACER.reset()
+    try:
+        # 1) Group page → orange "View" → 2) invitation page with dialogs/filters handled
+        detect = "observe" if release_mono is not None and args.detect != "adaptive" else args.detect
+        expected = open_invitation(driver, snap, detect=detect, steps=steps, open_epoch=open_epoch)
+        if expected is None:
+            return
+
+        # 3) Collect rows and step by index
+        snap.shot(driver, "preference_index_mode_list")
+        actions = collect_event_actions(driver, expected=expected)
+        if not actions:
+            print("[result] No assignment rows found. (Filters? Day collapsed?)")
+            snap.shot(driver, "no_assignment_rows")
+            return
+        print(f"[info] Detected {len(actions)} assignment rows.")
+        if http_posted:
+            mine = my_spots(driver, snap, name)
+            if mine:
+                print(f"✓ The HTTP sign-up went through: “{mine[0][:80]}” lists you.")
+                return
+            print("[http] the HTTP sign-up is not on the list; signing up in Chrome")
+
+        chosen = None
+        chosen_title = ""
+        n, item = resolve_preferences(actions, prefs, keys=keys)
+        if item is not None:
+            click_signup(driver, snap, item, f"pref_{n:02d}", release_mono)
+            chosen = n
+            chosen_title = (item["title"] or "").strip()
+
+        if not chosen and args.watch_minutes > 0:
+            # Wait for a preferred spot to free up instead of asking
+            n, item = watch_for_preferences(driver, snap, actions, prefs, args.watch_minutes, keys=keys)
+            if item is not None:
                 chosen = n
-                chosen_title = title
-                break
+                chosen_title = (item["title"] or "").strip()
             else:
-                print(f"[full] Preference #{n} is currently FULL — “{title[:80]}”. Trying next…")
+                snap.shot(driver, "watch_nothing_opened")
+                return
 
         if not chosen:
             # Offer interactive fallback: show available rows and let user pick one
-            available = [it for it in actions if is_signup_button(it["btn"])]
+            available = [it for it in actions if is_signup_action(it)]
             if not available:
                 print("[result] None of your preferences are available right now.")
                 snap.shot(driver, "no_preference_available")
@@ -633,14 +4068,9 @@ def main():
                     num = int(pick)
                     match = next((it for it in available if it["index"] == num), None)
                     if match is not None:
-                        row, btn = match["row"], match["btn"]
-                        title = (match["title"] or "").strip()
-                        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", row)
-                        snap.shot(driver, f"manual_pick_{num:02d}_before_click")
-                        btn.click()
-                        snap.shot(driver, f"manual_pick_{num:02d}_clicked")
+                        click_signup(driver, snap, match, f"manual_pick_{num:02d}", release_mono)
                         chosen = num
-                        chosen_title = title
+                        chosen_title = (match["title"] or "").strip()
                         break
                 print("  -> Invalid choice. Please pick one of the listed numbers or press Enter.")
 
@@ -650,7 +4080,8 @@ def main():
             return
 
         # 4) Identify → Confirm → Participant form
-        identify_and_confirm(driver, snap, email)
+        for step, secs in identify_and_confirm(driver, snap, email, warm=bool(args.profile_dir)).items():
+            steps.record(step, secs or 0.0, skipped=secs is None)
 
         selection_text = (f"\nSelection\n"
                           f"- Preference #: {chosen}\n"
@@ -675,6 +4106,12 @@ def main():
         print(f"[exception] {e}")
         snap.shot(driver, "exception")
     finally:
+        snap.close()
+        steps.summary()
+        TRACER.save(_os.path.join(snap.dir, "trace.json"))
+        if snap.recorder is not None:
+            snap.recorder.checkpoint(driver, "end")
+            snap.recorder.save(steps)
         time.sleep(5)
 
 if __name__ == "__main__":
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Import the script without its venv bootstrap/relaunch
+os.environ.setdefault("STGLAC_BOOTSTRAPPED", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
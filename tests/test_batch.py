@@ -0,0 +1,33 @@
+"""Batch roster rows and preference parsing (no browser)."""
+import types
+
+import pytest
+
+import stglac_autosign as sa
+
+
+def test_parse_prefs():
+    assert sa.parse_prefs("36, 38,35", 62) == [36, 38, 35]
+    assert sa.parse_prefs("5,5,x,0,99,7,8,9", 62) == [5, 7, 8]
+    assert sa.parse_prefs("", 62) == []
+
+
+def test_roster_person(tmp_path, monkeypatch):
+    monkeypatch.setattr(sa, "EVENT_INDEX_DIR", str(tmp_path))
+    p = sa.roster_person({"Name": "Ann Lee", "email": "a@b.c", "phone": "1", "bib": "2",
+                          "week": "a", "prefs": "36;38;35"}, "row 2", "batch")
+    assert p["week"] == "A" and p["prefs"] == [36, 38, 35] and p["slug"] == "batch_ann_lee" and p["keys"] is None
+    with pytest.raises(ValueError, match="row 3: missing bib"):
+        sa.roster_person({"name": "x", "email": "e", "phone": "1", "week": "A", "prefs": "1"}, "row 3", "b")
+    with pytest.raises(ValueError, match="week must be A or B"):
+        sa.roster_person({"name": "x", "email": "e", "phone": "1", "bib": "2", "week": "C", "prefs": "1"}, "r", "b")
+    with pytest.raises(ValueError, match="no valid preferences"):
+        sa.roster_person({"name": "x", "email": "e", "phone": "1", "bib": "2", "week": "A", "prefs": "0;999"}, "r", "b")
+
+
+def test_bad_roster_row_exits_with_its_reason(tmp_path):
+    roster = tmp_path / "roster.csv"
+    roster.write_text("name,email,phone,bib,week,prefs\nAnn Lee,a@b.c,1,,A,36\n")
+    args = types.SimpleNamespace(roster=str(roster))
+    with pytest.raises(SystemExit, match=r"roster\.csv: roster row 1: missing bib"):
+        sa.run_batch(args, None)
@@ -0,0 +1,138 @@
+"""--backend cdp: websocket framing and navigation waits (no browser)."""
+import asyncio
+
+import pytest
+
+import stglac_autosign as sa
+
+
+class _Writer:
+    def __init__(self):
+        self.sent = bytearray()
+
+    def write(self, data):
+        self.sent += data
+
+    async def drain(self):
+        pass
+
+
+def _socket(incoming: bytes = b""):
+    reader = asyncio.StreamReader()
+    reader.feed_data(incoming)
+    return sa.CdpSocket(reader, _Writer())
+
+
+def _server_frame(opcode: int, payload: bytes, fin: bool = True) -> bytes:
+    """An unmasked frame as Chrome sends it."""
+    n = len(payload)
+    head = bytes([(0x80 if fin else 0) | opcode])
+    if n < 126:
+        head += bytes([n])
+    elif n < 1 << 16:
+        head += bytes([126]) + n.to_bytes(2, "big")
+    else:
+        head += bytes([127]) + n.to_bytes(8, "big")
+    return head + payload
+
+
+@pytest.mark.parametrize("n, header", [(0, 2), (125, 2), (126, 4), (65535, 4), (65536, 10)])
+def test_sent_frames_round_trip(n, header):
+    text = "".join(chr(97 + i % 26) for i in range(n))
+
+    async def run():
+        out = _socket()
+        await out.send(text)
+        sent = bytes(out.writer.sent)
+        assert sent[0] == 0x81 and sent[1] & 0x80  # FIN + text, masked
+        assert len(sent) == header + 4 + n
+        return await _socket(sent).recv()
+
+    assert asyncio.run(run()) == text
+
+
+def test_fragmented_message_is_joined():
+    async def run():
+        sock = _socket(_server_frame(0x1, b'{"id": ', fin=False) + _server_frame(0x0, b"1", fin=False)
+                       + _server_frame(0x0, b"}"))
+        return await sock.recv()
+
+    assert asyncio.run(run()) == '{"id": 1}'
+
+
+def test_ping_is_answered_with_pong():
+    async def run():
+        sock = _socket(_server_frame(0x9, b"beat") + _server_frame(0x1, b"after"))
+        return await sock.recv(), bytes(sock.writer.sent)
+
+    text, pong = asyncio.run(run())
+    assert text == "after"
+    assert pong[0] == 0x8A and pong[1] == 0x80 | 4
+    mask = pong[2:6]
+    assert bytes(c ^ mask[i % 4] for i, c in enumerate(pong[6:])) == b"beat"
+
+
+def test_close_frame_ends_the_connection():
+    async def run():
+        await _socket(_server_frame(0x8, b"")).recv()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
+
+
+def _nav_driver(loop, before, after, answer):
+    """A CdpDriver whose _call replays lifecycle events around the command's answer."""
+    d = sa.CdpDriver.__new__(sa.CdpDriver)
+    d._loop, d._waiters, d._main_frame, d._load_event = loop, {}, "F", "load"
+
+    def emit(name, loader, frame="F"):
+        for on_event in list(d._waiters.get("Page.lifecycleEvent", [])):
+            on_event({"frameId": frame, "loaderId": loader, "name": name})
+
+    async def call(method, params):
+        if method == "Page.getFrameTree":
+            return {"frameTree": {"frame": {"id": "F", "loaderId": "L1"}}}
+        for ev in before:
+            emit(*ev)
+        for ev in after:
+            loop.call_soon(emit, *ev)
+        return answer
+
+    d._call = call
+    return d
+
+
+def _nav_finishes(method, before, after, answer=None) -> bool:
+    async def run():
+        d = _nav_driver(asyncio.get_running_loop(), before, after, answer or {})
+        try:
+            await asyncio.wait_for(d._nav(method, {}), 0.2)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            assert d._waiters["Page.lifecycleEvent"] == []
+
+    return asyncio.run(run())
+
+
+def test_navigate_waits_for_its_own_loader():
+    stale = [("load", "L1"), ("load", "L2", "child-frame"), ("DOMContentLoaded", "L2")]
+    assert not _nav_finishes("Page.navigate", stale, [], {"loaderId": "L2"})
+    assert _nav_finishes("Page.navigate", [("load", "L1")], [("load", "L2")], {"loaderId": "L2"})
+    # Its load can arrive before the command's answer
+    assert _nav_finishes("Page.navigate", [("init", "L2"), ("load", "L2")], [], {"loaderId": "L2"})
+    # Same-document navigation: no loader, nothing to wait for
+    assert _nav_finishes("Page.navigate", [], [], {})
+
+
+def test_reload_waits_for_the_first_new_loader():
+    assert not _nav_finishes("Page.reload", [("load", "L1")], [("init", "L1"), ("load", "L1")])
+    assert _nav_finishes("Page.reload", [("load", "L1")], [("init", "L3"), ("commit", "L3"), ("load", "L3")])
+    # A load without its init first does not count
+    assert not _nav_finishes("Page.reload", [], [("load", "L3")])
+
+
+def test_navigation_error_is_raised():
+    with pytest.raises(sa.WebDriverException, match="net::ERR_NAME_NOT_RESOLVED"):
+        _nav_finishes("Page.navigate", [], [], {"errorText": "net::ERR_NAME_NOT_RESOLVED"})
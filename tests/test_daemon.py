@@ -0,0 +1,61 @@
+"""Daemon scheduling and crash handling (no browser)."""
+import json
+import os
+import types
+from datetime import datetime
+
+import stglac_autosign as sa
+
+
+def test_next_weekly_release():
+    wed = datetime(2026, 10, 14, 12, 0).timestamp()  # a Wednesday
+    at = datetime.fromtimestamp(sa.next_weekly_release("THU", "19:00:00", wed))
+    assert (at.weekday(), at.hour, at.minute) == (3, 19, 0) and at.day == 15
+    # Still inside this week's detection window: same release
+    during = datetime(2026, 10, 15, 19, 5).timestamp()
+    assert sa.next_weekly_release("THU", "19:00:00", during) == at.timestamp()
+    # Window closed: next week
+    after = datetime(2026, 10, 15, 19, sa.MAX_POLL_MINUTES + 1).timestamp()
+    assert datetime.fromtimestamp(sa.next_weekly_release("THU", "19:00:00", after)).day == 22
+
+
+class _Driver:
+    def __init__(self):
+        self.dead = False
+
+    def get(self, url):
+        pass
+
+    def execute_script(self, *args):
+        if self.dead:
+            raise RuntimeError("session gone")
+
+    def delete_all_cookies(self):
+        pass
+
+    def quit(self):
+        pass
+
+
+def test_failed_browser_start_costs_an_attempt_not_the_daemon(tmp_path, monkeypatch):
+    builds = []
+
+    def build_driver(*args, **kw):
+        builds.append(1)
+        if len(builds) == 1:
+            raise RuntimeError("chromedriver did not start")
+        return _Driver()
+
+    monkeypatch.setattr(sa, "build_driver", build_driver)
+    monkeypatch.setattr(sa, "poll_view_adaptive", lambda *a, **k: True)
+    monkeypatch.setattr(sa, "enter_invitation", lambda *a: 10)
+    monkeypatch.setattr(sa, "sign_up_person", lambda *a, **k: {"status": "signed_up", "chosen": 36})
+    args = types.SimpleNamespace(profile_dir=None, headless=True, fast_load=False, fast_load_allow=[],
+                                 backend="webdriver", shots_subdir=str(tmp_path / "shots"), snap_mode="sync",
+                                 snap_frames="all", snap_keep_runs=0, dry_run=False)
+    path = str(tmp_path / "state.json")
+    state = {}
+    sa.daemon_release(args, [{"slug": "a", "name": "A"}], 1000.0, state, path)
+    saved = json.loads(open(path).read())
+    assert saved["step"] == "finished" and saved["done"] == ["a"] and saved["attempts"] == 2
+    assert os.path.isdir(str(tmp_path / "shots"))
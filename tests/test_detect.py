@@ -0,0 +1,10 @@
+"""View detection schedule (no browser)."""
+import stglac_autosign as sa
+
+
+def test_poll_interval_follows_schedule():
+    assert sa.poll_interval(None) == sa.POLL_SCHEDULE[0][1] == sa.POLL_SECS
+    assert sa.poll_interval(-3600) == 30.0
+    assert sa.poll_interval(-300) == 5.0
+    assert sa.poll_interval(30) == 1.0
+    assert sa.poll_interval(-5) == 0.3
@@ -0,0 +1,27 @@
+"""Per-week event index (no browser)."""
+import pytest
+
+import stglac_autosign as sa
+
+
+def test_event_index_update_diffs_and_versions(tmp_path):
+    index = sa.EventIndex("A", group="g", base_dir=str(tmp_path))
+    assert not index
+    rows = [{"title": "Ground Setup"}, {"title": "Canteen"}, {"title": "Canteen"}]
+    diff = index.update(rows)
+    assert index.version == 1 and diff["added"] == ["ground setup", "canteen", "canteen~2"]
+    assert index.update(rows) == {"added": [], "removed": [], "moved": []} and index.version == 1
+    diff = index.update([{"title": "Canteen"}, {"title": "Track Setup"}])
+    assert index.version == 2
+    assert diff == {"added": ["track setup"], "removed": ["ground setup", "canteen~2"], "moved": ["canteen"]}
+    again = sa.EventIndex("A", group="g", base_dir=str(tmp_path))
+    assert again.version == 2 and again.keys_for([2, 9]) == {2: "track setup"}
+    assert [h["version"] for h in again.history] == [1, 2]
+
+
+@pytest.mark.parametrize("content", ["{not json", '{"rows": []}', '{"version": 1, "rows": [1, 2]}', "[]"])
+def test_event_index_damaged_file_falls_back(tmp_path, content, capsys):
+    (tmp_path / "g_weekA.json").write_text(content)
+    index = sa.EventIndex("A", group="g", base_dir=str(tmp_path))
+    assert not index and index.version == 0
+    assert "using the week map" in capsys.readouterr().out
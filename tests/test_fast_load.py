@@ -0,0 +1,34 @@
+"""--fast-load URL blocking and the allow list (no browser)."""
+import pytest
+
+import stglac_autosign as sa
+
+
+def test_fast_load_patterns_keeps_patterns_no_allowed_url_can_match():
+    assert sa.fast_load_patterns() == sa.FAST_LOAD_BLOCK
+    kept = sa.fast_load_patterns(["*fonts.gstatic.com*"])
+    # Font files could come from the allowed host; images and trackers cannot be told apart
+    assert "*.woff2" not in kept and "*.png" not in kept
+    assert sa.fast_load_patterns(["https://cdn.example.com/logo.png"]) == \
+        [b for b in sa.FAST_LOAD_BLOCK if b != "*.png"]
+
+
+def test_fast_load_blocked_is_decided_per_url():
+    allow = ["*signup.com*"]
+    assert sa.fast_load_blocked("https://cdn.other.net/a.png")
+    assert not sa.fast_load_blocked("https://signup.com/img/a.png", allow)
+    assert sa.fast_load_blocked("https://cdn.other.net/a.png", allow)
+    assert sa.fast_load_blocked("https://www.google-analytics.com/collect", allow)
+    assert not sa.fast_load_blocked("https://signup.com/app.js", allow)
+
+
+@pytest.mark.parametrize("a, b, overlap", [
+    ("*signup.com*", "*.png", True),
+    ("https://a.com/x.js", "*.png", False),
+    ("*.PNG", "*.png", True),
+    ("abc", "abd", False),
+    ("*", "anything", True),
+])
+def test_globs_overlap(a, b, overlap):
+    assert sa.globs_overlap(a, b) is overlap
+    assert sa.globs_overlap(b, a) is overlap
@@ -0,0 +1,37 @@
+"""HTTP fast path: endpoint discovery and answer checks (no network)."""
+import types
+
+import pytest
+
+import stglac_autosign as sa
+
+
+def test_discover_endpoints():
+    page = """<script>fetch("/api/v2/spots?x=1"); post('/api/v2/identify')</script>
+              <form method="POST" action="/client/signup/submit"></form>
+              <form method="get" action="/search"></form>"""
+    assert sa.discover_endpoints(page, "https://signup.com/client/invitation2/x") == {
+        "spots": "https://signup.com/api/v2/spots?x=1",
+        "identify": "https://signup.com/api/v2/identify",
+        "signup": "https://signup.com/client/signup/submit",
+    }
+    assert sa.discover_endpoints("<p>nothing</p>", "https://signup.com/") == {}
+
+
+def _engine(payload):
+    eng = sa.HttpEngine.__new__(sa.HttpEngine)  # no requests session needed
+    eng.endpoints = {"spots": "https://signup.com/api/spots", "signup": "https://signup.com/api/signup"}
+    eng._req = lambda method, url, posted=False, **kw: types.SimpleNamespace(json=lambda: payload)
+    return eng
+
+
+@pytest.mark.parametrize("payload", [{"data": [123, 456]}, [{"id": 1}, "x"], [None]])
+def test_spot_list_of_non_objects_means_fall_back(payload):
+    with pytest.raises(sa.FastPathUnavailable, match="not objects"):
+        _engine(payload).spots()
+
+
+def test_spots():
+    eng = _engine({"spots": [{"id": 7, "title": "Canteen", "remaining": 1}, {"spotId": 8, "name": "Gate", "open": 0}]})
+    assert eng.spots() == [{"index": 1, "id": 7, "title": "Canteen", "state": "signup"},
+                           {"index": 2, "id": 8, "title": "Gate", "state": "full"}]
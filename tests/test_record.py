@@ -0,0 +1,78 @@
+"""--record archives served back by --replay (no browser)."""
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+import stglac_autosign as sa
+
+ORIGIN = "https://signup.com"
+
+
+class _RecordingDriver:
+    """Hands the Recorder a scripted performance log, response bodies and page HTML."""
+    def __init__(self):
+        self.log, self.bodies, self.page = [], {}, (ORIGIN + "/", "<html></html>")
+
+    def respond(self, rid, method, url, status, body, mime="text/html"):
+        self.bodies[rid] = body
+        self.log += [
+            {"method": "Network.requestWillBeSent", "params": {"requestId": rid, "request": {"method": method, "url": url}}},
+            {"method": "Network.responseReceived",
+             "params": {"requestId": rid, "response": {"url": url, "status": status, "mimeType": mime}}},
+            {"method": "Network.loadingFinished", "params": {"requestId": rid}},
+        ]
+
+    def get_log(self, kind):
+        out, self.log = self.log, []
+        return [{"message": json.dumps({"message": m})} for m in out]
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {"body": self.bodies[params["requestId"]], "base64Encoded": False}
+
+    def execute_script(self, body):
+        return list(self.page)
+
+
+@pytest.fixture
+def replay(tmp_path):
+    driver = _RecordingDriver()
+    rec = sa.Recorder(str(tmp_path / "record.zip"))
+    group = f"{ORIGIN}/group/{sa.GROUP_ID}"
+    driver.respond("1", "GET", group, 200, f'<a href="{ORIGIN}/client/x">View</a> not yet')
+    driver.page = (group, "<html>group dom</html>")
+    rec.checkpoint(driver, "01_group_loaded")
+    driver.respond("2", "GET", group, 200, f'<a href="{ORIGIN}/client/x">View</a> open')
+    driver.respond("3", "POST", f"{ORIGIN}/api/signup", 200, '{"ok": true}', mime="application/json")
+    driver.page = (f"{ORIGIN}/client/invitation2/secure/1/false", "<html>invitation dom</html>")
+    rec.checkpoint(driver, "02_invitation")
+    rec.mark("03_signup_clicked")
+    rec.save()
+    server, base = sa.serve_archive(rec.path)
+    yield base, group[len(ORIGIN):]
+    server.shutdown()
+    server.server_close()
+
+
+def _fetch(url, data=None):
+    try:
+        with urllib.request.urlopen(url, data=data, timeout=5) as r:
+            return r.status, r.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, ""
+
+
+def test_recorded_responses_replay_in_order(replay):
+    base, group_path = replay
+    # In recorded order per URL, the last one repeating; the origin points at the replay server
+    assert _fetch(base + group_path) == (200, f'<a href="{base}/client/x">View</a> not yet')
+    assert _fetch(base + group_path) == (200, f'<a href="{base}/client/x">View</a> open')
+    assert _fetch(base + group_path) == (200, f'<a href="{base}/client/x">View</a> open')
+    assert _fetch(base + "/api/signup", data=b"{}") == (200, '{"ok": true}')
+
+
+def test_pages_without_a_recorded_body_fall_back_to_their_dom(replay):
+    base, _ = replay
+    assert _fetch(base + "/client/invitation2/secure/1/false") == (200, "<html>invitation dom</html>")
+    assert _fetch(base + "/never/recorded") == (404, "")
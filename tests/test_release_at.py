@@ -0,0 +1,74 @@
+"""--release-at parsing and held prompt output (no browser)."""
+import argparse
+import io
+import threading
+from datetime import datetime
+
+import pytest
+
+import stglac_autosign as sa
+
+
+@pytest.fixture
+def now(monkeypatch):
+    """Freeze the script's datetime.now() at 2026-10-15 19:00:00 local time."""
+    frozen = datetime(2026, 10, 15, 19, 0, 0)
+
+    class _Frozen(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return frozen
+
+    monkeypatch.setattr(sa, "datetime", _Frozen)
+    return frozen
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("19:30:00", datetime(2026, 10, 15, 19, 30)),     # later today
+    ("19:00:00", datetime(2026, 10, 15, 19, 0)),      # now
+    ("18:55:00", datetime(2026, 10, 15, 18, 55)),     # 5 min ago: released, no wait
+    ("18:54:59", datetime(2026, 10, 16, 18, 54, 59)),  # older: tomorrow
+    ("00:00:01", datetime(2026, 10, 16, 0, 0, 1)),
+    (" 23:59:59 ", datetime(2026, 10, 15, 23, 59, 59)),
+])
+def test_parse_release_at(now, value, expected):
+    assert sa.parse_release_at(value) == expected.timestamp()
+
+
+def test_parse_release_at_rolls_over_past_midnight(monkeypatch):
+    class _LateNight(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2026, 10, 15, 23, 58)
+
+    monkeypatch.setattr(sa, "datetime", _LateNight)
+    assert sa.parse_release_at("00:01:00") == datetime(2026, 10, 16, 0, 1).timestamp()
+    assert sa.parse_release_at("23:55:00") == datetime(2026, 10, 15, 23, 55).timestamp()
+
+
+@pytest.mark.parametrize("value", ["19:00", "7pm", "24:00:00", "19:60:00", "", "19:00:00:00"])
+def test_hhmmss_rejects_bad_times(value):
+    with pytest.raises(argparse.ArgumentTypeError, match="HH:MM:SS"):
+        sa.hhmmss(value)
+
+
+def test_hhmmss_returns_the_trimmed_value():
+    assert sa.hhmmss(" 07:05:00 ") == "07:05:00"
+
+
+def test_held_output_holds_other_threads_until_release():
+    out = io.StringIO()
+    held = sa.HeldOutput(out)
+    held.write("question? ")
+    worker = threading.Thread(target=lambda: (held.write("[prearm] one\n"), held.write("[prearm] two\n")))
+    worker.start()
+    worker.join()
+    assert out.getvalue() == "question? "
+    held.write("answer\n")
+    held.release()
+    assert out.getvalue() == "question? answer\n[prearm] one\n[prearm] two\n"
+    late = threading.Thread(target=held.write, args=("[prearm] after\n",))
+    late.start()
+    late.join()
+    assert out.getvalue().endswith("[prearm] after\n") and held.held == []
+    assert held.getvalue() == out.getvalue()  # everything else goes to the real stream
@@ -0,0 +1,42 @@
+"""--serve job intake and session failure handling (no browser)."""
+import time
+import types
+
+import pytest
+
+import stglac_autosign as sa
+
+
+class _BrokenPool(sa.SessionPool):
+    """A pool whose browsers never start."""
+    def _build(self, sess, slot):
+        raise RuntimeError("chromedriver did not start")
+
+
+@pytest.fixture
+def pool_args(tmp_path, monkeypatch):
+    monkeypatch.setattr(sa, "EVENT_INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(sa, "DAEMON_CHECK_SECS", 0.01)
+    return types.SimpleNamespace(shots_subdir=str(tmp_path / "shots"), snap_mode="sync", dry_run=False)
+
+
+JOB = {"name": "Ann Lee", "email": "a@b.c", "phone": "1", "bib": "2", "week": "A", "prefs": "36"}
+
+
+@pytest.mark.parametrize("value", ["false", "0", 1, None])
+def test_dry_run_must_be_a_json_boolean(pool_args, value):
+    pool = sa.SessionPool(pool_args, 0)
+    with pytest.raises(ValueError, match="dry_run must be true or false"):
+        pool.submit({**JOB, "dry_run": value})
+    assert pool.jobs == {} and pool.submit({**JOB, "dry_run": True})["dry_run"] is True
+
+
+def test_jobs_fail_instead_of_staying_queued_when_no_browser_works(pool_args):
+    broken_pool = _BrokenPool(pool_args, 1)
+    job = broken_pool.submit({**JOB, "dry_run": True})
+    deadline = time.time() + 5
+    while job["status"] == "queued" and time.time() < deadline:
+        time.sleep(0.01)
+    assert job["status"] == "error" and job["error"] == "no working browser session"
+    assert broken_pool.sessions[0]["state"].startswith("error: RuntimeError")
+    assert broken_pool.claims == {}
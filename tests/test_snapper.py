@@ -0,0 +1,97 @@
+"""Snapper run folders, background writes and retention (no browser)."""
+import base64
+import json
+import os
+import time
+from pathlib import Path
+
+import stglac_autosign as sa
+
+
+def test_prune_runs_keeps_critical_frames_of_old_runs(tmp_path):
+    for run in ("20261001_190000", "20261008_190000"):
+        d = tmp_path / run
+        d.mkdir()
+        for name in ("group_page.png", "signup_saved.png"):
+            (d / name).write_bytes(b"x" * 10)
+        sa.write_snap_index(str(d), {"run": run, "pruned": False, "index": [
+            {"label": "group_page", "file": "group_page.png", "kind": "info"},
+            {"label": "signup_saved", "file": "signup_saved.png", "kind": "critical"}]})
+    sa.prune_runs(str(tmp_path), keep=1)
+    old, new = tmp_path / "20261001_190000", tmp_path / "20261008_190000"
+    assert sorted(os.listdir(old)) == ["index.json", "signup_saved.png"]
+    data = json.loads((old / "index.json").read_text())
+    assert data["pruned"] and data["index"][0]["file"] is None
+    assert sorted(os.listdir(new)) == ["group_page.png", "index.json", "signup_saved.png"]
+
+
+def test_snappers_started_together_get_their_own_folders(tmp_path):
+    a, b = sa.Snapper(base_dir=str(tmp_path)), sa.Snapper(base_dir=str(tmp_path))
+    assert a.dir != b.dir and os.path.isdir(a.dir) and os.path.isdir(b.dir)
+
+
+class _ShotDriver:
+    """Page.captureScreenshot returns a different base64 frame per call unless told to repeat."""
+    def __init__(self):
+        self.frame = 0
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == "Page.captureScreenshot"
+        return {"data": base64.b64encode(f"frame {self.frame}".encode()).decode()}
+
+
+def test_deferred_frames_are_written_after_release_in_order(tmp_path):
+    snap = sa.Snapper(base_dir=str(tmp_path), mode="deferred")
+    queued = []
+    submit = snap._submit
+    snap._submit = lambda path, data: (queued.append(os.path.basename(path)), submit(path, data))
+    driver = _ShotDriver()
+    snap.shot(driver, "group_page")
+    snap.hold()
+    for label in ("signup_clicked", "form_filled", "signup_saved"):
+        driver.frame += 1
+        snap.shot(driver, label)
+    assert queued == ["01_group_page.webp"]
+    assert not any(n.startswith(("02", "03", "04")) for n in os.listdir(snap.dir))
+    assert [os.path.basename(p) for p, _ in snap._deferred] == \
+        ["02_signup_clicked.webp", "03_form_filled.webp", "04_signup_saved.webp"]
+    snap.release()
+    assert queued[1:] == ["02_signup_clicked.webp", "03_form_filled.webp", "04_signup_saved.webp"]
+    snap.close()
+    for n, name in enumerate(queued):
+        assert (Path(snap.dir) / name).read_bytes() == f"frame {n}".encode()
+
+
+def test_close_waits_for_every_write(tmp_path, monkeypatch):
+    write = sa.Snapper._write
+
+    def slow_write(path, data):
+        time.sleep(0.05)
+        write(path, data)
+
+    monkeypatch.setattr(sa.Snapper, "_write", staticmethod(slow_write))
+    snap = sa.Snapper(base_dir=str(tmp_path), mode="async")
+    driver = _ShotDriver()
+    for i in range(5):
+        driver.frame = i
+        snap.shot(driver, f"step_{i}")
+    snap.close()
+    assert sorted(n for n in os.listdir(snap.dir) if n.endswith(".webp")) == [f"0{i + 1}_step_{i}.webp" for i in range(5)]
+
+
+def test_identical_frames_are_written_once_and_indexed(tmp_path):
+    snap = sa.Snapper(base_dir=str(tmp_path), mode="async")
+    driver = _ShotDriver()
+    snap.shot(driver, "group_page")
+    snap.shot(driver, "group_page_again")  # same frame
+    driver.frame = 1
+    snap.shot(driver, "signup_saved")
+    snap.close()
+    assert sorted(n for n in os.listdir(snap.dir) if n != "index.json") == \
+        ["01_group_page.webp", "03_signup_saved.webp"]
+    data = json.loads((Path(snap.dir) / "index.json").read_text())
+    assert (data["mode"], data["shots"], data["files"], data["pruned"]) == ("async", 3, 2, False)
+    first, dup, saved = data["index"]
+    assert dup["file"] == first["file"] == "01_group_page.webp" and dup["dup"] and dup["sha1"] == first["sha1"]
+    assert saved["kind"] == "critical" and not saved.get("dup")
+    assert data["bytes"] == first["bytes"] + saved["bytes"] == len(b"frame 0") + len(b"frame 1")
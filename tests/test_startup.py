@@ -0,0 +1,14 @@
+"""Startup cost: opt-in modes do not load their modules on every start."""
+import os
+import subprocess
+import sys
+
+OPT_IN = ("asyncio", "urllib.request", "http.server", "multiprocessing", "html.parser", "csv")
+
+
+def test_opt_in_modules_are_not_imported_at_startup():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = f"import sys, stglac_autosign; print(' '.join(m for m in {OPT_IN!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True,
+                         env={**os.environ, "STGLAC_BOOTSTRAPPED": "1"})
+    assert out.stdout.split() == []
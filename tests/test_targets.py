@@ -0,0 +1,15 @@
+"""--targets file checks (no browser)."""
+import types
+
+import pytest
+
+import stglac_autosign as sa
+
+
+def test_bad_target_row_exits_with_its_reason(tmp_path, monkeypatch):
+    monkeypatch.setattr(sa, "EVENT_INDEX_DIR", str(tmp_path))
+    targets = tmp_path / "targets.csv"
+    targets.write_text("name,email,phone,bib,week,prefs,group,entry\nAnn Lee,a@b.c,1,2,A,36,,\n")
+    args = types.SimpleNamespace(targets=str(targets), backend="webdriver")
+    with pytest.raises(SystemExit, match=r"targets\.csv: target 1: group and entry"):
+        sa.run_targets(args, None)